@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark Fixtures
+Synthetic datasets, tgju history-table pages and a local server that
+replays them, so the scraping and storage paths can be timed offline.
+
+fixtures/ holds one page of the history endpoint (history_api.json) and one
+rendered history page (history_page.html). Refresh them from tgju.org with:
+    python benchmarks/fixtures.py --record
+When the site cannot be reached, --record rebuilds them from the newest rows
+of the local dataset in the same markup instead.
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from src.config import COLUMN_MAPPING, CSV_FILENAME, DEFAULT_PAGE_SIZE
+from src.trading_calendar import gregorian_to_persian
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+API_FIXTURE = os.path.join(FIXTURES_DIR, 'history_api.json')
+HTML_FIXTURE = os.path.join(FIXTURES_DIR, 'history_page.html')
+
+# Synthetic histories are one row per day from here; 1M rows reach the
+# year 4437, past pandas' nanosecond timestamps (which end in 2262)
+SYNTHETIC_START = date(1700, 1, 1)
+PANDAS_MAX_DATE = '2262/04/11'
+
+
+def synthetic_rows(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate `count` daily rows with a random-walk close, newest first,
+    keyed by the CSV headers like scraped rows.
+    """
+    rng = np.random.default_rng(seed)
+    closes = np.maximum(1000, 500000 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))).astype(np.int64)
+    opens = np.concatenate([[closes[0]], closes[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, count)) * closes
+    highs = (np.maximum(opens, closes) + spread).astype(np.int64)
+    lows = (np.minimum(opens, closes) - spread).astype(np.int64)
+    changes = closes - opens
+
+    names = COLUMN_MAPPING
+    rows = []
+    day = SYNTHETIC_START
+    one_day = timedelta(days=1)
+    for i in range(count):
+        py, pm, pd_ = gregorian_to_persian(day)
+        percent = changes[i] / opens[i] * 100 if opens[i] else 0.0
+        rows.append({
+            names["open_price"]: int(opens[i]),
+            names["low_price"]: int(lows[i]),
+            names["high_price"]: int(highs[i]),
+            names["close_price"]: int(closes[i]),
+            names["change_amount"]: str(abs(int(changes[i]))),
+            names["change_percent"]: f"{abs(percent):.2f}%",
+            names["gregorian_date"]: day.strftime('%Y/%m/%d'),
+            names["persian_date"]: f"{py:04d}/{pm:02d}/{pd_:02d}"
+        })
+        day += one_day
+    rows.reverse()
+    return rows
+
+
+def write_csv(path: str, rows: List[Dict[str, Any]]):
+    """Write rows in the dataset's CSV layout."""
+    headers = list(COLUMN_MAPPING.values())
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(headers) + '\n')
+        for row in rows:
+            f.write(','.join(str(row[name]) for name in headers) + '\n')
+
+
+def format_cells(row: Dict[str, Any]) -> List[str]:
+    """Render a row as the history table's cells (thousands separators, markup on changes)."""
+    names = COLUMN_MAPPING
+    return [
+        f"{int(row[names['open_price']]):,}",
+        f"{int(row[names['low_price']]):,}",
+        f"{int(row[names['high_price']]):,}",
+        f"{int(row[names['close_price']]):,}",
+        f'<span class="high" dir="ltr">{row[names["change_amount"]]}</span>',
+        f'<span class="high" dir="ltr">{row[names["change_percent"]]}</span>',
+        str(row[names['gregorian_date']]),
+        str(row[names['persian_date']])
+    ]
+
+
+def api_payload(rows: List[Dict[str, Any]], start: int, length: int, draw: int = 1) -> Dict[str, Any]:
+    """DataTables server-side response for rows[start:start + length]."""
+    return {
+        'draw': draw,
+        'recordsTotal': len(rows),
+        'recordsFiltered': len(rows),
+        'data': [format_cells(row) for row in rows[start:start + length]]
+    }
+
+
+def html_page(rows: List[Dict[str, Any]]) -> str:
+    """Rendered history page holding the first page of rows."""
+    body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in format_cells(row)) + '</tr>'
+                   for row in rows[:DEFAULT_PAGE_SIZE])
+    return ('<html><body><table id="DataTables_Table_0" class="table"><thead><tr>'
+            + '<th></th>' * 8 + f'</tr></thead><tbody>{body}</tbody></table></body></html>')
+
+
+def load_fixture(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def record():
+    """Capture the fixtures from tgju.org, or rebuild them from the local dataset."""
+    from src.fetcher import HttpFetcher
+    from src.data_manager import DataManager
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    fetcher = HttpFetcher()
+    try:
+        response = fetcher.session.get(fetcher.api_url, params=fetcher._table_params(0, DEFAULT_PAGE_SIZE, draw=1),
+                                       timeout=fetcher.timeout)
+        response.raise_for_status()
+        payload = response.json()
+        page = fetcher.session.get(fetcher.base_url, timeout=fetcher.timeout).text
+        print("Recorded fixtures from tgju.org")
+    except Exception as e:
+        print(f"Could not reach tgju.org ({e}); rebuilding fixtures from {CSV_FILENAME}")
+        df = DataManager().load_existing_data().head(DEFAULT_PAGE_SIZE)
+        rows = df.to_dict('records')
+        payload = api_payload(rows, 0, DEFAULT_PAGE_SIZE)
+        page = html_page(rows)
+    finally:
+        fetcher.close()
+
+    with open(API_FIXTURE, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+    with open(HTML_FIXTURE, 'w', encoding='utf-8') as f:
+        f.write(page)
+
+
+class FixtureServer:
+    """
+    Serves a history table over HTTP like tgju: /api answers DataTables
+    requests from `rows` (or fails with `api_status`, if given), /page
+    returns the rendered page.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], api_status: Optional[int] = None):
+        self.rows = rows
+        rows_ref = rows
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == '/api' and api_status:
+                    self.send_error(api_status)
+                    return
+                if url.path == '/api':
+                    start = int(query.get('start', ['0'])[0])
+                    length = int(query.get('length', [str(DEFAULT_PAGE_SIZE)])[0])
+                    draw = int(query.get('draw', ['1'])[0])
+                    body = json.dumps(api_payload(rows_ref, start, length, draw)).encode('utf-8')
+                    content_type = 'application/json'
+                elif url.path == '/page':
+                    body = html_page(rows_ref).encode('utf-8')
+                    content_type = 'text/html'
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/page"
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/api"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the benchmark fixtures")
+    parser.add_argument('--record', action='store_true', help="Capture the fixture pages again")
+    args = parser.parse_args()
+    if args.record:
+        os.chdir(ROOT)
+        record()
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+Measures the cold import cost of each entry point with `python -X importtime`
+in a fresh interpreter, and checks that data-only entry points don't load
+the browser stack, pandas or kaggle.
+
+Usage:
+    python benchmarks/importtime.py [--repeat 5] [--only src,src.reader]
+                                    [--output importtime.json]
+                                    [--baseline baseline.json] [--threshold 0.25]
+
+The time reported for an entry point is the cumulative import time of the
+modules it loads beyond what the interpreter imports at startup. The script
+exits with status 1 if an entry point loads a module it must not, or (with
+--baseline) got slower than the threshold allows.
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from typing import List, Dict, Any
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+
+RESULTS_VERSION = 1
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'importtime.json')
+
+BROWSER = ['selenium', 'webdriver_manager']
+HEAVY = BROWSER + ['pandas', 'kaggle', 'requests', 'lxml', 'numpy']
+
+# Entry point name, the statement that imports it, and top-level packages
+# it must not load
+ENTRY_POINTS = [
+    {'name': 'src', 'code': 'import src', 'forbid': HEAVY},
+    {'name': 'src.utils', 'code': 'import src.utils', 'forbid': HEAVY},
+    {'name': 'src.reader', 'code': 'from src.reader import open_dataset',
+     'forbid': BROWSER + ['pandas', 'kaggle', 'requests']},
+    {'name': 'src.data_manager', 'code': 'from src.data_manager import DataManager',
+     'forbid': BROWSER + ['pandas', 'kaggle', 'requests']},
+    {'name': 'src.probe', 'code': 'from src.probe import FreshnessProbe', 'forbid': BROWSER + ['pandas', 'kaggle']},
+    {'name': 'src.scraper', 'code': 'from src.scraper import EuroScraper', 'forbid': BROWSER + ['pandas', 'kaggle']},
+    {'name': 'main', 'code': 'import main', 'forbid': BROWSER + ['pandas', 'kaggle']},
+    {'name': 'serve', 'code': 'import serve', 'forbid': BROWSER + ['pandas', 'kaggle', 'requests']},
+    {'name': 'scripts.update_kaggle', 'code': "import sys; sys.path.insert(0, 'scripts'); import update_kaggle",
+     'forbid': HEAVY},
+    {'name': 'src.driver_pool', 'code': 'import src.driver_pool', 'forbid': ['pandas', 'kaggle']},
+]
+
+# An entry point regresses when its best time grows by more than the
+# threshold and by at least this much
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse `-X importtime` output into every imported module with its own
+    and cumulative seconds and its nesting depth (0 for imports made by the
+    code itself; deeper ones are included in their parent's cumulative time).
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        module = name.lstrip(' ')
+        depth = (len(name) - len(module) - 1) // 2
+        imports.append({'module': module, 'self': int(self_us) / 1e6,
+                        'seconds': int(cumulative_us) / 1e6, 'depth': depth})
+    return imports
+
+
+def measure(code: str) -> List[Dict[str, Any]]:
+    """Run `code` in a fresh interpreter and return the modules it imported."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                               capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'no output'
+        raise RuntimeError(last_line)
+    return parse_importtime(completed.stderr)
+
+
+def run_entry_point(entry: Dict[str, Any], startup: set, repeat: int) -> Dict[str, Any]:
+    """Import an entry point `repeat` times; the fastest run counts."""
+    runs = []
+    for _ in range(repeat):
+        try:
+            imports = [item for item in measure(entry['code']) if item['module'] not in startup]
+        except (RuntimeError, subprocess.SubprocessError) as e:
+            return {'error': str(e)}
+        runs.append((sum(item['seconds'] for item in imports if item['depth'] == 0), imports))
+
+    total, imports = min(runs, key=lambda run: run[0])
+    # Time spent in each top-level package's own modules
+    packages = {}
+    for item in imports:
+        package = item['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + item['self']
+    loaded = set(packages)
+    return {
+        'min': round(total, 6),
+        'runs': [round(run[0], 6) for run in runs],
+        'heaviest': [{'module': package, 'seconds': round(seconds, 6)}
+                     for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:5]],
+        'loaded': sorted(name for name in HEAVY if name in loaded),
+        'forbidden': sorted(name for name in entry['forbid'] if name in loaded)
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code the results were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Compare best times with a baseline run; returns one entry per shared entry point."""
+    comparisons = []
+    for name, result in results['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'min' not in base or 'min' not in result:
+            continue
+        ratio = result['min'] / base['min'] if base['min'] > 0 else float('inf')
+        regressed = ratio > 1 + threshold and result['min'] - base['min'] >= MIN_REGRESSION_SECONDS
+        comparisons.append({'name': name, 'baseline': base['min'], 'current': result['min'],
+                            'ratio': round(ratio, 3), 'regressed': regressed})
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold import time of each entry point")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per entry point (the best counts)")
+    parser.add_argument('--only', default='', help="Comma-separated entry point names to measure")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the JSON results")
+    parser.add_argument('--baseline', help="Earlier results to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+    selected = [entry for entry in ENTRY_POINTS if not only or entry['name'] in only]
+    unknown = only - {entry['name'] for entry in ENTRY_POINTS}
+    if unknown:
+        print(f"Unknown entry points: {', '.join(sorted(unknown))}")
+        return 2
+
+    # Whatever the bare interpreter imports is not charged to the entry points
+    startup = {item['module'] for item in measure('pass')}
+
+    results = {'version': RESULTS_VERSION, 'meta': environment(), 'results': {}}
+    status = 0
+    for entry in selected:
+        result = results['results'][entry['name']] = run_entry_point(entry, startup, max(1, args.repeat))
+        if 'error' in result:
+            print(f"  {entry['name']:<24} failed: {result['error']}")
+            continue
+        heaviest = ', '.join(f"{item['module']} {item['seconds'] * 1000:.0f}" for item in result['heaviest'][:3])
+        print(f"  {entry['name']:<24} {result['min'] * 1000:>8.1f} ms  ({heaviest})")
+        if result['forbidden']:
+            print(f"  {'':<24} loads {', '.join(result['forbidden'])}, which it should import lazily")
+            status = 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return status
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparisons = compare(results, baseline, args.threshold)
+    print(f"\nCompared with {args.baseline} (commit {baseline.get('meta', {}).get('commit')}):")
+    for item in comparisons:
+        flag = "  REGRESSION" if item['regressed'] else ""
+        print(f"  {item['name']:<24} {item['baseline'] * 1000:>8.1f} -> {item['current'] * 1000:>8.1f} ms"
+              f"  x{item['ratio']:.2f}{flag}")
+    regressions = [item for item in comparisons if item['regressed']]
+    if regressions:
+        print(f"\n{len(regressions)} entry points import more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Times the extract, clean, fetch, merge, save, load, summary and validation
+paths, the indicator computations and the query service on synthetic
+datasets, offline, against a local server replaying the history table (see
+benchmarks/fixtures.py).
+
+Usage:
+    python benchmarks/run.py [--sizes 10000,100000,1000000] [--repeat 3]
+                             [--only save_csv,load_csv] [--output results.json]
+                             [--baseline baseline.json] [--threshold 0.25]
+
+Results are written as JSON. With --baseline, every benchmark is compared
+with the baseline run and the script exits with status 1 if any got slower
+than the threshold allows.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, '..')
+sys.path.append(ROOT)
+sys.path.append(BENCH_DIR)
+
+import numpy as np
+import pandas as pd
+
+from src.config import COLUMN_MAPPING, DATA_DIR, SERVICE_RELOAD_INTERVAL
+from src.instruments import Instrument
+from src.utils import clean_price_text
+from src.fetcher import parse_table_json, parse_table_html
+from src.rate_limiter import RateLimiter
+from src.indicators import series, signals, IndicatorSet
+from src.rollups import RollupTables
+from src.validation import validate_columns
+from src.artifacts import ArtifactBuilder
+import fixtures
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [10000, 100000, 1000000]
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+# Rows the per-row parsing benchmarks stop at; their cost is linear, so
+# larger sizes would only make the run slower
+PARSE_MAX_ROWS = 100000
+FETCH_MAX_ROWS = 10000
+PAGE_ROWS = 1000
+
+# A benchmark regresses when its best time grows by more than the threshold
+# and by at least this many seconds (shorter differences are noise)
+MIN_REGRESSION_SECONDS = 0.005
+
+BENCH_INSTRUMENT = Instrument("bench", "price_eur", "Benchmark", "Benchmark_Dataset.csv")
+
+BENCHMARKS = []
+
+
+def benchmark(name: str, max_rows: Optional[int] = None):
+    """
+    Register a benchmark. The decorated function gets the Context and
+    returns the callable to time; it runs once per repeat, so it can set up
+    fresh state.
+    """
+    def register(setup: Callable):
+        BENCHMARKS.append({'name': name, 'setup': setup, 'max_rows': max_rows})
+        return setup
+    return register
+
+
+class Context:
+    """Synthetic dataset of one size and a seed copy of its data directory."""
+
+    def __init__(self, size: int, workdir: str):
+        self.size = size
+        self.workdir = workdir
+        self.rows = fixtures.synthetic_rows(size)
+        # Hold back a few rows from the middle so the merge path has a hole to fill
+        middle = size // 2
+        self.held_back = self.rows[middle:middle + 10]
+        self.seed_rows = self.rows[:middle] + self.rows[middle + 10:]
+        self.seed_root = os.path.join(workdir, 'seed')
+        self.columns = None
+
+    def prepare(self):
+        """Write the seed dataset with its columnar store, indicators and rollups."""
+        from src.data_manager import DataManager
+
+        # DataManager resolves DATA_DIR against the working directory
+        os.makedirs(os.path.join(self.seed_root, DATA_DIR))
+        os.chdir(self.seed_root)
+        fixtures.write_csv(os.path.join(DATA_DIR, BENCH_INSTRUMENT.csv_filename), self.seed_rows)
+        manager = DataManager(BENCH_INSTRUMENT)
+        manager._sync_columnar()
+        manager.get_indicators()
+        manager.get_rollup('month')
+        self.columns = manager.load_columns(mmap=False)
+
+    def fresh_data_dir(self, copy_seed: bool = True):
+        """Switch to a scratch working directory, optionally holding a copy of the seed data."""
+        root = os.path.join(self.workdir, 'run')
+        os.chdir(self.workdir)
+        shutil.rmtree(root, ignore_errors=True)
+        if copy_seed:
+            shutil.copytree(self.seed_root, root)
+        else:
+            os.makedirs(os.path.join(root, DATA_DIR))
+        os.chdir(root)
+
+    def limit(self, max_rows: Optional[int]) -> List[Dict[str, Any]]:
+        return self.rows if max_rows is None else self.rows[:max_rows]
+
+
+def _new_scraper(**kwargs):
+    from src.scraper import EuroScraper
+    return EuroScraper(instrument=BENCH_INSTRUMENT, rate_limiter=RateLimiter(min_interval=0), **kwargs)
+
+
+@benchmark('extract_json', max_rows=PARSE_MAX_ROWS)
+def bench_extract_json(ctx: Context):
+    rows = ctx.limit(PARSE_MAX_ROWS)
+    pages = [json.dumps(fixtures.api_payload(rows, start, PAGE_ROWS)) for start in range(0, len(rows), PAGE_ROWS)]
+    return lambda: [parse_table_json(json.loads(page)) for page in pages]
+
+
+@benchmark('extract_html', max_rows=PARSE_MAX_ROWS)
+def bench_extract_html(ctx: Context):
+    page = fixtures.load_fixture(fixtures.HTML_FIXTURE)
+    page_rows = len(parse_table_html(page)['rows'])
+    copies = -(-min(ctx.size, PARSE_MAX_ROWS) // page_rows)
+    return lambda: [parse_table_html(page) for _ in range(copies)]
+
+
+@benchmark('clean_rows', max_rows=PARSE_MAX_ROWS)
+def bench_clean_rows(ctx: Context):
+    ctx.fresh_data_dir(copy_seed=False)
+    scraper = _new_scraper()
+    raw = json.loads(fixtures.load_fixture(fixtures.API_FIXTURE))
+    cells = parse_table_json(raw)['rows']
+    raw_rows = (cells * (-(-min(ctx.size, PARSE_MAX_ROWS) // len(cells))))[:min(ctx.size, PARSE_MAX_ROWS)]
+    return lambda: scraper._parse_rows(raw_rows)
+
+
+@benchmark('clean_price_text')
+def bench_clean_price_text(ctx: Context):
+    texts = [f"{row[COLUMN_MAPPING['close_price']]:,}" for row in ctx.rows]
+    return lambda: [clean_price_text(text) for text in texts]
+
+
+@benchmark('fetch_replay', max_rows=FETCH_MAX_ROWS)
+def bench_fetch_replay(ctx: Context):
+    from src.fetcher import HttpFetcher
+
+    ctx.fresh_data_dir(copy_seed=False)
+    rows = ctx.limit(FETCH_MAX_ROWS)
+
+    def run():
+        with fixtures.FixtureServer(rows) as server:
+            scraper = _new_scraper(fetcher=HttpFetcher(server.base_url, server.api_url), page_length=PAGE_ROWS)
+            fetched = 0
+            for page_rows, _ in scraper._iter_http_pages():
+                fetched += len(page_rows)
+                if not page_rows or fetched >= len(rows):
+                    break
+            scraper._close_fetcher()
+        return fetched
+    return run
+
+
+@benchmark('save_csv')
+def bench_save_csv(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir(copy_seed=False)
+    manager = DataManager(BENCH_INSTRUMENT)
+    return lambda: manager.save_data(ctx.rows)
+
+
+@benchmark('save_pages')
+def bench_save_pages(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir(copy_seed=False)
+    manager = DataManager(BENCH_INSTRUMENT)
+    pages = [ctx.rows[start:start + PAGE_ROWS] for start in range(0, ctx.size, PAGE_ROWS)]
+    return lambda: manager.save_pages(iter(pages))
+
+
+@benchmark('load_csv')
+def bench_load_csv(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir()
+    return lambda: DataManager(BENCH_INSTRUMENT).load_existing_data()
+
+
+@benchmark('load_columnar')
+def bench_load_columnar(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir()
+    return lambda: DataManager(BENCH_INSTRUMENT).load_columns(mmap=False)
+
+
+@benchmark('summary_cold')
+def bench_summary_cold(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir()
+    return lambda: DataManager(BENCH_INSTRUMENT).get_data_summary()
+
+
+@benchmark('append_prepend')
+def bench_append_prepend(ctx: Context):
+    from src.data_manager import DataManager
+    ctx.fresh_data_dir()
+    manager = DataManager(BENCH_INSTRUMENT)
+    manager.get_index()
+    # Thirty days after the newest row, like a month of daily runs at once
+    newer = fixtures.synthetic_rows(ctx.size + 30)[:30]
+    return lambda: manager.append_new_data(newer)
+
+
+@benchmark('append_merge')
+def bench_append_merge(ctx: Context):
+    from src.data_manager import DataManager
+    if ctx.rows[0][COLUMN_MAPPING['gregorian_date']] > fixtures.PANDAS_MAX_DATE:
+        raise SkipBenchmark("merge sorts with pandas timestamps, which end in 2262")
+    ctx.fresh_data_dir()
+    manager = DataManager(BENCH_INSTRUMENT)
+    manager.get_index()
+    return lambda: manager.append_new_data(ctx.held_back)
+
+
+@benchmark('indicator_series')
+def bench_indicator_series(ctx: Context):
+    c = ctx.columns
+    high, low, close = (c[key].astype(np.float64) for key in ('high_price', 'low_price', 'close_price'))
+
+    def run():
+        series.rsi(close)
+        series.stochastic_slow(high, low, close)
+        series.momentum(close)
+        series.macd(close)
+        series.ichimoku(high, low, close)
+    return run
+
+
+@benchmark('indicator_signals')
+def bench_indicator_signals(ctx: Context):
+    c = ctx.columns
+    arrays = [c[key].astype(np.float64) for key in ('open_price', 'high_price', 'low_price', 'close_price')]
+    return lambda: signals.analyze(*arrays)
+
+
+@benchmark('indicator_state_build')
+def bench_indicator_state_build(ctx: Context):
+    return lambda: IndicatorSet.from_columns(ctx.columns)
+
+
+@benchmark('rollups_build')
+def bench_rollups_build(ctx: Context):
+    return lambda: RollupTables.from_columns(ctx.columns)
+
+
+@benchmark('validate')
+def bench_validate(ctx: Context):
+    return lambda: validate_columns(ctx.columns)
+
+
+@benchmark('service_1k_requests')
+def bench_service_requests(ctx: Context):
+    import http.client
+    import threading
+    from src.service import QueryService, make_server
+    ctx.fresh_data_dir()
+    service = QueryService([BENCH_INSTRUMENT], reload_interval=SERVICE_RELOAD_INTERVAL)
+    server = make_server(service, '127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Fixed-size answers, so the time doesn't grow with the payloads
+    latest = max(row[COLUMN_MAPPING['gregorian_date']] for row in ctx.seed_rows)
+    paths = ['/latest', '/summary', '/ohlc?limit=30', f'/rollups/month?start={latest}',
+             f'/indicators/rsi?start={latest}']
+
+    def request(connection, path):
+        connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+        connection.getresponse().read()
+
+    # Responses are cached after the first request, as in steady-state
+    # serving; the dataset size only shows in the uncached first requests
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port)
+    for path in paths:
+        request(connection, path)
+
+    def run():
+        try:
+            for i in range(1000):
+                request(connection, paths[i % len(paths)])
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+    return run
+
+
+@benchmark('artifacts_build')
+def bench_artifacts_build(ctx: Context):
+    path = os.path.join(ctx.workdir, 'artifacts')
+    shutil.rmtree(path, ignore_errors=True)
+    return lambda: ArtifactBuilder(path).build(ctx.columns)
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark's setup when it cannot run at this size."""
+
+
+def run_benchmark(entry: Dict[str, Any], ctx: Context, repeat: int) -> Dict[str, Any]:
+    """Time one benchmark `repeat` times, setting it up before each run."""
+    rows = ctx.size if entry['max_rows'] is None else min(ctx.size, entry['max_rows'])
+    times = []
+    for _ in range(repeat):
+        try:
+            target = entry['setup'](ctx)
+            start = time.perf_counter()
+            target()
+            times.append(time.perf_counter() - start)
+        except SkipBenchmark as e:
+            return {'rows': rows, 'skipped': str(e)}
+        except Exception as e:
+            # e.g. an older checkout measured for a baseline lacks the code path
+            return {'rows': rows, 'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'rows': rows,
+        'min': round(min(times), 6),
+        'median': round(statistics.median(times), 6),
+        'runs': [round(t, 6) for t in times],
+        'rows_per_second': round(rows / min(times)) if min(times) > 0 else None
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code the results were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Compare best times with a baseline run; returns one entry per shared benchmark."""
+    comparisons = []
+    for size, benches in results['results'].items():
+        for name, result in benches.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if not base or 'min' not in base or 'min' not in result:
+                continue
+            ratio = result['min'] / base['min'] if base['min'] > 0 else float('inf')
+            regressed = ratio > 1 + threshold and result['min'] - base['min'] >= MIN_REGRESSION_SECONDS
+            comparisons.append({
+                'size': size, 'name': name, 'baseline': base['min'], 'current': result['min'],
+                'ratio': round(ratio, 3), 'regressed': regressed
+            })
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated synthetic dataset sizes (rows)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark (the best one counts)")
+    parser.add_argument('--only', default='', help="Comma-separated benchmark names to run")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the JSON results")
+    parser.add_argument('--baseline', help="Earlier results to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # The library logs every save; keep the benchmark output readable
+    logging.disable(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+    selected = [entry for entry in BENCHMARKS if not only or entry['name'] in only]
+    unknown = only - {entry['name'] for entry in BENCHMARKS}
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+        return 2
+
+    results = {'version': RESULTS_VERSION, 'meta': environment(), 'results': {}}
+    cwd = os.getcwd()
+    try:
+        for size in sizes:
+            workdir = tempfile.mkdtemp(prefix=f'bench-{size}-')
+            try:
+                print(f"\n{size:,} rows")
+                ctx = Context(size, workdir)
+                ctx.prepare()
+                size_results = results['results'][str(size)] = {}
+                for entry in selected:
+                    result = run_benchmark(entry, ctx, max(1, args.repeat))
+                    size_results[entry['name']] = result
+                    if 'skipped' in result or 'error' in result:
+                        print(f"  {entry['name']:<24} {result.get('skipped') or 'failed: ' + result['error']}")
+                    else:
+                        print(f"  {entry['name']:<24} {result['min'] * 1000:>10.1f} ms  ({result['rows']:,} rows)")
+            finally:
+                os.chdir(cwd)
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        os.chdir(cwd)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparisons = compare(results, baseline, args.threshold)
+    print(f"\nCompared with {args.baseline} (commit {baseline.get('meta', {}).get('commit')}):")
+    for item in comparisons:
+        flag = "  REGRESSION" if item['regressed'] else ""
+        print(f"  {int(item['size']):>9,} {item['name']:<24} {item['baseline'] * 1000:>10.1f} -> "
+              f"{item['current'] * 1000:>10.1f} ms  x{item['ratio']:.2f}{flag}")
+    regressions = [item for item in comparisons if item['regressed']]
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks are more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
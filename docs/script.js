@@ -1,5 +1,11 @@
 // Configuration
 const DATA_URL = 'https://raw.githubusercontent.com/kooroshkz/Euro-Rial-Toman-Live-Price-Dataset/refs/heads/main/data/Euro_Rial_Price_Dataset.csv';
+// Pre-built, year-sharded data generated by the Python side (src/artifacts.py)
+const ARTIFACTS_URL = 'data/';
+// Year shards loaded with the page; older years load only when the chart is
+// scrolled back to them or the full history is requested
+const INITIAL_YEARS = 2;
+const LOAD_OLDER_MARGIN = 10; // Bars from the start of the loaded data that trigger the next year
 
 // Global variables
 let chart;
@@ -8,6 +14,9 @@ let lineSeries;
 let areaSeries;
 let currentSeriesType = 'candlestick';
 let allData = [];
+let olderShards = []; // Manifest entries of the years not loaded yet, oldest first
+let totalRecords = 0;
+let loadingOlder = null;
 let indicatorCharts = {
     rsi: null,
     stochastic: null,
@@ -169,27 +178,17 @@ const SAMPLE_DATA = [
 async function loadData() {
     try {
         console.log('Starting data load...');
-        console.log('Fetching data from:', DATA_URL);
         
-        // Try to fetch real data first
-        const response = await fetch(DATA_URL, {
-            method: 'GET',
-            mode: 'cors',
-            headers: {
-                'Accept': 'text/csv,text/plain,*/*'
-            }
-        });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        // Try the compact artifacts first, then the full CSV
+        try {
+            allData = await loadArtifacts();
+            console.log('Artifact data points:', allData.length, 'of', totalRecords);
+        } catch (artifactError) {
+            console.warn('Artifacts unavailable, falling back to CSV:', artifactError.message);
+            allData = await loadCSV();
+            totalRecords = allData.length;
         }
         
-        const csvText = await response.text();
-        console.log('CSV data loaded, length:', csvText.length);
-        
-        allData = parseCSV(csvText);
-        console.log('Parsed data points:', allData.length);
-        
         if (allData.length === 0) {
             throw new Error('No data parsed from CSV');
         }
@@ -200,6 +199,7 @@ async function loadData() {
         
         // Use sample data as fallback
         allData = SAMPLE_DATA;
+        totalRecords = allData.length;
         console.log('Sample data loaded:', allData.length, 'records');
         
         // Show a message to user
@@ -207,7 +207,8 @@ async function loadData() {
     }
     
     console.log('Updating statistics...');
-    updateStatistics(allData);
+    updateStatistics(allData, totalRecords);
+    updateHistoryButton();
     
     console.log('Updating data table...');
     updateRecentDataTable(allData.slice(-10)); // Show last 10 records
@@ -224,6 +225,151 @@ async function loadData() {
     console.log('✅ Data loading complete');
 }
 
+// Fetch and parse the full CSV
+async function loadCSV() {
+    console.log('Fetching data from:', DATA_URL);
+    
+    const response = await fetch(DATA_URL, {
+        method: 'GET',
+        mode: 'cors',
+        headers: {
+            'Accept': 'text/csv,text/plain,*/*'
+        }
+    });
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const csvText = await response.text();
+    console.log('CSV data loaded, length:', csvText.length);
+    
+    const data = parseCSV(csvText);
+    console.log('Parsed data points:', data.length);
+    return data;
+}
+
+// Load the newest year shards listed in the artifact manifest (already sorted
+// oldest first); the older ones are left for loadOlderShards
+async function loadArtifacts() {
+    if (typeof DecompressionStream === 'undefined') {
+        throw new Error('DecompressionStream not supported');
+    }
+    
+    olderShards = [];
+    const response = await fetch(`${ARTIFACTS_URL}manifest.json`, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const manifest = await response.json();
+    console.log('Artifact manifest loaded:', manifest.rows, 'records in', manifest.shards.length, 'shards');
+    
+    // Show the most recent records while the year shards load
+    fetchArtifact(manifest.latest)
+        .then(latest => {
+            if (allData.length === 0) updateRecentDataTable(latest.slice(-10));
+        })
+        .catch(() => {});
+    
+    const split = Math.max(0, manifest.shards.length - INITIAL_YEARS);
+    const shards = await Promise.all(manifest.shards.slice(split).map(fetchArtifact));
+    olderShards = manifest.shards.slice(0, split);
+    totalRecords = manifest.rows;
+    return [].concat(...shards);
+}
+
+// Prepend the next `count` older year shards (all of them if omitted) to the chart data
+function loadOlderShards(count = olderShards.length) {
+    if (loadingOlder) return loadingOlder;
+    if (olderShards.length === 0) return Promise.resolve();
+    
+    const entries = olderShards.slice(-count);
+    loadingOlder = Promise.all(entries.map(fetchArtifact))
+        .then(shards => {
+            olderShards = olderShards.slice(0, olderShards.length - entries.length);
+            // Keep the chart on the dates it shows while bars are added before them
+            const visibleRange = chart.timeScale().getVisibleRange();
+            allData = [].concat(...shards, allData);
+            window.allData = allData;
+            setSeriesData(allData);
+            if (visibleRange) chart.timeScale().setVisibleRange(visibleRange);
+            refreshIndicators();
+            console.log(`Loaded ${entries.map(entry => entry.name).join(', ')}:`, allData.length, 'records');
+        })
+        .catch(error => console.warn('Could not load older data:', error.message))
+        .finally(() => {
+            loadingOlder = null;
+            updateHistoryButton();
+        });
+    return loadingOlder;
+}
+
+// Fetch, decompress and decode one shard
+async function fetchArtifact(entry) {
+    const response = await fetch(`${ARTIFACTS_URL}${entry.file}?v=${entry.sha256.slice(0, 12)}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+    return decodeShard(JSON.parse(await new Response(stream).text()));
+}
+
+// Undo delta encoding: the first value is absolute, the rest are differences
+function undelta(values) {
+    const result = new Array(values.length);
+    let current = 0;
+    for (let i = 0; i < values.length; i++) {
+        current += values[i];
+        result[i] = current;
+    }
+    return result;
+}
+
+// Two-digit strings for months and days
+const PAD2 = Array.from({ length: 100 }, (_, i) => String(i).padStart(2, '0'));
+
+// Days since 1970-01-01 to [year, month, day] without going through Date
+function civilFromDays(days) {
+    const z = days + 719468;
+    const era = Math.floor(z / 146097);
+    const doe = z - era * 146097;
+    const yoe = Math.floor((doe - Math.floor(doe / 1460) + Math.floor(doe / 36524) - Math.floor(doe / 146096)) / 365);
+    const doy = doe - (365 * yoe + Math.floor(yoe / 4) - Math.floor(yoe / 100));
+    const mp = Math.floor((5 * doy + 2) / 153);
+    const day = doy - Math.floor((153 * mp + 2) / 5) + 1;
+    const month = mp < 10 ? mp + 3 : mp - 9;
+    return [yoe + era * 400 + (month <= 2 ? 1 : 0), month, day];
+}
+
+// Build the same records parseCSV returns from a columnar shard
+function decodeShard(shard) {
+    const days = undelta(shard.date);
+    const persianDates = undelta(shard.persian_date);
+    const [open, low, high, close] = ['open_price', 'low_price', 'high_price', 'close_price']
+        .map(key => undelta(shard[key]).map(price => (price < 0 ? NaN : price)));
+    
+    const data = new Array(shard.rows);
+    for (let i = 0; i < shard.rows; i++) {
+        const [year, month, day] = civilFromDays(days[i]);
+        const p = persianDates[i];
+        const changeAmount = shard.change_amount[i];
+        const changePercent = shard.change_percent[i];
+        data[i] = {
+            gdate: `${year}/${PAD2[month]}/${PAD2[day]}`,
+            pdate: p ? `${Math.floor(p / 10000)}/${PAD2[Math.floor(p / 100) % 100]}/${PAD2[p % 100]}` : '',
+            time: `${year}-${PAD2[month]}-${PAD2[day]}`,
+            open: open[i],
+            low: low[i],
+            high: high[i],
+            close: close[i],
+            value: close[i],
+            changeAmount: changeAmount === null ? '' : String(changeAmount),
+            changePercent: changePercent === null ? '' : `${changePercent}%`
+        };
+    }
+    return data;
+}
+
 // Show data source message
 function showDataSourceMessage(message) {
     const messageDiv = document.createElement('div');
@@ -323,10 +469,9 @@ function parseCSVLine(line) {
     return result;
 }
 
-// Update statistics
-function updateStatistics(data) {
+// Update statistics (the record count includes years not loaded yet)
+function updateStatistics(data, totalRecords = data.length) {
     if (data.length === 0) return;
-    const totalRecords = data.length;
     const lastRecord = data[data.length - 1];
     const currentPrice = formatNumber(lastRecord.close);
     const lastUpdate = lastRecord.gdate;
@@ -358,29 +503,7 @@ function updateRecentDataTable(recentData) {
 function updateChart(data) {
     if (data.length === 0) return;
 
-    console.log('Preparing chart data...');
-    // Prepare data for different series types
-    const candlestickData = data.map(item => ({
-        time: item.time,
-        open: item.open,
-        high: item.high,
-        low: item.low,
-        close: item.close,
-    }));
-
-    const lineData = data.map(item => ({
-        time: item.time,
-        value: item.close,
-    }));
-
-    console.log('Setting data to series...');
-    console.log('Sample candlestick data:', candlestickData.slice(0, 2));
-    console.log('Sample line data:', lineData.slice(0, 2));
-
-    // Set data for all series
-    candlestickSeries.setData(candlestickData);
-    lineSeries.setData(lineData);
-    areaSeries.setData(lineData);
+    setSeriesData(data);
 
     console.log('Fitting content...');
     // Fit content to show all data
@@ -408,9 +531,52 @@ function updateChart(data) {
     }
 }
 
+// Set the bars of every price series
+function setSeriesData(data) {
+    console.log('Preparing chart data...');
+    // Prepare data for different series types
+    const candlestickData = data.map(item => ({
+        time: item.time,
+        open: item.open,
+        high: item.high,
+        low: item.low,
+        close: item.close,
+    }));
+
+    const lineData = data.map(item => ({
+        time: item.time,
+        value: item.close,
+    }));
+
+    console.log('Setting data to series...');
+    console.log('Sample candlestick data:', candlestickData.slice(0, 2));
+    console.log('Sample line data:', lineData.slice(0, 2));
+
+    // Set data for all series
+    candlestickSeries.setData(candlestickData);
+    lineSeries.setData(lineData);
+    areaSeries.setData(lineData);
+}
+
+// Recompute the active indicators over the current data
+function refreshIndicators() {
+    activeIndicators.forEach(indicatorType => {
+        removeIndicator(indicatorType);
+        addIndicator(indicatorType);
+    });
+}
+
+// Enable the full history button while older years are left to load
+function updateHistoryButton() {
+    const button = document.getElementById('loadHistory');
+    if (button) {
+        button.disabled = olderShards.length === 0 || loadingOlder !== null;
+    }
+}
+
 // Setup event listeners
 function setupEventListeners() {
-    const chartButtons = document.querySelectorAll('.chart-btn');
+    const chartButtons = document.querySelectorAll('.chart-btn[data-type]');
     
     chartButtons.forEach(button => {
         button.addEventListener('click', () => {
@@ -424,6 +590,35 @@ function setupEventListeners() {
     });
     
     setupIndicatorEventListeners();
+    setupHistoryLoading();
+}
+
+// Load the previous year when the user scrolls or zooms the chart back to
+// the first loaded bar, or every older year from the full history button
+function setupHistoryLoading() {
+    // Range changes from fitContent and setData alone never load anything
+    let userMoved = false;
+    const container = document.getElementById('chart');
+    ['wheel', 'mousedown', 'touchstart'].forEach(type => {
+        container.addEventListener(type, () => { userMoved = true; }, { passive: true });
+    });
+    
+    chart.timeScale().subscribeVisibleLogicalRangeChange(range => {
+        if (userMoved && range && range.from < LOAD_OLDER_MARGIN && olderShards.length > 0) {
+            loadOlderShards(1);
+        }
+    });
+    
+    const button = document.getElementById('loadHistory');
+    if (button) {
+        button.addEventListener('click', () => {
+            button.disabled = true;
+            // Let a load already under way finish, then fetch the rest
+            Promise.resolve(loadingOlder)
+                .then(() => loadOlderShards())
+                .then(() => chart.timeScale().fitContent());
+        });
+    }
 }
 
 // Setup indicator event listeners
@@ -10,38 +10,182 @@ Author: Koorosh Komeili Zadeh
 
 import sys
 import os
+import time
+import argparse
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.scraper import EuroScraper
-from src.utils import setup_logging
+from src.config import DATA_DIR, DEFAULT_INSTRUMENTS, SCHEDULER_MAX_WORKERS, BACKFILL_WORKERS
+from src.data_manager import DataManager
+from src.instruments import INSTRUMENTS, parse_instruments
+from src.metrics import metrics
+from src.probe import FreshnessProbe
+from src.scheduler import Scheduler
+from src.logging_config import configure_logging, get_logger, get_run_id
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Scrape tgju.org price history")
+    parser.add_argument(
+        '--instruments', default=','.join(DEFAULT_INSTRUMENTS),
+        help=f"Comma-separated instruments to scrape, or 'all' (known: {', '.join(INSTRUMENTS)})"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=SCHEDULER_MAX_WORKERS,
+        help="Maximum number of instruments scraped at once"
+    )
+    parser.add_argument(
+        '--backfill', action='store_true',
+        help="Rebuild the whole dataset, fetching pages in parallel, instead of an incremental update"
+    )
+    parser.add_argument(
+        '--backfill-workers', type=int, default=BACKFILL_WORKERS,
+        help="Parallel page ranges per instrument during a backfill"
+    )
+    parser.add_argument(
+        '--repair-gaps', action='store_true',
+        help="Fetch only the pages holding missing trading days instead of an incremental update"
+    )
+    parser.add_argument(
+        '--probe', action='store_true',
+        help="Check the newest remote row first and only scrape instruments that changed"
+    )
+    parser.add_argument(
+        '--probe-only', action='store_true',
+        help="Only run the freshness probe and report the result"
+    )
+    parser.add_argument(
+        '--validate', action='store_true',
+        help="Only check the saved datasets and report anomalies (exit code 1 on errors)"
+    )
+    parser.add_argument(
+        '--repair', action='store_true',
+        help="Like --validate, but first fill in missing change and Persian date cells from the closes"
+    )
+    parser.add_argument(
+        '--metrics-jsonl', default=os.environ.get('SCRAPER_METRICS_JSONL'),
+        help="Append per-phase spans and a run summary to this JSON lines file"
+    )
+    parser.add_argument(
+        '--metrics-prom', default=os.environ.get('SCRAPER_METRICS_PROM'),
+        help="Write span totals and counters to this Prometheus textfile"
+    )
+    parser.add_argument(
+        '--log-level', default=None,
+        help="Log level (DEBUG, INFO, WARNING...); defaults to SCRAPER_LOG_LEVEL or INFO"
+    )
+    return parser.parse_args(argv)
+
+
+def write_github_output(values):
+    """Expose values as step outputs when running under GitHub Actions."""
+    output_path = os.environ.get('GITHUB_OUTPUT')
+    if not output_path:
+        return
+    with open(output_path, 'a', encoding='utf-8') as f:
+        for key, value in values.items():
+            f.write(f"{key}={value}\n")
+
+
+def probe_instruments(instruments):
+    """Probe every instrument; returns the ones whose remote data changed."""
+    start = time.perf_counter()
+    results = [FreshnessProbe(instrument).run() for instrument in instruments]
+    elapsed = time.perf_counter() - start
+    
+    changed = [instrument for instrument, result in zip(instruments, results) if result['changed']]
+    for result in results:
+        print(f"{result['instrument']}: {result['reason']} "
+              f"(remote {result['remote_date']}, local {result['local_date']})")
+    print(f"Probe finished in {elapsed:.3f}s: {len(changed)}/{len(instruments)} changed")
+    
+    write_github_output({
+        'PROBE_CHANGED': 'true' if changed else 'false',
+        'PROBE_CHANGED_INSTRUMENTS': ','.join(instrument.key for instrument in changed),
+        'PROBE_SECONDS': f"{elapsed:.3f}"
+    })
+    return changed
+
+
+def validate_instruments(instruments, repair=False):
+    """Validate every instrument's dataset; returns the number of errors found."""
+    errors = 0
+    for instrument in instruments:
+        manager = DataManager(instrument)
+        report = manager.validate(repair=repair)
+        errors += report['errors']
+        print(f"{instrument.key}: {report['rows']} rows, {report['errors']} errors, "
+              f"{report['warnings']} warnings ({report.get('elapsed', 0) * 1000:.1f} ms)")
+        if repair:
+            print(f"  filled {report['repaired']} missing cells")
+        for name, check in report['checks'].items():
+            if check['count']:
+                print(f"  {check['severity']:<8} {name}: {check['count']} ({', '.join(check['dates'][:3])}"
+                      f"{', ...' if check['count'] > 3 else ''})")
+        if report['rows']:
+            print(f"  Report: {manager.validation_path}")
+    return errors
+
+
+def main(argv=None):
     """Main entry point for the euro scraper."""
+    args = parse_args(argv)
+    
+    configure_logging(level=args.log_level)
+    logger = get_logger(__name__)
+    
+    if args.metrics_jsonl or args.metrics_prom:
+        metrics.configure(args.metrics_jsonl, args.metrics_prom, run_id=get_run_id())
+    
+    try:
+        with metrics.span('run'):
+            return run(args, logger)
+    finally:
+        metrics.flush()
+
+
+def run(args, logger):
+    """Probe and scrape the selected instruments; returns the exit code."""
+    try:
+        instruments = parse_instruments(args.instruments)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    
+    if args.validate or args.repair:
+        return 1 if validate_instruments(instruments, repair=args.repair) else 0
+    
+    if args.probe or args.probe_only:
+        instruments = probe_instruments(instruments)
+        if args.probe_only:
+            return 0
+        if not instruments:
+            print("No new data upstream, nothing to scrape.")
+            return 0
+    
     print("=" * 60)
-    print("EUR/IRR Exchange Rate Scraper")
+    print("tgju.org Price History Scraper")
     print("=" * 60)
-    print("Target: https://www.tgju.org/profile/price_eur/history")
-    print("Output: data/Euro_Rial_Price_Dataset.csv")
+    for instrument in instruments:
+        print(f"{instrument.name}: {instrument.base_url}")
+        print(f"  Output: {DATA_DIR}/{instrument.csv_filename}")
     print("=" * 60)
     
-    logger = setup_logging()
-    
     try:
-        # Initialize scraper
-        scraper = EuroScraper()
-        
-        # Run the scraper
+        # Run the scrapers
         print("\nStarting scraper...")
-        success = scraper.run()
+        results = Scheduler(instruments, max_workers=args.workers, backfill=args.backfill,
+                            backfill_workers=args.backfill_workers, repair_gaps=args.repair_gaps).run()
         
-        if success:
+        failed = [key for key, success in results.items() if not success]
+        metrics.count('instrument_failures', len(failed))
+        if not failed:
             print("\nScraping completed successfully!")
-            print("Check the 'data' folder for your CSV file.")
+            print("Check the 'data' folder for your CSV files.")
         else:
-            print("\nScraping failed. Check the log file for details.")
+            print(f"\nScraping failed for: {', '.join(failed)}. Check the log file for details.")
             return 1
             
     except KeyboardInterrupt:
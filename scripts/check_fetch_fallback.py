@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Fetch Fallback Check
+Runs the HTTP backend offline against the benchmark fixture server (see
+benchmarks/fixtures.py) with the history endpoint down, so only the rendered
+first page can be read, and checks that no run treats that page as the
+whole table. Backfills are also run against a table shorter than the local
+dataset, which they must leave in place. Browsers are never started: the
+Selenium fallback gets a driver pool that has none.
+
+Usage:
+    python scripts/check_fetch_fallback.py [--rows N]
+
+Exits with status 1 if any check fails.
+"""
+
+import os
+import sys
+import shutil
+import logging
+import argparse
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
+
+from src.config import DATA_DIR, DEFAULT_PAGE_SIZE
+from src.instruments import Instrument
+from src.fetcher import HttpFetcher, FetchError
+from src.rate_limiter import RateLimiter
+import fixtures
+
+CHECK_INSTRUMENT = Instrument("check", "price_eur", "Fallback check", "Fallback_Check_Dataset.csv")
+
+
+def no_browser():
+    raise RuntimeError("No browser in the offline check")
+
+
+def new_scraper(server: fixtures.FixtureServer):
+    from src.scraper import EuroScraper
+    from src.driver_pool import DriverPool
+    return EuroScraper(instrument=CHECK_INSTRUMENT, fetcher=HttpFetcher(server.base_url, server.api_url),
+                       rate_limiter=RateLimiter(min_interval=0), driver_pool=DriverPool(factory=no_browser))
+
+
+def seed(rows: list):
+    """Replace the local dataset with `rows`."""
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+    os.makedirs(DATA_DIR)
+    fixtures.write_csv(os.path.join(DATA_DIR, CHECK_INSTRUMENT.csv_filename), rows)
+
+
+def read_csv() -> bytes:
+    with open(os.path.join(DATA_DIR, CHECK_INSTRUMENT.csv_filename), 'rb') as f:
+        return f.read()
+
+
+def pages_until_error(scraper, incremental: bool) -> tuple:
+    """Drain _iter_http_pages; returns (rows yielded, whether it raised FetchError)."""
+    fetched = 0
+    try:
+        for page_rows, _ in scraper._iter_http_pages(incremental):
+            fetched += len(page_rows)
+    except FetchError:
+        return fetched, True
+    finally:
+        scraper._close_fetcher()
+    return fetched, False
+
+
+def run_checks(rows: list) -> list:
+    errors = []
+
+    with fixtures.FixtureServer(rows) as server:
+        seed(rows[DEFAULT_PAGE_SIZE:])
+        fetched, failed = pages_until_error(new_scraper(server), incremental=False)
+        if failed or fetched != len(rows):
+            errors.append(f"endpoint up: full scrape read {fetched} of {len(rows)} rows")
+
+    with fixtures.FixtureServer(rows, api_status=500) as server:
+        seed(rows[DEFAULT_PAGE_SIZE:])
+        fetched, failed = pages_until_error(new_scraper(server), incremental=False)
+        if not failed or fetched:
+            errors.append(f"endpoint down: full scrape yielded {fetched} rows from the rendered page")
+
+        seed(rows[DEFAULT_PAGE_SIZE + 10:])
+        fetched, failed = pages_until_error(new_scraper(server), incremental=True)
+        if not failed or fetched:
+            errors.append(f"endpoint down: incremental run short of the existing data yielded {fetched} rows")
+
+        seed(rows[5:])
+        if not new_scraper(server).scrape_all_data(incremental=True):
+            errors.append("endpoint down: incremental run within the rendered page failed")
+        else:
+            seed_path = os.path.join(DATA_DIR, 'expected.csv')
+            fixtures.write_csv(seed_path, rows)
+            with open(seed_path, 'rb') as f:
+                expected = f.read()
+            if read_csv() != expected:
+                errors.append("endpoint down: incremental run within the rendered page left a different dataset")
+
+        seed(rows)
+        before = read_csv()
+        if new_scraper(server).backfill(workers=2) or read_csv() != before:
+            errors.append("endpoint down: backfill replaced the dataset")
+
+    with fixtures.FixtureServer(rows[:len(rows) // 2]) as server:
+        seed(rows)
+        before = read_csv()
+        if new_scraper(server).backfill(workers=2) or read_csv() != before:
+            errors.append("shorter table: backfill replaced the larger dataset")
+
+    with fixtures.FixtureServer(rows) as server:
+        seed(rows[len(rows) // 2:])
+        if not new_scraper(server).backfill(workers=2):
+            errors.append("endpoint up: backfill failed")
+        else:
+            fetched = read_csv().count(b'\n') - 1
+            if fetched != len(rows):
+                errors.append(f"endpoint up: backfill saved {fetched} of {len(rows)} rows")
+
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the HTTP backend with only the rendered page available")
+    parser.add_argument('--rows', type=int, default=500, help="Rows in the served table")
+    args = parser.parse_args()
+
+    # The failures logged along the way are the expected ones
+    logging.disable(logging.ERROR)
+    rows = fixtures.synthetic_rows(max(args.rows, 2 * DEFAULT_PAGE_SIZE))
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='fallback-check-')
+    try:
+        # DataManager resolves DATA_DIR against the working directory
+        os.chdir(workdir)
+        errors = run_checks(rows)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if errors:
+        print(f"❌ {len(errors)} fallback checks failed:")
+        for error in errors:
+            print(f"  {error}")
+        return 1
+
+    print(f"✅ HTTP fallback checks passed on {len(rows)} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Indicator Parity Check
+Runs the dashboard's JavaScript indicators (docs/script.js, docs/ta.js) under
+Node.js and compares them with src.indicators on the same data.
+
+Usage:
+    python scripts/check_indicator_parity.py [--rows N] [--tolerance 1e-9]
+
+Exits with status 1 if any value or signal differs.
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from src.data_manager import DataManager
+from src.indicators import series, signals
+
+# Evaluates the dashboard scripts with stubbed browser globals and prints
+# the indicator outputs for the bars read from stdin as JSON.
+NODE_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const path = require('path');
+
+const docs = process.argv[1];
+const bars = JSON.parse(fs.readFileSync(0, 'utf8'));
+const element = { addEventListener() {}, querySelector() { return null; }, style: {}, classList: { add() {}, remove() {} } };
+const context = {
+    console: { log() {}, error() {}, warn() {} },
+    document: { addEventListener() {}, querySelectorAll() { return []; }, getElementById() { return null; }, createElement() { return element; } },
+    window: {},
+    setTimeout() {}
+};
+vm.createContext(context);
+for (const file of ['script.js', 'ta.js']) {
+    vm.runInContext(fs.readFileSync(path.join(docs, file), 'utf8'), context, { filename: file });
+}
+context.bars = bars;
+const result = vm.runInContext(`
+    const out = { series: {}, panels: {} };
+    out.series.rsi = calculateRSI(bars, 14);
+    out.series.stochastic = calculateStochastic(bars, 14, 3);
+    out.series.stochastic_slow = calculateStochasticSlow(bars, 14, 3, 3);
+    out.series.momentum = calculateMomentum(bars, 10);
+    const macdResult = calculateMACD(bars, 12, 26, 9);
+    out.series.macd = macdResult.macd;
+    out.series.macd_signal = macdResult.signal;
+    const cloud = calculateIchimoku(bars);
+    out.series.tenkan_sen = cloud.tenkanSen;
+    out.series.kijun_sen = cloud.kijunSen;
+    out.series.senkou_span_a = cloud.senkouSpanA;
+    out.series.senkou_span_b = cloud.senkouSpanB;
+    out.series.chikou_span = cloud.chikouSpan;
+    for (const period of [12, 26, 50]) {
+        out.series['ema_' + period] = calculateEMA(bars, period);
+    }
+
+    const ta = Object.create(TechnicalAnalysis.prototype);
+    for (const timeframe of ['day', 'week', 'month']) {
+        ta.data = bars;
+        ta.currentTimeframe = timeframe;
+        ta.indicators = { ma: { value: 0, signal: 'neutral' }, rsi: { value: 50, signal: 'neutral' }, macd: { value: 0, signal: 'neutral' } };
+        const periodData = ta.getDataForTimeframe();
+        ta.calculateMovingAverage(periodData);
+        ta.calculateRSI(periodData);
+        ta.calculateMACD(periodData);
+        ta.calculateAllOscillators(periodData);
+        ta.calculateAllMovingAverages(periodData);
+        out.panels[timeframe] = { indicators: ta.indicators, oscillators: ta.oscillators, moving_averages: ta.movingAverages };
+    }
+    JSON.stringify(out);
+`, context);
+process.stdout.write(result);
+"""
+
+
+def load_bars(rows: int) -> dict:
+    """Load the latest rows of the dataset as OHLC arrays plus chart times."""
+    columns = DataManager().load_columns()
+    start = max(0, len(columns['close_price']) - rows) if rows else 0
+    return {
+        'time': [str(d) for d in columns['gregorian_date'][start:]],
+        'open': np.asarray(columns['open_price'][start:], dtype=np.float64),
+        'high': np.asarray(columns['high_price'][start:], dtype=np.float64),
+        'low': np.asarray(columns['low_price'][start:], dtype=np.float64),
+        'close': np.asarray(columns['close_price'][start:], dtype=np.float64)
+    }
+
+
+def run_javascript(bars: dict) -> dict:
+    """Run the dashboard indicators under Node.js."""
+    payload = [
+        {'time': t, 'open': o, 'high': h, 'low': l, 'close': c}
+        for t, o, h, l, c in zip(bars['time'], *(bars[k].tolist() for k in ('open', 'high', 'low', 'close')))
+    ]
+    result = subprocess.run(
+        ['node', '-e', NODE_HARNESS, os.path.join(ROOT, 'docs')],
+        input=json.dumps(payload), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def python_series(bars: dict) -> dict:
+    """Compute the Python series under the names used by the harness."""
+    high, low, close = bars['high'], bars['low'], bars['close']
+    macd = series.macd(close, 12, 26, 9)
+    cloud = series.ichimoku(high, low, close)
+    result = {
+        'rsi': series.rsi(close, 14),
+        'stochastic': series.stochastic(high, low, close, 14),
+        'stochastic_slow': series.stochastic_slow(high, low, close, 14, 3),
+        'momentum': series.momentum(close, 10),
+        'macd': macd['macd'],
+        'macd_signal': macd['signal']
+    }
+    result.update(cloud)
+    for period in (12, 26, 50):
+        result[f'ema_{period}'] = series.ema(close, period)
+    return result
+
+
+def close_enough(expected, actual, tolerance: float) -> bool:
+    """Compare numbers (or numeric strings) with a relative tolerance; null matches NaN."""
+    if expected is None or actual is None:
+        return expected is None and (actual is None or math.isnan(float(actual)))
+    expected, actual = float(expected), float(actual)
+    if math.isnan(expected) or math.isnan(actual):
+        return math.isnan(expected) and math.isnan(actual)
+    if math.isinf(expected) or math.isinf(actual):
+        return expected == actual
+    return abs(expected - actual) <= tolerance * max(1.0, abs(expected))
+
+
+def compare_series(js: dict, py: dict, times: list, tolerance: float) -> list:
+    errors = []
+    position = {t: i for i, t in enumerate(times)}
+    for name, points in js.items():
+        values = py[name]
+        expected_positions = set()
+        for point in points:
+            i = position[point['time']]
+            expected_positions.add(i)
+            if not close_enough(point['value'], values[i], tolerance):
+                errors.append(f"series {name} at {point['time']}: js={point['value']} py={values[i]}")
+                break
+        extra = [i for i in np.flatnonzero(~np.isnan(values)) if i not in expected_positions]
+        if extra:
+            errors.append(f"series {name}: python has values at {len(extra)} positions js does not")
+    return errors
+
+
+def compare_panel(js: dict, py: dict, label: str, tolerance: float) -> list:
+    errors = []
+    for group in ('indicators', 'oscillators', 'moving_averages'):
+        for name, expected in js[group].items():
+            actual = py[group][name]
+            if expected['signal'] != actual['signal'] or not close_enough(expected['value'], actual['value'], tolerance):
+                errors.append(f"{label} {group} {name}: js={expected} py={actual}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare src.indicators with the dashboard JavaScript")
+    parser.add_argument('--rows', type=int, default=0, help="Use only the latest N rows (default: all)")
+    parser.add_argument('--tolerance', type=float, default=1e-9, help="Relative tolerance for values")
+    args = parser.parse_args()
+
+    bars = load_bars(args.rows)
+    js = run_javascript(bars)
+
+    errors = compare_series(js['series'], python_series(bars), bars['time'], args.tolerance)
+    for timeframe, panel in js['panels'].items():
+        py_panel = signals.analyze(bars['open'], bars['high'], bars['low'], bars['close'], timeframe)
+        errors.extend(compare_panel(panel, py_panel, timeframe, args.tolerance))
+
+    if errors:
+        print(f"❌ {len(errors)} indicator mismatches:")
+        for error in errors:
+            print(f"  {error}")
+        return 1
+
+    print(f"✅ Python indicators match the dashboard on {len(bars['close'])} bars")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Rollup Check
+Builds the rollup tables (src/rollups.py) from synthetic data with missing
+price cells, both in one pass and by advancing a partial build one day at a
+time, and compares every row with a plain per-period aggregation that skips
+the missing cells.
+
+Usage:
+    python scripts/check_rollups.py [--rows N] [--missing 0.05]
+
+Exits with status 1 if any row differs.
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
+
+from src.config import COLUMN_MAPPING
+from src.columnar import MISSING_PRICE, columns_from_rows
+from src.rollups import TIMEFRAMES, RollupTables, period_keys
+import fixtures
+
+PRICE_KEYS = ('open_price', 'high_price', 'low_price', 'close_price')
+
+
+def with_missing(rows: list, fraction: float, seed: int = 1) -> list:
+    """Blank a random `fraction` of the price cells, and every price of the oldest week."""
+    rng = np.random.default_rng(seed)
+    rows = [dict(row) for row in rows]
+    for row in rows:
+        for key in PRICE_KEYS:
+            if rng.random() < fraction:
+                row[COLUMN_MAPPING[key]] = ''
+    for row in rows[-7:]:
+        for key in PRICE_KEYS:
+            row[COLUMN_MAPPING[key]] = ''
+    return rows
+
+
+def reference(timeframe: str, columns: dict) -> list:
+    """Aggregate each period in plain Python, skipping missing prices."""
+    keys = period_keys(timeframe, columns['gregorian_date'], columns['persian_date'])
+    periods = {}
+    for i, key in enumerate(keys):
+        periods.setdefault(key, []).append(i)
+
+    rows = []
+    for key, days in periods.items():
+        prices = {name: [int(columns[name][i]) for i in days if columns[name][i] != MISSING_PRICE]
+                  for name in PRICE_KEYS}
+        rows.append([
+            key,
+            prices['open_price'][0] if prices['open_price'] else MISSING_PRICE,
+            max(prices['high_price'], default=MISSING_PRICE),
+            min(prices['low_price'], default=MISSING_PRICE),
+            prices['close_price'][-1] if prices['close_price'] else MISSING_PRICE,
+            str(columns['gregorian_date'][days[0]]),
+            str(columns['gregorian_date'][days[-1]]),
+            len(days)
+        ])
+    return rows
+
+
+def compare(label: str, rollups: RollupTables, columns: dict) -> list:
+    errors = []
+    for timeframe in TIMEFRAMES:
+        expected = reference(timeframe, columns)
+        actual = rollups.tables[timeframe]
+        if len(actual) != len(expected):
+            errors.append(f"{label} {timeframe}: {len(actual)} rows, expected {len(expected)}")
+            continue
+        for got, want in zip(actual, expected):
+            if got != want:
+                errors.append(f"{label} {timeframe} {want[0]}: {got[1:5]}, expected {want[1:5]}")
+                break
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the rollup tables on data with missing prices")
+    parser.add_argument('--rows', type=int, default=2000, help="Days of synthetic data")
+    parser.add_argument('--missing', type=float, default=0.05, help="Fraction of price cells left blank")
+    args = parser.parse_args()
+
+    rows = with_missing(fixtures.synthetic_rows(args.rows), args.missing)
+    columns = columns_from_rows(rows)
+    order = np.argsort(columns['gregorian_date'], kind='stable')
+    columns = {key: np.asarray(values)[order] for key, values in columns.items()}
+    missing = sum(int((columns[key] == MISSING_PRICE).sum()) for key in PRICE_KEYS)
+
+    errors = compare("batch", RollupTables.from_columns(columns), columns)
+
+    half = len(order) // 2
+    advanced = RollupTables.from_columns({key: values[:half] for key, values in columns.items()})
+    advanced.update_columns({key: values[half:] for key, values in columns.items()})
+    errors += compare("advanced", advanced, columns)
+
+    if errors:
+        print(f"❌ {len(errors)} rollup checks failed:")
+        for error in errors:
+            print(f"  {error}")
+        return 1
+
+    print(f"✅ Rollups match on {len(order)} days with {missing} missing prices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,57 +1,68 @@
 #!/usr/bin/env python3
 """
 Kaggle Dataset Update Script
-Uploads the latest CSV data to Kaggle dataset
+Uploads the latest CSV data to Kaggle dataset, skipping the upload when
+nothing changed since the last one (see src/publisher.py)
 """
 
 import os
-import json
-from kaggle.api.kaggle_api_extended import KaggleApi
-
-def update_kaggle_dataset():
-    """Update Kaggle dataset with latest CSV file"""
-    
-    # Initialize Kaggle API
-    api = KaggleApi()
-    api.authenticate()
-    
-    # Dataset configuration
-    dataset_slug = "kooroshkz/euro-rial-toman-live-price-dataset"
-    
-    # Create dataset metadata
-    metadata = {
-        "title": "Euro-Rial-Toman Live Price Dataset",
-        "id": dataset_slug,
-        "licenses": [{"name": "MIT"}],
-        "resources": [
-            {
-                "path": "Euro_Rial_Price_Dataset.csv",
-                "description": "Daily EUR/IRR exchange rates with OHLC data from 2011 to present"
-            }
-        ]
-    }
-    
-    # Write metadata file
-    with open('dataset-metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=2)
-    
+import sys
+import argparse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from src.metrics import metrics
+from src.publisher import KagglePublisher
+
+def update_kaggle_dataset(force=False, dry_run=False, client=None):
+    """Update Kaggle dataset with latest CSV file if it changed"""
+    publisher = KagglePublisher(client=client)
+    notes = f"Daily update - {os.environ.get('LATEST_ENTRY_DATE', 'auto-update')}"
+
     try:
-        # Upload new version
         print("Uploading dataset to Kaggle...")
-        api.dataset_create_version(
-            folder="./",
-            version_notes=f"Daily update - {os.environ.get('LATEST_ENTRY_DATE', 'auto-update')}",
-            quiet=False
-        )
-        print("✅ Successfully updated Kaggle dataset!")
-        
+        result = publisher.publish(notes, force=force, dry_run=dry_run)
     except Exception as e:
         print(f"❌ Error updating Kaggle dataset: {e}")
         return False
-    
+
+    size = sum(entry['bytes'] for entry in result.get('files', {}).values())
+    if result['status'] == 'unchanged':
+        print("✅ Dataset unchanged since the last upload, nothing to publish.")
+    elif result['status'] == 'staged':
+        print(f"✅ Staged {len(result['files'])} files ({size:,} bytes) in {publisher.staging_dir} (dry run).")
+    else:
+        print(f"✅ Successfully updated Kaggle dataset! ({len(result['files'])} files, {size:,} bytes)")
+
     return True
 
+def configure_metrics():
+    """Record the upload with the scraper's metrics settings, in a textfile of its own."""
+    jsonl_path = os.environ.get('SCRAPER_METRICS_JSONL')
+    prom_path = os.environ.get('SCRAPER_METRICS_PROM')
+    if not (jsonl_path or prom_path):
+        return
+    if prom_path:
+        root, ext = os.path.splitext(os.path.abspath(prom_path))
+        prom_path = f"{root}_kaggle{ext}"
+    metrics.configure(os.path.abspath(jsonl_path) if jsonl_path else None, prom_path,
+                      run_id=os.environ.get('SCRAPER_RUN_ID'))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the dataset to Kaggle if it changed")
+    parser.add_argument('--force', action='store_true', help="Upload even if nothing changed")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Stage the files and report their sizes without uploading")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    # Change to data directory
-    os.chdir("data")
-    update_kaggle_dataset()
+    args = parse_args()
+    configure_metrics()
+    # Paths in the config (data/...) are relative to the repository root
+    os.chdir(ROOT)
+    try:
+        # A failed upload fails the workflow step
+        sys.exit(0 if update_kaggle_dataset(force=args.force, dry_run=args.dry_run) else 1)
+    finally:
+        metrics.flush()
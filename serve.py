@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Dataset Query Service - Entry Point
+
+Serves the scraped datasets read-only over HTTP from memory: date-range
+OHLC rows, the latest quote, a summary, rollups and indicator series.
+The data is reloaded when the scraper updates the CSV.
+
+Usage:
+    python serve.py [--port 8080] [--instruments eur,usd]
+
+    GET /summary                      GET /latest
+    GET /ohlc?start=2024/01/01&end=2024/12/31&limit=30
+    GET /rollups/<week|month|quarter|persian_month|persian_year>?start=&end=
+    GET /indicators/<rsi|stochastic|momentum|macd|ichimoku>?start=&end=
+
+Every path takes ?instrument=<key> (defaults to the first one served).
+"""
+
+import sys
+import argparse
+
+from src.config import (
+    DEFAULT_INSTRUMENTS, SERVICE_HOST, SERVICE_PORT, SERVICE_CACHE_ENTRIES, SERVICE_RELOAD_INTERVAL
+)
+from src.instruments import INSTRUMENTS, parse_instruments
+from src.logging_config import configure_logging, get_logger
+from src.service import QueryService, make_server
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve the datasets over a read-only HTTP API")
+    parser.add_argument('--host', default=SERVICE_HOST, help="Address to listen on")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="Port to listen on")
+    parser.add_argument(
+        '--instruments', default=','.join(DEFAULT_INSTRUMENTS),
+        help=f"Comma-separated instruments to serve, or 'all' (known: {', '.join(INSTRUMENTS)})"
+    )
+    parser.add_argument('--cache-entries', type=int, default=SERVICE_CACHE_ENTRIES,
+                        help="Responses kept in the LRU cache")
+    parser.add_argument('--reload-interval', type=float, default=SERVICE_RELOAD_INTERVAL,
+                        help="Seconds between checks of the CSV files for changes")
+    parser.add_argument('--log-level', default=None,
+                        help="Log level (DEBUG logs every request); defaults to SCRAPER_LOG_LEVEL or INFO")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Start the service and serve until interrupted."""
+    args = parse_args(argv)
+    configure_logging(level=args.log_level)
+    logger = get_logger(__name__)
+    
+    try:
+        instruments = parse_instruments(args.instruments)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    
+    service = QueryService(instruments, cache_entries=args.cache_entries, reload_interval=args.reload_interval)
+    service.warm()
+    server = make_server(service, args.host, args.port)
+    logger.info(f"Serving {', '.join(service.instruments)} on http://{args.host}:{server.server_port}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Stopped ({service.hits} cached responses, {service.misses} computed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
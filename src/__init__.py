@@ -1,8 +1,29 @@
 """Init file for the src package."""
 
-from .scraper import EuroScraper
-from .data_manager import DataManager
+import importlib
+
 from .config import *
 from .utils import *
 
-__all__ = ['EuroScraper', 'DataManager']
+__all__ = ['EuroScraper', 'DataManager', 'open_dataset', 'Scheduler']
+
+# Public classes load their modules on first access, so `import src` (or
+# any submodule) doesn't pull in Selenium, pandas or requests up front
+_LAZY_EXPORTS = {
+    'EuroScraper': '.scraper',
+    'DataManager': '.data_manager',
+    'open_dataset': '.reader',
+    'Scheduler': '.scheduler',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,161 @@
+"""Compact, year-sharded copies of the dataset for the dashboard in docs/."""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .config import ARTIFACTS_DIR, ARTIFACT_LATEST_ROWS
+
+ARTIFACT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+
+# Integer columns stored as a first value followed by differences
+DELTA_COLUMNS = ("open_price", "low_price", "high_price", "close_price", "persian_date")
+
+
+def _delta(values: np.ndarray) -> List[int]:
+    """First value, then the difference from each value to the next."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return []
+    return np.concatenate((values[:1], np.diff(values))).tolist()
+
+
+def _numbers(values: np.ndarray) -> List[Optional[float]]:
+    """Floats as JSON numbers (integral ones without '.0'), None for NaN."""
+    return [None if np.isnan(v) else (int(v) if float(v).is_integer() else float(v)) for v in values]
+
+
+def encode_shard(columns: Dict[str, np.ndarray], start: int, end: int) -> bytes:
+    """
+    Encode rows [start, end) as compact column-oriented JSON.
+
+    Dates are days since 1970-01-01 and, like prices and Persian dates
+    (YYYYMMDD), delta-encoded, so daily data is mostly short numbers.
+    """
+    days = columns["gregorian_date"][start:end].astype(np.int64)
+    shard = {
+        "version": ARTIFACT_VERSION,
+        "rows": int(end - start),
+        "date": _delta(days)
+    }
+    for key in DELTA_COLUMNS:
+        shard[key] = _delta(columns[key][start:end])
+    for key in ("change_amount", "change_percent"):
+        shard[key] = _numbers(columns[key][start:end])
+    return json.dumps(shard, separators=(',', ':')).encode('utf-8')
+
+
+class ArtifactBuilder:
+    """
+    Writes the dashboard artifacts: one gzip'd shard per Gregorian year, a
+    "latest" shard with the most recent rows and a manifest.json listing
+    them with row counts, date ranges and content hashes.
+
+    Shards whose content did not change are not rewritten, so a daily
+    update only touches the current year, the latest shard and the manifest.
+    """
+
+    def __init__(self, path: str = ARTIFACTS_DIR, latest_rows: int = ARTIFACT_LATEST_ROWS):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.latest_rows = latest_rows
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """Return the current manifest, or None if there is none."""
+        try:
+            with open(os.path.join(self.path, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return manifest if manifest.get('version') == ARTIFACT_VERSION else None
+
+    def _write_file(self, name: str, data: bytes):
+        tmp_path = os.path.join(self.path, f".{name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.path, name))
+
+    def _entry(self, name: str, columns: Dict[str, np.ndarray], start: int, end: int,
+               previous: Dict[str, Dict[str, Any]], written: List[str]) -> Dict[str, Any]:
+        """Encode one shard, write it if its content changed and return its manifest entry."""
+        payload = encode_shard(columns, start, end)
+        digest = hashlib.sha256(payload).hexdigest()
+        filename = f"{name}.json.gz"
+
+        old = previous.get(name)
+        if old is None or old.get('sha256') != digest or not os.path.exists(os.path.join(self.path, filename)):
+            # mtime=0 keeps the output identical for identical content
+            self._write_file(filename, gzip.compress(payload, compresslevel=9, mtime=0))
+            written.append(filename)
+
+        dates = columns["gregorian_date"]
+        return {
+            'name': name,
+            'file': filename,
+            'rows': int(end - start),
+            'first_date': str(dates[start]),
+            'last_date': str(dates[end - 1]),
+            'sha256': digest,
+            'bytes': os.path.getsize(os.path.join(self.path, filename))
+        }
+
+    def build(self, columns: Dict[str, np.ndarray]) -> List[str]:
+        """
+        Bring the artifacts in line with the given columns (sorted oldest
+        first, as stored by ColumnarStore). Returns the files written.
+        """
+        dates = columns["gregorian_date"]
+        if len(dates) == 0:
+            return []
+        os.makedirs(self.path, exist_ok=True)
+
+        old_manifest = self.manifest() or {}
+        previous = {entry['name']: entry for entry in old_manifest.get('shards', [])}
+        if old_manifest.get('latest'):
+            previous['latest'] = old_manifest['latest']
+
+        written = []
+        years = dates.astype('datetime64[Y]')
+        boundaries = np.flatnonzero(years[1:] != years[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(dates)]))
+
+        shards = [
+            self._entry(str(years[start].astype(int) + 1970), columns, start, end, previous, written)
+            for start, end in zip(starts, ends)
+        ]
+        latest = self._entry('latest', columns, max(0, len(dates) - self.latest_rows), len(dates),
+                             previous, written)
+
+        manifest = {
+            'version': ARTIFACT_VERSION,
+            'rows': int(len(dates)),
+            'oldest_date': str(dates[0]),
+            'latest_date': str(dates[-1]),
+            'encoding': 'delta-json+gzip',
+            'delta_columns': list(DELTA_COLUMNS),
+            'shards': shards,
+            'latest': latest
+        }
+        if written or manifest != old_manifest:
+            # The manifest is written last, after every shard it lists
+            self._write_file(MANIFEST_FILENAME, json.dumps(manifest, indent=2).encode('utf-8'))
+            written.append(MANIFEST_FILENAME)
+
+        # Drop shards the new manifest no longer lists (e.g. after a rebuild)
+        current = {entry['name'] for entry in shards} | {'latest'}
+        for name, entry in previous.items():
+            if name not in current and os.path.exists(os.path.join(self.path, entry['file'])):
+                os.unlink(os.path.join(self.path, entry['file']))
+
+        if written:
+            self.logger.info(f"Updated dashboard artifacts: {', '.join(written)}")
+        return written
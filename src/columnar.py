@@ -0,0 +1,264 @@
+"""Typed columnar copy of the dataset stored as NumPy arrays next to the CSV."""
+
+import os
+import json
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .config import COLUMN_MAPPING
+
+
+# Column key (as in COLUMN_MAPPING) -> stored dtype
+COLUMN_DTYPES = {
+    "open_price": np.dtype('<i8'),
+    "low_price": np.dtype('<i8'),
+    "high_price": np.dtype('<i8'),
+    "close_price": np.dtype('<i8'),
+    "change_amount": np.dtype('<f8'),
+    "change_percent": np.dtype('<f8'),
+    "gregorian_date": np.dtype('<M8[D]'),
+    "persian_date": np.dtype('<i4')  # YYYYMMDD
+}
+
+# Missing prices are stored as this value since int64 has no NaN
+MISSING_PRICE = -1
+
+STORE_VERSION = 1
+META_FILENAME = "meta.json"
+
+
+def encode_persian_date(values: np.ndarray) -> np.ndarray:
+    """Encode YYYY/MM/DD Persian date strings as YYYYMMDD integers (0 if missing)."""
+    digits = np.char.replace(np.asarray(values, dtype=str), '/', '')
+    valid = np.char.isdigit(digits) & (np.char.str_len(digits) == 8)
+    encoded = np.zeros(len(digits), dtype=COLUMN_DTYPES["persian_date"])
+    encoded[valid] = digits[valid].astype(np.int64)
+    return encoded
+
+
+def decode_persian_date(values: np.ndarray) -> List[str]:
+    """Decode YYYYMMDD integers back to YYYY/MM/DD strings."""
+    return [f"{v // 10000:04d}/{v // 100 % 100:02d}/{v % 100:02d}" if v else '' for v in values.tolist()]
+
+
+def _parse_numbers(values: np.ndarray) -> np.ndarray:
+    """Parse number strings like "3,300" or "1.52%" to float64 (NaN if missing)."""
+    text = np.asarray(['' if v is None else str(v) for v in values], dtype=str)
+    text = np.char.strip(np.char.replace(np.char.replace(text, ',', ''), '%', ''))
+    result = np.full(len(text), np.nan)
+    present = text != ''
+    try:
+        result[present] = text[present].astype(np.float64)
+    except ValueError:
+        # Fall back to element-wise parsing to skip malformed values
+        for i in np.flatnonzero(present):
+            try:
+                result[i] = float(text[i])
+            except ValueError:
+                pass
+    return result
+
+
+def _parse_prices(values: np.ndarray) -> np.ndarray:
+    """Convert a price column to int64, storing missing values as MISSING_PRICE."""
+    numbers = _parse_numbers(values)
+    numbers[np.isnan(numbers)] = MISSING_PRICE
+    return numbers.astype(COLUMN_DTYPES["open_price"])
+
+
+def columns_from_records(records: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Convert column-oriented CSV values (keyed by CSV header) to typed arrays
+    sorted by Gregorian date, oldest first.
+    """
+    names = COLUMN_MAPPING
+    dates = np.asarray([str(d).replace('/', '-') for d in records[names["gregorian_date"]]],
+                       dtype=COLUMN_DTYPES["gregorian_date"])
+    order = np.argsort(dates, kind='stable')
+
+    columns = {
+        "open_price": _parse_prices(records[names["open_price"]]),
+        "low_price": _parse_prices(records[names["low_price"]]),
+        "high_price": _parse_prices(records[names["high_price"]]),
+        "close_price": _parse_prices(records[names["close_price"]]),
+        "change_amount": _parse_numbers(records[names["change_amount"]]),
+        "change_percent": _parse_numbers(records[names["change_percent"]]),
+        "gregorian_date": dates,
+        "persian_date": encode_persian_date(records[names["persian_date"]])
+    }
+    return {key: values[order] for key, values in columns.items()}
+
+
+def columns_from_frame(df) -> Dict[str, np.ndarray]:
+    """Convert a DataFrame with the CSV headers to typed arrays."""
+    return columns_from_records({name: df[name].to_numpy(dtype=object) for name in COLUMN_MAPPING.values()})
+
+
+def columns_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Convert scraped row dicts to typed arrays."""
+    return columns_from_records({name: [row.get(name) for row in rows] for name in COLUMN_MAPPING.values()})
+
+
+def _npy_header(dtype: np.dtype, length: int) -> str:
+    """Return the .npy header dict text for a 1-D array."""
+    return "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (np.lib.format.dtype_to_descr(dtype), length)
+
+
+def _append_npy(path: str, values: np.ndarray) -> bool:
+    """
+    Append values to a 1-D .npy file in place.
+
+    The header is padded to a fixed size when written, so the new shape
+    usually fits without moving the data. Returns False if it does not.
+    """
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version != (1, 0):
+            return False
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        data_offset = f.tell()
+        if len(shape) != 1 or fortran_order or dtype != values.dtype:
+            return False
+
+        header = _npy_header(dtype, shape[0] + len(values))
+        # Magic (6) + version (2) + header length (2) precede the header text
+        header_size = data_offset - 10
+        if len(header) + 1 > header_size:
+            return False
+
+        f.seek(data_offset + shape[0] * dtype.itemsize)
+        f.write(np.ascontiguousarray(values).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+        f.seek(10)
+        f.write((header.ljust(header_size - 1) + '\n').encode('latin1'))
+        f.flush()
+        os.fsync(f.fileno())
+
+    return True
+
+
+class ColumnarStore:
+    """
+    Directory of one .npy file per column plus a meta.json.
+
+    Arrays are 1-D, fixed width and sorted oldest first, so they can be
+    opened with mmap_mode='r' and sliced without reading the whole file.
+    """
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+
+    def column_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.npy")
+
+    def meta(self) -> Optional[Dict[str, Any]]:
+        """Return the store metadata, or None if the store does not exist."""
+        try:
+            with open(os.path.join(self.path, META_FILENAME), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if meta.get('version') != STORE_VERSION:
+            return None
+        return meta
+
+    def _write_meta(self, rows: int, oldest_date: Optional[str], latest_date: Optional[str],
+                    source_signature: Optional[Tuple[int, int]]):
+        meta = {
+            'version': STORE_VERSION,
+            'rows': rows,
+            'oldest_date': oldest_date,
+            'latest_date': latest_date,
+            'columns': {key: dtype.str for key, dtype in COLUMN_DTYPES.items()},
+            'source_signature': list(source_signature) if source_signature else None
+        }
+        tmp_path = os.path.join(self.path, f".{META_FILENAME}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.path, META_FILENAME))
+
+    def write(self, columns: Dict[str, np.ndarray], source_signature: Optional[Tuple[int, int]] = None):
+        """Replace the store with the given columns (sorted oldest first)."""
+        os.makedirs(self.path, exist_ok=True)
+
+        for key, dtype in COLUMN_DTYPES.items():
+            tmp_path = os.path.join(self.path, f".{key}.npy.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(columns[key], dtype=dtype))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.column_path(key))
+
+        # meta.json is written last and marks the store as complete
+        dates = columns["gregorian_date"]
+        rows = len(dates)
+        self._write_meta(rows, str(dates[0]) if rows else None, str(dates[-1]) if rows else None,
+                         source_signature)
+        self.logger.info(f"Wrote columnar store: {rows} rows to {self.path}")
+
+    def append(self, columns: Dict[str, np.ndarray], source_signature: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Append rows that are all newer than the stored ones.
+
+        Returns False (leaving the caller to rewrite the store) if the store
+        is missing or the rows would not keep the date order.
+        """
+        meta = self.meta()
+        count = len(columns["gregorian_date"])
+        if meta is None:
+            return False
+        if count == 0:
+            return True
+
+        order = np.argsort(columns["gregorian_date"], kind='stable')
+        columns = {key: np.asarray(values)[order] for key, values in columns.items()}
+        if meta['latest_date'] and columns["gregorian_date"][0] <= np.datetime64(meta['latest_date']):
+            return False
+
+        for key, dtype in COLUMN_DTYPES.items():
+            if not _append_npy(self.column_path(key), np.asarray(columns[key], dtype=dtype)):
+                return False
+
+        dates = columns["gregorian_date"]
+        self._write_meta(meta['rows'] + count, meta['oldest_date'] or str(dates[0]), str(dates[-1]),
+                         source_signature)
+        return True
+
+    def read(self, mmap: bool = True, meta: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Load all columns. With mmap=True the arrays are read-only views of
+        the files and pages are only read when accessed.
+        """
+        meta = meta or self.meta()
+        if meta is None:
+            raise FileNotFoundError(f"No columnar store at {self.path}")
+
+        columns = {}
+        for key in COLUMN_DTYPES:
+            values = np.load(self.column_path(key), mmap_mode='r' if mmap else None)
+            # Columns are appended before meta.json, so ignore rows it does not cover yet
+            columns[key] = values[:meta['rows']]
+        return columns
+
+    def to_frame(self, columns: Optional[Dict[str, np.ndarray]] = None):
+        """Build a DataFrame (CSV headers, oldest first) from the typed columns."""
+        import pandas as pd
+
+        if columns is None:
+            columns = self.read()
+
+        data = {}
+        for key, name in COLUMN_MAPPING.items():
+            values = columns[key]
+            if key == "persian_date":
+                values = decode_persian_date(values)
+            data[name] = values
+        return pd.DataFrame(data)
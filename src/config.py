@@ -1,7 +1,31 @@
 """Configuration settings for the euro scraper."""
 
-# Target URL
-BASE_URL = "https://www.tgju.org/profile/price_eur/history"
+# Instrument history pages and the DataTables server-side endpoint behind
+# their tables, by tgju profile slug (see src/instruments.py)
+PROFILE_URL_TEMPLATE = "https://www.tgju.org/profile/{slug}/history"
+HISTORY_API_URL_TEMPLATE = "https://api.tgju.org/v1/market/indicator/summary-table-data/{slug}"
+
+# Target URL (the default EUR instrument)
+BASE_URL = PROFILE_URL_TEMPLATE.format(slug="price_eur")
+HISTORY_API_URL = HISTORY_API_URL_TEMPLATE.format(slug="price_eur")
+HISTORY_API_PARAMS = {
+    "lang": "fa",
+    "convert_to_ad": "1"
+}
+
+# Fetch backend: "http" reads the table data directly, "selenium" drives Chrome.
+# The HTTP backend falls back to Selenium when the endpoint cannot be used.
+FETCH_BACKEND = "http"
+
+# HTTP settings
+HTTP_TIMEOUT = 15  # seconds
+HTTP_POOL_SIZE = 4
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "X-Requested-With": "XMLHttpRequest",
+    "Referer": BASE_URL
+}
 
 # Chrome driver settings
 CHROME_OPTIONS = [
@@ -13,16 +37,103 @@ CHROME_OPTIONS = [
     "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 ]
 
+# Page resources Chrome never downloads (the table needs none of them)
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.fonts": 2
+}
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"
+]
+
+# Warm browsers kept per process, and where the resolved ChromeDriver is
+# cached so later runs skip webdriver-manager's network version check
+DRIVER_POOL_SIZE = 2
+DRIVER_CACHE_PATH = "~/.cache/tgju-scraper/chromedriver.json"
+DRIVER_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
 # Scraping settings
 DEFAULT_PAGE_SIZE = 30  # Default number of rows per page
+PAGE_LENGTH = 1000  # Rows requested per page; falls back to DEFAULT_PAGE_SIZE if refused
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+PAGE_WAIT_TIMEOUT = 15  # seconds to wait for the table to load or redraw
+
+# Parallel full backfill over HTTP: workers fetch contiguous page ranges,
+# each range overlapping the next by a few rows in case the table shifts
+BACKFILL_WORKERS = 4
+BACKFILL_OVERLAP = 5
+
+# Trading calendar used to find gaps in the history (Python weekdays; the
+# market closes Thursday and Friday) and the shortest gap worth repairing
+WEEKEND_DAYS = (3, 4)
+GAP_MIN_MISSING_DAYS = 3
+SEEK_MAX_PAGE_LOADS = 32  # Gives up seeking a date after this many page loads
+
+# Dataset validation: a day-to-day close move this large that reverses the
+# next day is reported as a spike; change columns are only checked against
+# the previous row when it is at most this many days older, and a change
+# amount only counts as wrong when it is further from the move between the
+# closes than this fraction of the previous close. Incoming rows failing the
+# rejected checks are dropped before they are written, and missing
+# derivable cells (changes, Persian date) are filled in only if enabled.
+VALIDATION_SPIKE_THRESHOLD = 0.10
+VALIDATION_MAX_CHANGE_GAP_DAYS = 4
+VALIDATION_CHANGE_TOLERANCE = 0.02
+VALIDATION_REJECT_CHECKS = ("missing_date", "missing_close", "duplicate_date")
+VALIDATION_REPAIR = False
+VALIDATION_MAX_EXAMPLES = 100  # Dates listed per check in a report
+VALIDATION_BLOCK_ROWS = 16384  # Rows checked at a time, so temporaries stay in cache
+
+# Request pacing (backs off on failures, recovers on success)
+RATE_LIMIT_MIN_INTERVAL = 0.5  # seconds between page requests
+RATE_LIMIT_MAX_INTERVAL = 30  # seconds
+RATE_LIMIT_BACKOFF = 2.0
+RATE_LIMIT_RECOVERY = 0.5
 
 # Data settings
 CSV_FILENAME = "Euro_Rial_Price_Dataset.csv"
 DATA_DIR = "data"
 
+# Logging: one handler pipeline for the process, fed through a queue so
+# callers never wait on the disk. The file gets JSON lines (one record per
+# line, with the run id) and rotates by size, or at midnight with "midnight"
+LOG_FILE = "scraper.log"
+LOG_LEVEL = "INFO"
+LOG_FILE_FORMAT = "json"  # "json" or "text"
+LOG_ROTATION = "size"  # "size" or "midnight"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Instruments scraped when none are given, and how many run at once
+DEFAULT_INSTRUMENTS = ["eur"]
+SCHEDULER_MAX_WORKERS = 4
+
+# Dashboard artifacts (compressed, year-sharded copies served with docs/)
+ARTIFACTS_DIR = "docs/data"
+ARTIFACT_LATEST_ROWS = 90  # Rows in the "latest" shard (longest analysis timeframe)
+
+# Kaggle publishing: files are staged in their own folder and uploaded only
+# when their hashes differ from the manifest of the last upload. Failed
+# uploads are retried, the delay doubling from KAGGLE_RETRY_DELAY
+KAGGLE_DATASET = "kooroshkz/euro-rial-toman-live-price-dataset"
+KAGGLE_TITLE = "Euro-Rial-Toman Live Price Dataset"
+KAGGLE_STAGING_DIR = "data/kaggle"
+KAGGLE_MANIFEST = "data/kaggle.manifest.json"
+KAGGLE_MAX_RETRIES = 4
+KAGGLE_RETRY_DELAY = 10  # seconds
+
+# Local query service (serve.py): responses are cached per dataset version,
+# and the CSV is checked for changes at most once per reload interval
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_CACHE_ENTRIES = 1024
+SERVICE_RELOAD_INTERVAL = 1.0  # seconds
+SERVICE_GZIP_MIN_BYTES = 1024  # Smaller responses are sent uncompressed
+
 # Table selectors
+DATATABLE_SELECTOR = "#DataTables_Table_0"
 TABLE_SELECTOR = "#DataTables_Table_0 tbody tr"
 NEXT_BUTTON_SELECTOR = "#DataTables_Table_0_next"
 PAGINATION_INFO_SELECTOR = "#DataTables_Table_0_info"
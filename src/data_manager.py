@@ -1,21 +1,100 @@
 """Data management module for handling CSV operations and data persistence."""
 
 import os
-import pandas as pd
+import io
+import csv
+import json
+import bisect
+import shutil
+import tempfile
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Callable, BinaryIO, Union, TYPE_CHECKING
 import logging
 
-from .config import CSV_FILENAME, DATA_DIR, COLUMN_MAPPING
-from .utils import setup_logging
+from .config import DATA_DIR, COLUMN_MAPPING, GAP_MIN_MISSING_DAYS, VALIDATION_REPAIR
+from .logging_config import get_logger
+from .columnar import ColumnarStore, columns_from_frame, columns_from_rows
+from .indicators.streaming import IndicatorSet
+from .artifacts import ArtifactBuilder
+from .rollups import RollupTables
+from .instruments import Instrument, get_instrument
+from .trading_calendar import find_gaps
+from .metrics import metrics
+from .validation import (
+    find_anomalies, build_report, rejected_rows, derived_values, missing_derivable, is_blank_cell,
+    format_derived
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+class DatasetIndex:
+    """
+    Sorted set of the dataset's Gregorian dates.
+    
+    Dates are zero-padded YYYY/MM/DD strings, so string order is date order
+    and lookups can bisect the list directly.
+    """
+    
+    def __init__(self, dates: Iterable[str] = (), signature: Optional[Tuple[int, int]] = None):
+        self.dates = sorted(set(dates))
+        self.signature = signature
+    
+    @property
+    def total_records(self) -> int:
+        return len(self.dates)
+    
+    @property
+    def latest_date(self) -> Optional[str]:
+        return self.dates[-1] if self.dates else None
+    
+    @property
+    def oldest_date(self) -> Optional[str]:
+        return self.dates[0] if self.dates else None
+    
+    def contains(self, date: str) -> bool:
+        """Check whether a date is in the dataset (O(log n))."""
+        i = bisect.bisect_left(self.dates, date)
+        return i < len(self.dates) and self.dates[i] == date
+    
+    def count_after(self, date: str) -> int:
+        """Count the dates newer than a date (O(log n))."""
+        return len(self.dates) - bisect.bisect_right(self.dates, date)
+    
+    def add(self, dates: Iterable[str]):
+        """Add dates written to the dataset."""
+        new_dates = sorted(set(dates).difference(self.dates))
+        if not new_dates:
+            return
+        
+        if not self.dates or new_dates[0] > self.dates[-1]:
+            # Common case: new days after the latest one
+            self.dates.extend(new_dates)
+        else:
+            self.dates = sorted(set(self.dates).union(new_dates))
 
 
 class DataManager:
     """Handles data persistence and CSV operations."""
     
-    def __init__(self):
-        self.logger = setup_logging()
-        self.csv_path = os.path.join(DATA_DIR, CSV_FILENAME)
+    def __init__(self, instrument: Union[str, Instrument, None] = None):
+        """
+        Args:
+            instrument: Instrument key or definition (defaults to EUR); each
+                instrument has its own CSV and derived stores
+        """
+        self.logger = get_logger(__name__)
+        self.instrument = get_instrument(instrument)
+        self.csv_path = os.path.join(DATA_DIR, self.instrument.csv_filename)
+        self.columnar = ColumnarStore(os.path.splitext(self.csv_path)[0] + '.columns')
+        self.indicators_path = os.path.splitext(self.csv_path)[0] + '.indicators.json'
+        self.rollups_path = os.path.splitext(self.csv_path)[0] + '.rollups.json'
+        self.validation_path = os.path.splitext(self.csv_path)[0] + '.validation.json'
+        self.artifacts = ArtifactBuilder(self.instrument.artifacts_dir) if self.instrument.artifacts_dir else None
+        self._index = None
         self._ensure_data_directory()
     
     def _ensure_data_directory(self):
@@ -24,11 +103,23 @@ class DataManager:
             os.makedirs(DATA_DIR)
             self.logger.info(f"Created data directory: {DATA_DIR}")
     
-    def load_existing_data(self) -> pd.DataFrame:
-        """Load existing CSV data if it exists."""
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the CSV file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_csv(self) -> 'pd.DataFrame':
+        """Read the CSV file from disk."""
+        # pandas loads on first use; readers of the columnar store never need it
+        import pandas as pd
+        
         if os.path.exists(self.csv_path):
             try:
-                df = pd.read_csv(self.csv_path)
+                with metrics.span('load', instrument=self.instrument.key):
+                    df = pd.read_csv(self.csv_path)
                 self.logger.info(f"Loaded existing data: {len(df)} records from {self.csv_path}")
                 return df
             except Exception as e:
@@ -38,21 +129,256 @@ class DataManager:
             self.logger.info("No existing data file found. Starting fresh.")
             return pd.DataFrame()
     
-    def get_latest_date(self) -> Optional[str]:
-        """Get the latest date from existing data."""
-        df = self.load_existing_data()
-        if df.empty or 'Gregorian Date' not in df.columns:
+    def get_index(self) -> DatasetIndex:
+        """
+        Return the date index, rebuilding it only if the CSV file changed
+        (by mtime or size) since it was built.
+        """
+        signature = self._file_signature()
+        if self._index is not None and self._index.signature == signature:
+            return self._index
+        
+        self._index = DatasetIndex(self._read_dates(), signature)
+        return self._index
+    
+    def _read_dates(self) -> List[str]:
+        """Read only the Gregorian Date column, with the csv module instead of pandas."""
+        if not os.path.exists(self.csv_path):
+            return []
+        try:
+            with metrics.span('load', instrument=self.instrument.key), \
+                    open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if 'Gregorian Date' not in header:
+                    return []
+                column = header.index('Gregorian Date')
+                return [row[column] for row in reader if len(row) > column and row[column]]
+        except Exception as e:
+            self.logger.error(f"Error loading existing dates: {e}")
+            return []
+    
+    def _update_index(self, dates: Iterable[str], replace: bool = False):
+        """Update the cached index in place after this instance wrote the CSV."""
+        if replace or self._index is None:
+            self._index = DatasetIndex(dates, self._file_signature())
+        else:
+            self._index.add(dates)
+            self._index.signature = self._file_signature()
+    
+    def _atomic_write(self, write: Callable[[BinaryIO], None]):
+        """
+        Write the CSV through a temporary file in the same directory, fsync it
+        and rename it over the original, so readers never see a partial file.
+        """
+        directory = os.path.dirname(os.path.abspath(self.csv_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.csv_path)}.", suffix=".tmp", dir=directory)
+        try:
+            try:
+                mode = os.stat(self.csv_path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.fchmod(fd, mode)
+            
+            with metrics.span('write', instrument=self.instrument.key):
+                with os.fdopen(fd, 'wb') as f:
+                    write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    metrics.count('bytes_written', f.tell(), instrument=self.instrument.key)
+            
+            os.replace(tmp_path, self.csv_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        
+        # Persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    @staticmethod
+    def _format_rows(rows: List[Dict[str, Any]]) -> bytes:
+        """Serialize rows as CSV lines in column order, the way save_data writes them."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for row in rows:
+            writer.writerow(['' if row.get(column) is None else row.get(column)
+                             for column in COLUMN_MAPPING.values()])
+        return buffer.getvalue().encode('utf-8')
+    
+    def _prepend_rows(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Insert rows newer than the whole dataset at the top of the newest-first CSV.
+        
+        Only the new rows are serialized; the existing rows are copied over
+        as raw bytes without being parsed. Returns False if the file layout
+        is not the expected one, so the caller can fall back to a full merge.
+        """
+        header = (','.join(COLUMN_MAPPING.values()) + '\n').encode('utf-8')
+        
+        with open(self.csv_path, 'rb') as source:
+            if source.readline().rstrip(b'\r\n') != header.rstrip(b'\n'):
+                self.logger.warning("Unexpected CSV header, falling back to a full rewrite")
+                return False
+            
+            previous_signature = self._file_signature()
+            body_start = source.tell()
+            rows = sorted(rows, key=lambda row: row['Gregorian Date'], reverse=True)
+            
+            def write(target: BinaryIO):
+                target.write(header)
+                target.write(self._format_rows(rows))
+                source.seek(body_start)
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            
+            self._atomic_write(write)
+        
+        self._update_index(row['Gregorian Date'] for row in rows)
+        self._sync_columnar(previous_signature, rows=rows)
+        self._sync_artifacts()
+        self._sync_indicators(rows)
+        self._sync_rollups(rows)
+        return True
+    
+    def _sync_columnar(self, previous_signature: Optional[Tuple[int, int]] = None,
+                       rows: Optional[List[Dict[str, Any]]] = None,
+                       df: Optional['pd.DataFrame'] = None):
+        """
+        Bring the columnar store in line with the CSV after a write.
+        
+        Rows prepended to a CSV the store already matched are appended to
+        the store; otherwise it is rewritten from `df` or the CSV file.
+        """
+        signature = self._file_signature()
+        try:
+            meta = self.columnar.meta()
+            if (rows and meta and previous_signature
+                    and meta.get('source_signature') == list(previous_signature)
+                    and self.columnar.append(columns_from_rows(rows), signature)):
+                return
+            
+            if df is None:
+                df = self._read_csv()
+            self.columnar.write(columns_from_frame(df), signature)
+        except Exception as e:
+            self.logger.error(f"Error updating columnar store: {e}")
+    
+    def _sync_artifacts(self):
+        """Regenerate the dashboard artifacts that changed after a write."""
+        if self.artifacts is None:
+            return
+        try:
+            self.artifacts.build(self.load_columns())
+        except Exception as e:
+            self.logger.error(f"Error updating dashboard artifacts: {e}")
+    
+    def _sync_state(self, state_class, path: str, name: str,
+                    rows: Optional[List[Dict[str, Any]]] = None):
+        """
+        Bring state derived from the dataset (indicators, rollups) in line
+        with it and save it to `path`.
+        
+        Rows added after the day the state was last advanced are fed to it
+        one day at a time; otherwise (no state yet, or older rows merged in)
+        the state is rebuilt once from the columnar store.
+        """
+        index = self.get_index()
+        if index.total_records == 0:
             return None
         
         try:
-            # Convert to datetime for proper sorting
-            df['date_parsed'] = pd.to_datetime(df['Gregorian Date'])
-            latest_date = df['date_parsed'].max()
-            return latest_date.strftime('%Y/%m/%d')
+            state = state_class.load(path)
+            latest_date = index.latest_date.replace('/', '-')
+            
+            if state is not None and state.count == index.total_records and state.last_date == latest_date:
+                return state
+            
+            if (rows and state is not None
+                    and state.count + len(rows) == index.total_records
+                    and min(str(row['Gregorian Date']) for row in rows).replace('/', '-') > state.last_date):
+                state.update_columns(columns_from_rows(rows))
+                self.logger.info(f"Advanced {name} by {len(rows)} days to {state.last_date}")
+            else:
+                self.logger.info(f"{name.capitalize()} missing or stale, rebuilding from the columnar store")
+                state = state_class.from_columns(self.load_columns())
+            
+            state.save(path)
+            return state
         except Exception as e:
-            self.logger.error(f"Error getting latest date: {e}")
+            self.logger.error(f"Error updating {name}: {e}")
             return None
     
+    def _sync_indicators(self, rows: Optional[List[Dict[str, Any]]] = None) -> Optional[IndicatorSet]:
+        return self._sync_state(IndicatorSet, self.indicators_path, "indicators", rows)
+    
+    def _sync_rollups(self, rows: Optional[List[Dict[str, Any]]] = None) -> Optional[RollupTables]:
+        return self._sync_state(RollupTables, self.rollups_path, "rollups", rows)
+    
+    def get_indicators(self) -> Optional[IndicatorSet]:
+        """
+        Return the indicator state at the latest day of the dataset.
+        
+        The latest values are in `values()` and the technical analysis panel
+        in `panel(timeframe)`; neither needs the full history.
+        """
+        return self._sync_indicators()
+    
+    def get_rollup(self, timeframe: str, start: Optional[str] = None,
+                   end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get OHLC rows for a timeframe ('week', 'month', 'quarter',
+        'persian_month' or 'persian_year'), oldest first.
+        
+        Args:
+            timeframe: Rollup timeframe
+            start: Optional first Gregorian date (YYYY/MM/DD or YYYY-MM-DD)
+            end: Optional last Gregorian date
+        
+        Each row has period, open, high, low, close, first_date, last_date
+        and count; rows for periods partly inside the range are included.
+        """
+        rollups = self._sync_rollups()
+        if rollups is None:
+            return []
+        return rollups.query(timeframe, start, end)
+    
+    def load_columns(self, mmap: bool = True) -> Dict[str, Any]:
+        """
+        Load the dataset as typed NumPy arrays (oldest first), keyed like
+        COLUMN_MAPPING. The store is rebuilt from the CSV if it is missing
+        or was built from a different version of the file.
+        """
+        meta = self.columnar.meta()
+        signature = self._file_signature()
+        if meta is None or meta.get('source_signature') != (list(signature) if signature else None):
+            self.logger.info("Columnar store missing or stale, rebuilding from CSV")
+            self._sync_columnar(df=self._read_csv())
+        
+        return self.columnar.read(mmap=mmap)
+    
+    def load_frame(self) -> 'pd.DataFrame':
+        """Load the dataset as a typed DataFrame (oldest first) from the columnar store."""
+        return self.columnar.to_frame(self.load_columns())
+    
+    def load_existing_data(self) -> 'pd.DataFrame':
+        """Load existing CSV data if it exists."""
+        df = self._read_csv()
+        if not df.empty and 'Gregorian Date' in df.columns:
+            self._index = DatasetIndex(df['Gregorian Date'].dropna().astype(str), self._file_signature())
+        return df
+    
+    def has_date(self, date: str) -> bool:
+        """Check whether a Gregorian date (YYYY/MM/DD) is already in the dataset."""
+        return self.get_index().contains(date)
+    
+    def get_latest_date(self) -> Optional[str]:
+        """Get the latest date from existing data."""
+        return self.get_index().latest_date
+    
     def save_data(self, data: List[Dict[str, Any]], mode: str = 'w') -> bool:
         """
         Save data to CSV file.
@@ -65,6 +391,8 @@ class DataManager:
             self.logger.warning("No data to save")
             return False
         
+        import pandas as pd
+        
         try:
             # Create DataFrame
             df = pd.DataFrame(data)
@@ -75,9 +403,20 @@ class DataManager:
             
             # Save to CSV
             if mode == 'a' and os.path.exists(self.csv_path):
-                df.to_csv(self.csv_path, mode='a', header=False, index=False, encoding='utf-8')
+                with metrics.span('write', instrument=self.instrument.key), open(self.csv_path, 'ab') as f:
+                    start = f.tell()
+                    df.to_csv(f, header=False, index=False, encoding='utf-8')
+                    f.flush()
+                    os.fsync(f.fileno())
+                    metrics.count('bytes_written', f.tell() - start, instrument=self.instrument.key)
+                self._update_index(df['Gregorian Date'].dropna().astype(str))
+                self._sync_columnar()
+                self._sync_artifacts()
             else:
-                df.to_csv(self.csv_path, mode='w', header=True, index=False, encoding='utf-8')
+                self._atomic_write(lambda f: df.to_csv(f, header=True, index=False, encoding='utf-8'))
+                self._update_index(df['Gregorian Date'].dropna().astype(str), replace=True)
+                self._sync_columnar(df=df)
+                self._sync_artifacts()
             
             self.logger.info(f"Successfully saved {len(data)} records to {self.csv_path}")
             return True
@@ -86,44 +425,106 @@ class DataManager:
             self.logger.error(f"Error saving data: {e}")
             return False
     
+    def save_pages(self, pages: Iterable[List[Dict[str, Any]]], min_records: int = 0) -> bool:
+        """
+        Replace the dataset with rows streamed page by page in table order
+        (newest first), skipping dates already written.
+        
+        Only one page is held in memory at a time, plus the set of dates.
+        
+        Args:
+            pages: Lists of rows, newest first
+            min_records: Keep the existing dataset if fewer records arrive
+        """
+        header = (','.join(COLUMN_MAPPING.values()) + '\n').encode('utf-8')
+        dates = set()
+        
+        def write(target: BinaryIO):
+            target.write(header)
+            for rows in pages:
+                fresh = []
+                for row in rows:
+                    date = str(row.get('Gregorian Date'))
+                    if date not in dates:
+                        dates.add(date)
+                        fresh.append(row)
+                target.write(self._format_rows(fresh))
+            if not dates:
+                # Abort before the empty file replaces the dataset
+                raise ValueError("No data to save")
+            if len(dates) < min_records:
+                raise ValueError(f"Only {len(dates)} of at least {min_records} records; "
+                                 f"keeping the existing dataset")
+        
+        try:
+            self._atomic_write(write)
+        except Exception as e:
+            self.logger.error(f"Error saving data: {e}")
+            return False
+        
+        self._update_index(dates, replace=True)
+        self._sync_columnar()
+        self._sync_artifacts()
+        self.logger.info(f"Successfully saved {len(dates)} records to {self.csv_path}")
+        return True
+    
     def append_new_data(self, new_data: List[Dict[str, Any]]) -> bool:
         """Append new data to existing CSV, avoiding duplicates."""
         if not new_data:
             return True
         
-        existing_df = self.load_existing_data()
+        # Remove duplicates using the date index before touching the file
+        index = self.get_index()
+        new_data = [row for row in new_data if not index.contains(str(row.get('Gregorian Date')))]
+        
+        if not new_data:
+            self.logger.info("No new data to add (all records already exist)")
+            return True
         
-        if existing_df.empty:
+        new_data = self._check_batch(new_data)
+        if not new_data:
+            self.logger.warning("No valid new data to add")
+            return True
+        
+        if index.total_records == 0:
             return self.save_data(new_data, mode='w')
         
+        # Daily updates only add days after the latest one: write just those rows
+        if all(str(row.get('Gregorian Date')) > index.latest_date for row in new_data):
+            try:
+                if self._prepend_rows(new_data):
+                    self.logger.info(f"Successfully added {len(new_data)} new records")
+                    return True
+            except Exception as e:
+                self.logger.error(f"Error appending new data: {e}")
+                return False
+        
+        # Rows inside the existing date range need a full merge
+        import pandas as pd
+        existing_df = self.load_existing_data()
+        
         try:
-            # Create DataFrame from new data
-            new_df = pd.DataFrame(new_data)
-            
-            # Check for duplicates based on Gregorian Date
-            if 'Gregorian Date' in existing_df.columns and 'Gregorian Date' in new_df.columns:
-                # Remove duplicates
-                new_df = new_df[~new_df['Gregorian Date'].isin(existing_df['Gregorian Date'])]
+            with metrics.span('merge', instrument=self.instrument.key):
+                # Create DataFrame from new data
+                new_df = pd.DataFrame(new_data)
                 
-                if new_df.empty:
-                    self.logger.info("No new data to add (all records already exist)")
-                    return True
-            
-            # Combine and sort by date (newest first)
-            combined_df = pd.concat([new_df, existing_df], ignore_index=True)
-            combined_df['date_parsed'] = pd.to_datetime(combined_df['Gregorian Date'])
-            combined_df = combined_df.sort_values('date_parsed', ascending=False)
-            combined_df = combined_df.drop('date_parsed', axis=1)
-            
-            # Remove actual duplicates
-            combined_df = combined_df.drop_duplicates(subset=['Gregorian Date'])
-            
-            # Save the combined data
-            combined_data = combined_df.to_dict('records')
+                # Combine and sort by date (newest first)
+                combined_df = pd.concat([new_df, existing_df], ignore_index=True)
+                combined_df['date_parsed'] = pd.to_datetime(combined_df['Gregorian Date'])
+                combined_df = combined_df.sort_values('date_parsed', ascending=False)
+                combined_df = combined_df.drop('date_parsed', axis=1)
+                
+                # Remove actual duplicates
+                combined_df = combined_df.drop_duplicates(subset=['Gregorian Date'])
+                
+                # Save the combined data
+                combined_data = combined_df.to_dict('records')
             success = self.save_data(combined_data, mode='w')
             
             if success:
                 self.logger.info(f"Successfully added {len(new_df)} new records")
+                self._sync_indicators()
+                self._sync_rollups()
             
             return success
             
@@ -131,11 +532,160 @@ class DataManager:
             self.logger.error(f"Error appending new data: {e}")
             return False
     
+    def _previous_close(self, date: str) -> Tuple[Optional[str], Optional[float]]:
+        """Return the date and close of the last dataset row before a date, if any."""
+        index = self.get_index()
+        i = bisect.bisect_left(index.dates, date)
+        if i == 0:
+            return None, None
+        try:
+            import numpy as np
+            columns = self.load_columns()
+            row = np.searchsorted(columns["gregorian_date"], np.datetime64(index.dates[i - 1].replace('/', '-')))
+            close = float(columns["close_price"][row])
+        except Exception as e:
+            self.logger.warning(f"Could not read the previous close: {e}")
+            return None, None
+        return index.dates[i - 1], (close if close > 0 else None)
+    
+    def _check_batch(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate incoming rows together with the dataset's last close before
+        them. Rows failing VALIDATION_REJECT_CHECKS are dropped; missing
+        derivable cells are filled in if VALIDATION_REPAIR is set, and
+        other findings are logged.
+        """
+        rows = sorted(rows, key=lambda row: str(row.get('Gregorian Date')))
+        try:
+            columns = columns_from_rows(rows)
+            previous_date, previous_close = self._previous_close(str(rows[0].get('Gregorian Date')))
+            with metrics.span('validate', instrument=self.instrument.key, rows=len(rows)):
+                masks = find_anomalies(columns, previous_date=previous_date, previous_close=previous_close)
+        except Exception as e:
+            self.logger.error(f"Error validating new data: {e}")
+            return rows
+        
+        report = build_report(columns, masks)
+        for name, check in report['checks'].items():
+            if check['count']:
+                self.logger.warning("Validation %s (%s): %s", name, check['severity'], ', '.join(check['dates']))
+        
+        if VALIDATION_REPAIR:
+            derived = derived_values(columns, previous_close)
+            for key, missing in missing_derivable(columns).items():
+                column = COLUMN_MAPPING[key]
+                for i in missing.nonzero()[0]:
+                    value = format_derived(key, derived[key][i])
+                    if value and is_blank_cell(rows[i].get(column)):
+                        rows[i][column] = value
+        
+        rejected = rejected_rows(masks)
+        metrics.count('rejected_rows', int(rejected.sum()), instrument=self.instrument.key)
+        return [row for row, reject in zip(rows, rejected) if not reject]
+    
+    def _misordered(self, columns: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        """Flag the rows that break the CSV's newest-first order (the columnar store is always sorted)."""
+        import numpy as np
+        
+        dates = np.asarray(self._read_dates())
+        misordered = dates[1:][dates[1:] > dates[:-1]]
+        return np.isin(columns["gregorian_date"],
+                       np.asarray([date.replace('/', '-') for date in misordered], dtype='M8[D]'))
+    
+    def _repair(self, columns: Dict[str, 'np.ndarray']) -> int:
+        """
+        Fill in the missing derivable cells of the CSV; returns the number of
+        cells filled. Cells holding a value are never rewritten.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        derived = derived_values(columns)
+        dates = np.char.replace(np.datetime_as_string(columns["gregorian_date"]), '-', '/')
+        fills = {}
+        for key, missing in missing_derivable(columns).items():
+            for i in missing.nonzero()[0]:
+                value = format_derived(key, derived[key][i])
+                if value:
+                    fills.setdefault(dates[i], {})[COLUMN_MAPPING[key]] = value
+        if not fills:
+            return 0
+        
+        # Read every cell as text so the other cells are written back unchanged
+        df = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)
+        filled = 0
+        for date, values in fills.items():
+            rows = df['Gregorian Date'] == date
+            for column, value in values.items():
+                blank = rows & df[column].map(is_blank_cell)
+                df.loc[blank, column] = value
+                filled += int(blank.sum())
+        
+        if not filled or not self.save_data(df.to_dict('records'), mode='w'):
+            return 0
+        return filled
+    
+    def validate(self, repair: bool = False, check_order: bool = True) -> Dict[str, Any]:
+        """
+        Check the whole dataset in one vectorized pass over the columnar
+        store and save the report next to the CSV (.validation.json).
+        
+        Args:
+            repair: Fill in missing change and Persian date cells from the
+                closes and Gregorian dates, then check again
+            check_order: Also read the CSV's date column to find rows out
+                of newest-first order
+        
+        Returns the report (see validation.build_report), with the seconds
+        the checks took and, if repairing, the number of cells repaired.
+        """
+        if self.get_index().total_records == 0:
+            return {'rows': 0, 'ok': True, 'errors': 0, 'warnings': 0, 'checks': {}}
+        
+        def check():
+            columns = self.load_columns()
+            with metrics.span('validate', instrument=self.instrument.key):
+                start = time.perf_counter()
+                masks = find_anomalies(columns)
+                elapsed = time.perf_counter() - start
+            if check_order:
+                masks['misordered_date'] = self._misordered(columns)
+            return columns, masks, elapsed
+        
+        columns, masks, elapsed = check()
+        repaired = 0
+        if repair:
+            repaired = self._repair(columns)
+            if repaired:
+                self.logger.info(f"Filled {repaired} missing derivable cells")
+                columns, masks, elapsed = check()
+        
+        report = build_report(columns, masks)
+        report['elapsed'] = round(elapsed, 6)
+        if repair:
+            report['repaired'] = repaired
+        
+        tmp_path = f"{self.validation_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            os.replace(tmp_path, self.validation_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save validation report: {e}")
+        
+        self.logger.info(f"Validated {report['rows']} records in {elapsed * 1000:.1f} ms: "
+                         f"{report['errors']} errors, {report['warnings']} warnings")
+        return report
+    
+    def find_gaps(self, min_missing: int = GAP_MIN_MISSING_DAYS) -> List[Dict[str, Any]]:
+        """Find runs of missing trading days in the dataset (see trading_calendar.find_gaps)."""
+        return find_gaps(self.get_index().dates, min_missing)
+    
     def get_data_summary(self) -> Dict[str, Any]:
         """Get summary information about the current dataset."""
-        df = self.load_existing_data()
+        index = self.get_index()
         
-        if df.empty:
+        if index.total_records == 0:
             return {
                 'total_records': 0,
                 'date_range': None,
@@ -143,20 +693,9 @@ class DataManager:
                 'oldest_date': None
             }
         
-        try:
-            df['date_parsed'] = pd.to_datetime(df['Gregorian Date'])
-            
-            return {
-                'total_records': len(df),
-                'latest_date': df['date_parsed'].max().strftime('%Y/%m/%d'),
-                'oldest_date': df['date_parsed'].min().strftime('%Y/%m/%d'),
-                'date_range': f"{df['date_parsed'].min().strftime('%Y/%m/%d')} to {df['date_parsed'].max().strftime('%Y/%m/%d')}"
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting data summary: {e}")
-            return {
-                'total_records': len(df),
-                'date_range': None,
-                'latest_date': None,
-                'oldest_date': None
-            }
+        return {
+            'total_records': index.total_records,
+            'latest_date': index.latest_date,
+            'oldest_date': index.oldest_date,
+            'date_range': f"{index.oldest_date} to {index.latest_date}"
+        }
@@ -0,0 +1,312 @@
+"""Warm pool of Chrome drivers with offline-cached driver resolution."""
+
+import os
+import re
+import json
+import time
+import atexit
+import shutil
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .config import (
+    CHROME_OPTIONS, CHROME_PREFS, BLOCKED_RESOURCE_PATTERNS, DRIVER_CACHE_PATH,
+    DRIVER_CACHE_MAX_AGE, DRIVER_POOL_SIZE
+)
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+logger = logging.getLogger(__name__)
+
+_resolved_path = None
+_resolve_lock = threading.Lock()
+
+
+def installed_chrome_major() -> Optional[int]:
+    """Return the major version of the installed Chrome without starting it, or None."""
+    for name in CHROME_BINARIES:
+        binary = shutil.which(name)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'(\d+)\.\d+', output)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _load_driver_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_driver_cache(cache_path: str, entry: Dict[str, Any]):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache the ChromeDriver path: {e}")
+
+
+def resolve_driver_path(cache_path: str = DRIVER_CACHE_PATH) -> Optional[str]:
+    """
+    Return a ChromeDriver path, asking ChromeDriverManager (which checks
+    versions over the network) only when the cached one is missing, older
+    than DRIVER_CACHE_MAX_AGE or resolved for another Chrome major version.
+
+    Returns None if no driver could be resolved; Selenium then looks for a
+    chromedriver on the PATH.
+    """
+    global _resolved_path
+    cache_path = os.path.expanduser(cache_path)
+    with _resolve_lock:
+        if _resolved_path and os.path.exists(_resolved_path):
+            return _resolved_path
+
+        major = installed_chrome_major()
+        cached = _load_driver_cache(cache_path)
+        usable = cached is not None and os.access(cached.get('path', ''), os.X_OK)
+        if usable and time.time() - cached.get('resolved_at', 0) < DRIVER_CACHE_MAX_AGE \
+                and (major is None or cached.get('chrome_major') == major):
+            logger.info(f"Using cached ChromeDriver at: {cached['path']}")
+            _resolved_path = cached['path']
+            return _resolved_path
+
+        try:
+            logger.info("====== WebDriver manager ======")
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            if usable:
+                logger.warning(f"ChromeDriver lookup failed ({e}), keeping the cached driver")
+                _resolved_path = cached['path']
+                return _resolved_path
+            logger.error(f"ChromeDriver lookup failed: {e}")
+            return None
+
+        _save_driver_cache(cache_path, {'path': path, 'chrome_major': major, 'resolved_at': time.time()})
+        logger.info(f"Using ChromeDriver at: {path}")
+        _resolved_path = path
+        return path
+
+
+def chrome_options() -> Options:
+    """Chrome options for scraping: headless, eager page loads and no images."""
+    options = Options()
+    for option in CHROME_OPTIONS:
+        options.add_argument(option)
+    options.add_experimental_option('prefs', CHROME_PREFS)
+    # The table is usable at DOMContentLoaded; don't wait for every subresource
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def block_resources(driver: webdriver.Chrome, patterns: List[str] = BLOCKED_RESOURCE_PATTERNS):
+    """Stop the browser from downloading stylesheets, fonts and images."""
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+    except WebDriverException as e:
+        logger.warning(f"Could not block resource loading: {e}")
+
+
+def create_driver() -> webdriver.Chrome:
+    """Start a Chrome driver, falling back to the system ChromeDriver."""
+    options = chrome_options()
+    driver_path = resolve_driver_path()
+    try:
+        if driver_path is None:
+            raise WebDriverException("No ChromeDriver resolved")
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        logger.info("Chrome driver initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize Chrome driver: {str(e)}")
+        try:
+            logger.info("Attempting fallback to system ChromeDriver")
+            driver = webdriver.Chrome(options=options)
+            logger.info("Fallback Chrome driver initialized successfully")
+        except Exception as fallback_error:
+            logger.error(f"Fallback also failed: {str(fallback_error)}")
+            raise RuntimeError(f"Failed to initialize Chrome driver: {str(e)}")
+
+    block_resources(driver)
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps up to `size` Chrome browsers alive for the life of the process.
+
+    A scrape leases one browser and works in a fresh tab; releasing the
+    lease closes that tab and returns the browser to the pool, so the next
+    scrape starts in tens of milliseconds instead of launching Chrome.
+    Browsers that fail a health check are quit and replaced.
+    """
+
+    def __init__(self, size: int = DRIVER_POOL_SIZE, factory: Optional[Callable] = None):
+        self.size = max(1, size)
+        self.factory = factory or create_driver
+        self._idle = []
+        self._base_handles = {}
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _start(self) -> Optional[webdriver.Chrome]:
+        """Start a browser for a slot already counted in self._created."""
+        try:
+            driver = self.factory()
+            self._base_handles[id(driver)] = driver.current_window_handle
+            return driver
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def warm(self, count: Optional[int] = None):
+        """Start browsers in parallel until `count` (default: size) exist."""
+        with self._condition:
+            count = min(self.size if count is None else count, self.size)
+            needed = max(0, count - self._created)
+            self._created += needed
+        if not needed:
+            return
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=needed) as executor:
+            futures = [executor.submit(self._start) for _ in range(needed)]
+        drivers = []
+        for future in futures:
+            try:
+                drivers.append(future.result())
+            except Exception as e:
+                logger.error(f"Could not pre-warm a browser: {e}")
+        with self._condition:
+            self._idle.extend(drivers)
+            self._condition.notify_all()
+        logger.info(f"Pre-warmed {len(drivers)} browsers in {time.perf_counter() - started:.2f}s")
+
+    def _healthy(self, driver: webdriver.Chrome) -> bool:
+        try:
+            driver.switch_to.window(self._base_handles[id(driver)])
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver: webdriver.Chrome):
+        self._base_handles.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Lease a browser, switched to a new tab; waits while all are in use."""
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if not self._idle and self._created >= self.size:
+                    if not self._condition.wait_for(lambda: self._idle or self._created < self.size,
+                                                     timeout=timeout):
+                        raise TimeoutError("No browser became available")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+
+            if driver is None:
+                driver = self._start()
+            elif not self._healthy(driver):
+                logger.warning("Discarding a browser that stopped responding")
+                self._discard(driver)
+                continue
+
+            try:
+                driver.switch_to.new_window('tab')
+                return driver
+            except Exception as e:
+                logger.warning(f"Could not open a tab ({e}), replacing the browser")
+                self._discard(driver)
+
+    def release(self, driver: webdriver.Chrome):
+        """Close the lease's tab and return the browser to the pool."""
+        try:
+            base_handle = self._base_handles[id(driver)]
+            for handle in driver.window_handles:
+                if handle != base_handle:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(base_handle)
+        except Exception as e:
+            logger.warning(f"Could not reset a browser ({e}), replacing it")
+            self._discard(driver)
+            return
+
+        with self._condition:
+            if self._closed:
+                driver.quit()
+                return
+            self._idle.append(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager form of acquire/release."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if idle:
+            logger.info(f"Closed {len(idle)} pooled browsers")
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> DriverPool:
+    """Return the process-wide pool, creating it on first use; it closes at exit."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
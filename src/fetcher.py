@@ -0,0 +1,211 @@
+"""HTTP fetch backend for reading the tgju history table without a browser."""
+
+import logging
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+
+from .config import (
+    BASE_URL, HISTORY_API_URL, HISTORY_API_PARAMS, HTTP_TIMEOUT,
+    HTTP_POOL_SIZE, HTTP_HEADERS, DEFAULT_PAGE_SIZE, MAX_RETRIES
+)
+
+
+# Number of cells in a history table row (see COLUMN_MAPPING)
+ROW_CELL_COUNT = 8
+
+
+class FetchError(Exception):
+    """Raised when the history table cannot be fetched or parsed."""
+
+
+def _cell_text(cell: Any) -> str:
+    """Return the visible text of a table cell that may contain HTML markup."""
+    if cell is None:
+        return ''
+
+    text = str(cell)
+    if '<' not in text:
+        return text.strip()
+
+    try:
+        fragment = lxml_html.fragment_fromstring(text, create_parent='div')
+        return fragment.text_content().strip()
+    except Exception:
+        return text.strip()
+
+
+def parse_table_json(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse a DataTables server-side response.
+
+    Returns a dict with 'rows' (lists of cell texts in table order), 'total'
+    and 'source'.
+    """
+    if not isinstance(payload, dict) or 'data' not in payload:
+        raise FetchError("Response is not a DataTables payload")
+
+    rows = []
+    for raw_row in payload['data']:
+        if isinstance(raw_row, dict):
+            # Object rows are keyed by column index
+            raw_row = [raw_row.get(str(i), raw_row.get(i)) for i in range(ROW_CELL_COUNT)]
+        rows.append([_cell_text(cell) for cell in raw_row])
+
+    total = payload.get('recordsFiltered', payload.get('recordsTotal', len(rows)))
+    try:
+        total = int(total)
+    except (TypeError, ValueError):
+        total = len(rows)
+
+    return {'rows': rows, 'total': total, 'source': 'api'}
+
+
+def parse_table_html(page_html: str, table_id: str = 'DataTables_Table_0') -> Dict[str, Any]:
+    """
+    Parse history rows from a server-rendered HTML table.
+
+    Returns the same structure as parse_table_json, with 'total' None: the
+    rendered page only holds the newest rows and not the record count.
+    """
+    try:
+        document = lxml_html.fromstring(page_html)
+    except Exception as e:
+        raise FetchError(f"Could not parse HTML: {e}")
+
+    table_rows = document.xpath(f'//table[@id="{table_id}"]/tbody/tr')
+    if not table_rows:
+        # Fall back to the first table that looks like the history table
+        table_rows = document.xpath(f'//table[count(.//tbody/tr[count(td) >= {ROW_CELL_COUNT}]) > 0][1]/tbody/tr')
+
+    rows = []
+    for row in table_rows:
+        cells = row.xpath('./td')
+        rows.append([cell.text_content().strip() for cell in cells])
+
+    return {'rows': rows, 'total': None, 'source': 'html'}
+
+
+class HttpFetcher:
+    """Fetches history table pages over a pooled requests session."""
+
+    def __init__(self, base_url: str = BASE_URL, api_url: str = HISTORY_API_URL,
+                 session: Optional[requests.Session] = None, timeout: float = HTTP_TIMEOUT):
+        self.logger = logging.getLogger(__name__)
+        self.base_url = base_url
+        self.api_url = api_url
+        self.timeout = timeout
+        self.session = session or self._build_session()
+        self._draw = 0
+
+    def _build_session(self) -> requests.Session:
+        """Create a session with a connection pool and retrying adapter."""
+        session = requests.Session()
+        session.headers.update(HTTP_HEADERS)
+        session.headers['Referer'] = self.base_url
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                              max_retries=MAX_RETRIES)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _table_params(self, start: int, length: int, draw: Optional[int] = None) -> Dict[str, Any]:
+        """Build the DataTables server-side query parameters."""
+        if draw is None:
+            self._draw += 1
+            draw = self._draw
+        params = dict(HISTORY_API_PARAMS)
+        params.update({
+            'draw': draw,
+            'start': start,
+            'length': length,
+            'search[value]': '',
+            'search[regex]': 'false'
+        })
+        for i in range(ROW_CELL_COUNT):
+            params[f'columns[{i}][data]'] = i
+        return params
+
+    def fetch_page(self, start: int = 0, length: int = DEFAULT_PAGE_SIZE,
+                   html_fallback: bool = True) -> Dict[str, Any]:
+        """
+        Fetch one page of the history table.
+
+        Args:
+            start: Offset of the first row (0 is the newest row)
+            length: Number of rows to request
+            html_fallback: Read the rendered page if the first page cannot be fetched
+        """
+        try:
+            response = self.session.get(self.api_url, params=self._table_params(start, length),
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            page = parse_table_json(response.json())
+        except (requests.RequestException, ValueError, FetchError) as e:
+            if start != 0 or not html_fallback:
+                raise FetchError(f"Failed to fetch rows from offset {start}: {e}")
+
+            # The rendered page only ever holds the first page of the table
+            self.logger.warning(f"History API unavailable ({e}), trying the HTML page")
+            page = self.fetch_html_page()
+
+        self.logger.debug("Fetched %d rows from offset %d (total %s)", len(page['rows']), start, page['total'])
+        return page
+
+    def fetch_head(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch only the newest row, conditionally on the validators of an
+        earlier response.
+
+        Returns a dict with 'rows' (empty when 'not_modified'), 'total',
+        'not_modified', 'etag' and 'last_modified'.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        try:
+            # A fixed draw keeps the request, and so its validators, stable between runs
+            response = self.session.get(self.api_url, params=self._table_params(0, 1, draw=1),
+                                        headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                page = {'rows': [], 'total': None, 'not_modified': True}
+            else:
+                response.raise_for_status()
+                page = parse_table_json(response.json())
+                page['not_modified'] = False
+        except (requests.RequestException, ValueError) as e:
+            raise FetchError(f"Failed to fetch the newest row: {e}")
+
+        page['etag'] = response.headers.get('ETag', etag)
+        page['last_modified'] = response.headers.get('Last-Modified', last_modified)
+        return page
+
+    def fetch_html_page(self) -> Dict[str, Any]:
+        """Fetch the first page of rows from the server-rendered history page."""
+        try:
+            response = self.session.get(self.base_url, timeout=self.timeout,
+                                        headers={'Accept': 'text/html,application/xhtml+xml'})
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise FetchError(f"Failed to fetch {self.base_url}: {e}")
+
+        page = parse_table_html(response.text)
+        if not page['rows']:
+            raise FetchError(f"No history rows found in {self.base_url}")
+
+        return page
+
+    def close(self):
+        """Close the underlying session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,20 @@
+"""
+Technical indicators over the dataset's OHLC columns.
+
+`series` computes full indicator series like the chart overlays in
+docs/script.js, and `signals` computes the readings and buy/sell signals of
+the technical analysis panel in docs/ta.js. Both work on NumPy arrays
+ordered oldest first, e.g. the columns returned by DataManager.load_columns()
+or open_dataset(). `streaming` keeps the same series as state that is
+advanced one bar at a time.
+"""
+
+from .series import ema, rsi, stochastic, stochastic_slow, momentum, macd, ichimoku
+from .signals import analyze, oscillators, moving_averages, headline_indicators, overall_signal
+from .streaming import IndicatorSet
+
+__all__ = [
+    'ema', 'rsi', 'stochastic', 'stochastic_slow', 'momentum', 'macd', 'ichimoku',
+    'analyze', 'oscillators', 'moving_averages', 'headline_indicators', 'overall_signal',
+    'IndicatorSet'
+]
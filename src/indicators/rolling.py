@@ -0,0 +1,124 @@
+"""Vectorized rolling-window and smoothing primitives used by the indicators."""
+
+import math
+
+import numpy as np
+
+
+def as_float(values) -> np.ndarray:
+    """Return values as a 1-D float64 array."""
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    """Sums of every full window; result[i] covers values[i:i + window]."""
+    x = as_float(values)
+    if window <= 0 or len(x) < window:
+        return np.empty(0)
+    totals = np.concatenate(([0.0], np.cumsum(x)))
+    return totals[window:] - totals[:-window]
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Simple moving average of every full window."""
+    return rolling_sum(values, window) / window
+
+
+def _rolling_extreme(values, window: int, ufunc, fill: float) -> np.ndarray:
+    """
+    van Herk/Gil-Werman rolling max/min in O(n) independent of the window.
+
+    The series is cut into blocks of `window` values; each window spans at
+    most two blocks, so its extreme is the combination of a block suffix
+    extreme and the next block's prefix extreme.
+    """
+    x = as_float(values)
+    n = len(x)
+    if window <= 0 or n < window:
+        return np.empty(0)
+    if window == 1:
+        return x.copy()
+
+    padded = np.concatenate((x, np.full((-n) % window, fill))).reshape(-1, window)
+    prefix = ufunc.accumulate(padded, axis=1).reshape(-1)
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1)
+    return ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """Maximum of every full window; result[i] covers values[i:i + window]."""
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """Minimum of every full window; result[i] covers values[i:i + window]."""
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+
+def rolling_wma(values, window: int) -> np.ndarray:
+    """Linearly weighted moving average (weights 1..window, newest heaviest)."""
+    x = as_float(values)
+    if window <= 0 or len(x) < window:
+        return np.empty(0)
+    weights = np.arange(1, window + 1, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(x, window)
+    return windows @ weights / weights.sum()
+
+
+def exp_smooth(values, alpha: float, initial: float) -> np.ndarray:
+    """
+    First-order recursive filter y[i] = alpha * x[i] + (1 - alpha) * y[i - 1]
+    with y[-1] = initial, evaluated without a Python loop per element.
+
+    Within a block, y[j] = d^(j+1) * (y_prev + alpha * sum_k x[k] * d^-(k+1))
+    with d = 1 - alpha, which is a cumulative sum. Blocks are kept short
+    enough that d^-(k+1) stays far from float64 overflow.
+    """
+    x = as_float(values)
+    n = len(x)
+    result = np.empty(n)
+    if n == 0:
+        return result
+
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[:] = x
+        return result
+    if decay >= 1.0:
+        result[:] = initial
+        return result
+
+    block = max(1, min(n, int(200 * math.log(10) / -math.log(decay))))
+    powers = decay ** np.arange(1, block + 1, dtype=np.float64)
+
+    previous = float(initial)
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        scale = powers[:len(chunk)]
+        values_out = scale * (previous + alpha * np.cumsum(chunk / scale))
+        result[start:start + len(chunk)] = values_out
+        previous = values_out[-1]
+
+    return result
+
+
+def ema_first_seed(values, period: int) -> np.ndarray:
+    """EMA seeded with the first value (docs/script.js calculateEMA)."""
+    x = as_float(values)
+    if len(x) == 0:
+        return x
+    alpha = 2.0 / (period + 1)
+    return np.concatenate(([x[0]], exp_smooth(x[1:], alpha, x[0])))
+
+
+def ema_sma_seed(values, period: int) -> np.ndarray:
+    """
+    EMA seeded with the SMA of the first `period` values (docs/ta.js
+    calculateEMA). result[i] is the EMA at values[period - 1 + i].
+    """
+    x = as_float(values)
+    if len(x) < period:
+        return np.empty(0)
+    alpha = 2.0 / (period + 1)
+    seed = x[:period].sum() / period
+    return np.concatenate(([seed], exp_smooth(x[period:], alpha, seed)))
@@ -0,0 +1,135 @@
+"""
+Full indicator series, matching the chart overlays in docs/script.js.
+
+Every function returns float64 arrays as long as the input, with NaN
+where the dashboard has no point (warm-up periods, shifted spans).
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from .rolling import (
+    as_float, rolling_mean, rolling_max, rolling_min, exp_smooth, ema_first_seed
+)
+
+
+def _padded(values: np.ndarray, n: int, offset: int) -> np.ndarray:
+    """Place values into a NaN array of length n starting at offset."""
+    result = np.full(n, np.nan)
+    if len(values):
+        result[offset:offset + len(values)] = values
+    return result
+
+
+def ema(close, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first close."""
+    return ema_first_seed(close, period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder RSI, seeded with the simple average of the first `period` changes."""
+    x = as_float(close)
+    n = len(x)
+    if n <= period:
+        return np.full(n, np.nan)
+
+    change = np.diff(x)
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change < 0, -change, 0.0)
+
+    alpha = 1.0 / period
+    seed_gain = gains[:period].sum() / period
+    seed_loss = losses[:period].sum() / period
+    avg_gain = np.concatenate(([seed_gain], exp_smooth(gains[period:], alpha, seed_gain)))
+    avg_loss = np.concatenate(([seed_loss], exp_smooth(losses[period:], alpha, seed_loss)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    return _padded(values, n, period)
+
+
+def stochastic(high, low, close, k_period: int = 14) -> np.ndarray:
+    """Fast stochastic %K."""
+    c = as_float(close)
+    n = len(c)
+    highest = rolling_max(high, k_period)
+    lowest = rolling_min(low, k_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = (c[k_period - 1:] - lowest) / (highest - lowest) * 100
+    return _padded(values, n, k_period - 1)
+
+
+def stochastic_slow(high, low, close, k_period: int = 14, d_period: int = 3) -> np.ndarray:
+    """Slow stochastic: the d_period SMA of %K."""
+    n = len(as_float(close))
+    k = stochastic(high, low, close, k_period)[k_period - 1:]
+    return _padded(rolling_mean(k, d_period), n, k_period + d_period - 2)
+
+
+def momentum(close, period: int = 10) -> np.ndarray:
+    """Percent change over `period` bars."""
+    x = as_float(close)
+    n = len(x)
+    if n <= period:
+        return np.full(n, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = (x[period:] - x[:-period]) / x[:-period] * 100
+    return _padded(values, n, period)
+
+
+def macd(close, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, np.ndarray]:
+    """
+    MACD line and signal line.
+
+    As in the dashboard, the bar at index i shows the EMA difference
+    computed at index i - (slow_period - 1), and the signal line is an EMA
+    of the MACD values seeded with the first one.
+    """
+    x = as_float(close)
+    n = len(x)
+    start = slow_period - 1
+    if n <= start:
+        return {'macd': np.full(n, np.nan), 'signal': np.full(n, np.nan)}
+
+    difference = ema_first_seed(x, fast_period) - ema_first_seed(x, slow_period)
+    line = difference[:n - start]
+    signal = ema_first_seed(line, signal_period)
+    return {'macd': _padded(line, n, start), 'signal': _padded(signal, n, start)}
+
+
+def _midpoint(high, low, window: int) -> np.ndarray:
+    return (rolling_max(high, window) + rolling_min(low, window)) / 2
+
+
+def ichimoku(high, low, close) -> Dict[str, np.ndarray]:
+    """
+    Ichimoku cloud lines (9, 26, 52), aligned to the bar they are drawn at:
+    the leading spans are shifted 26 bars forward and the lagging span 26
+    bars back.
+    """
+    c = as_float(close)
+    n = len(c)
+
+    tenkan = _padded(_midpoint(high, low, 9), n, 8)
+    kijun = _padded(_midpoint(high, low, 26), n, 25)
+
+    senkou_a = np.full(n, np.nan)
+    if n > 51:
+        senkou_a[51:] = ((tenkan + kijun) / 2)[25:n - 26]
+
+    senkou_b = np.full(n, np.nan)
+    if n > 77:
+        senkou_b[77:] = _midpoint(high, low, 52)[:n - 77]
+
+    chikou = np.full(n, np.nan)
+    if n > 26:
+        chikou[:n - 26] = c[26:]
+
+    return {
+        'tenkan_sen': tenkan,
+        'kijun_sen': kijun,
+        'senkou_span_a': senkou_a,
+        'senkou_span_b': senkou_b,
+        'chikou_span': chikou
+    }
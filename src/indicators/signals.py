@@ -0,0 +1,367 @@
+"""
+Indicator readings and buy/sell/neutral signals, matching the technical
+analysis panel in docs/ta.js.
+
+Values are formatted the way the dashboard shows them: readings that the
+panel passes through toFixed(1) are returned as strings, fallbacks as numbers.
+"""
+
+import math
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Any, Union
+
+import numpy as np
+
+from .rolling import (
+    as_float, rolling_mean, rolling_max, rolling_min, rolling_wma, ema_sma_seed
+)
+
+Reading = Dict[str, Any]
+
+# Number of daily bars analysed per dashboard timeframe
+TIMEFRAME_POINTS = {
+    'day': 7,
+    'week': 30,
+    'month': 90
+}
+
+
+def to_fixed(value: float, digits: int = 1) -> str:
+    """Format a number like JavaScript's Number.prototype.toFixed."""
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    if value == 0:
+        value = 0.0  # toFixed drops the sign of -0
+    # toFixed rounds the exact binary value half away from zero
+    return str(Decimal(value).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def _reading(value: Union[str, float], signal: str = 'neutral') -> Reading:
+    return {'value': value, 'signal': signal}
+
+
+def _band_signal(value: float, buy_below: float, sell_above: float) -> str:
+    """Oscillator signal: oversold is a buy, overbought a sell (inclusive bounds)."""
+    if value >= sell_above:
+        return 'sell'
+    if value <= buy_below:
+        return 'buy'
+    return 'neutral'
+
+
+def _sign_signal(value: float, threshold: float = 0.0) -> str:
+    if value > threshold:
+        return 'buy'
+    if value < -threshold:
+        return 'sell'
+    return 'neutral'
+
+
+def _simple_rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    """RSI from plain averages of the last `period` changes, for every full window."""
+    change = np.diff(closes)
+    avg_gain = rolling_mean(np.where(change > 0, change, 0.0), period)
+    avg_loss = rolling_mean(np.where(change < 0, -change, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    return values
+
+
+def _ema(values: np.ndarray, period: int) -> float:
+    """Latest SMA-seeded EMA value, or the last value if there is too little data."""
+    if len(values) < period:
+        return float(values[-1])
+    return float(ema_sma_seed(values, period)[-1])
+
+
+def _wma(values: np.ndarray, period: int) -> float:
+    if len(values) < period:
+        return float(values[-1])
+    return float(rolling_wma(values[-period:], period)[-1])
+
+
+# Oscillators
+
+def rsi_reading(closes, period: int = 14) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < period + 1:
+        return _reading(50)
+    rsi = float(_simple_rsi(closes[-(period + 1):], period)[-1])
+    return _reading(to_fixed(rsi), _band_signal(rsi, 30, 70))
+
+
+def stochastic_reading(highs, lows, closes, period: int = 14) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(highs) < period:
+        return _reading(50)
+    highest = highs[-period:].max()
+    lowest = lows[-period:].min()
+    if highest == lowest:
+        return _reading(50)
+    k = (closes[-1] - lowest) / (highest - lowest) * 100
+    return _reading(to_fixed(k), _band_signal(k, 20, 80))
+
+
+def cci_reading(highs, lows, closes, period: int = 20) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(highs) < period:
+        return _reading(0)
+    typical = (highs[-period:] + lows[-period:] + closes[-period:]) / 3
+    mean = typical.sum() / period
+    mean_deviation = np.abs(typical - mean).sum() / period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cci = float(np.float64(typical[-1] - mean) / (0.015 * mean_deviation))
+    signal = 'sell' if cci > 100 else 'buy' if cci < -100 else 'neutral'
+    return _reading(to_fixed(cci), signal)
+
+
+def adx_reading(highs, lows, closes, period: int = 14) -> Reading:
+    """Simplified directional index over the first `period` bars of the window, as in the panel."""
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(highs) < period + 1:
+        return _reading(25)
+
+    h, l = highs[:period + 1], lows[:period + 1]
+    up = h[1:] - h[:-1]
+    down = l[:-1] - l[1:]
+    dm_plus = np.where(up > down, np.maximum(up, 0), 0.0).sum()
+    dm_minus = np.where(down > up, np.maximum(down, 0), 0.0).sum()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adx = float(abs(np.float64(dm_plus - dm_minus) / (dm_plus + dm_minus)) * 100)
+    signal = 'neutral'
+    if adx > 25 and dm_plus > dm_minus:
+        signal = 'buy'
+    elif adx > 25 and dm_minus > dm_plus:
+        signal = 'sell'
+    return _reading(to_fixed(adx), signal)
+
+
+def awesome_oscillator_reading(highs, lows) -> Reading:
+    median = (as_float(highs) + as_float(lows)) / 2
+    if len(median) < 34:
+        return _reading(0)
+    ao = median[-5:].sum() / 5 - median[-34:].sum() / 34
+    return _reading(to_fixed(ao), _sign_signal(ao, median[-1] * 0.002))
+
+
+def momentum_reading(closes, period: int = 10) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < period + 1:
+        return _reading(0)
+    value = closes[-1] - closes[-1 - period]
+    return _reading(to_fixed(value), _sign_signal(value))
+
+
+def macd_level_reading(closes, fast: int = 12, slow: int = 26) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < slow:
+        return _reading(0)
+    value = _ema(closes, fast) - _ema(closes, slow)
+    return _reading(to_fixed(value), _sign_signal(value, closes[-1] * 0.005))
+
+
+def stoch_rsi_reading(closes, period: int = 14) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < period + 1:
+        return _reading(50)
+    rsi = _simple_rsi(closes, period)
+    if len(rsi) < 14:
+        return _reading(50)
+    recent = rsi[-14:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = float(np.float64(rsi[-1] - recent.min()) / (recent.max() - recent.min()) * 100)
+    return _reading(to_fixed(value), _band_signal(value, 20, 80))
+
+
+def williams_r_reading(highs, lows, closes, period: int = 14) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(highs) < period:
+        return _reading(-50)
+    highest = highs[-period:].max()
+    lowest = lows[-period:].min()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = float(np.float64(highest - closes[-1]) / (highest - lowest) * -100)
+    signal = 'buy' if value <= -80 else 'sell' if value >= -20 else 'neutral'
+    return _reading(to_fixed(value), signal)
+
+
+def bull_bear_power_reading(highs, lows, closes) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(closes) < 13:
+        return _reading(0)
+    ema13 = _ema(closes, 13)
+    power = (highs[-1] - ema13) + (lows[-1] - ema13)
+    return _reading(to_fixed(power), _sign_signal(power))
+
+
+def ultimate_oscillator_reading(highs, lows, closes) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    n = len(closes)
+    if n < 28:
+        return _reading(50)
+
+    previous = closes[:-1]
+    buying = closes[1:] - np.minimum(lows[1:], previous)
+    true_range = np.maximum(highs[1:], previous) - np.minimum(lows[1:], previous)
+
+    total_bp = total_tr = 0.0
+    for period in (7, 14, 28):
+        start = max(1, n - period) - 1
+        total_bp += buying[start:].sum() / period
+        total_tr += true_range[start:].sum() / period
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = float(np.float64(total_bp) / total_tr * 100)
+    return _reading(to_fixed(value), _band_signal(value, 30, 70))
+
+
+# Moving averages
+
+def _deviation_signal(price: float, average: float) -> str:
+    deviation = (price - average) / average * 100
+    return _sign_signal(deviation, 0.3)
+
+
+def sma_reading(closes, period: int) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < period:
+        return _reading(to_fixed(closes[-1]))
+    sma = closes[-period:].sum() / period
+    return _reading(to_fixed(sma), _deviation_signal(closes[-1], sma))
+
+
+def ema_reading(closes, period: int) -> Reading:
+    closes = as_float(closes)
+    if len(closes) < period:
+        return _reading(to_fixed(closes[-1]))
+    ema = _ema(closes, period)
+    return _reading(to_fixed(ema), _deviation_signal(closes[-1], ema))
+
+
+def ichimoku_base_reading(highs, lows, closes) -> Reading:
+    highs, lows, closes = as_float(highs), as_float(lows), as_float(closes)
+    if len(closes) < 52:
+        return _reading(to_fixed(closes[-1]))
+    tenkan = (rolling_max(highs[-9:], 9)[-1] + rolling_min(lows[-9:], 9)[-1]) / 2
+    kijun = (rolling_max(highs[-26:], 26)[-1] + rolling_min(lows[-26:], 26)[-1]) / 2
+    price = closes[-1]
+    signal = 'neutral'
+    if price > kijun and tenkan > kijun:
+        signal = 'buy'
+    elif price < kijun and tenkan < kijun:
+        signal = 'sell'
+    return _reading(to_fixed(kijun), signal)
+
+
+def vwma_reading(opens, closes, period: int = 20) -> Reading:
+    """Volume-weighted MA using |close - open| as the volume proxy, as in the panel."""
+    opens, closes = as_float(opens), as_float(closes)
+    if len(closes) < period:
+        return _reading(to_fixed(closes[-1]))
+    recent_open, recent_close = opens[-period:], closes[-period:]
+    volume = np.abs(recent_close - recent_open)
+    total_volume = volume.sum()
+    vwma = (recent_close * volume).sum() / total_volume if total_volume > 0 else recent_close[-1]
+    return _reading(to_fixed(vwma), _sign_signal(closes[-1] - vwma))
+
+
+def hma_reading(closes, period: int = 9) -> Reading:
+    """Simplified Hull MA (2 * WMA(n/2) - WMA(n), without the final smoothing)."""
+    closes = as_float(closes)
+    if len(closes) < period:
+        return _reading(to_fixed(closes[-1]))
+    hma = 2 * _wma(closes, period // 2) - _wma(closes, period)
+    return _reading(to_fixed(hma), _sign_signal(closes[-1] - hma))
+
+
+def oscillators(opens, highs, lows, closes) -> Dict[str, Reading]:
+    """All oscillator readings, keyed by the labels shown on the dashboard."""
+    return {
+        'Relative Strength Index (14)': rsi_reading(closes, 14),
+        'Stochastic %K (14, 3, 3)': stochastic_reading(highs, lows, closes, 14),
+        'Commodity Channel Index (20)': cci_reading(highs, lows, closes, 20),
+        'Average Directional Index (14)': adx_reading(highs, lows, closes, 14),
+        'Awesome Oscillator': awesome_oscillator_reading(highs, lows),
+        'Momentum (10)': momentum_reading(closes, 10),
+        'MACD Level (12, 26)': macd_level_reading(closes, 12, 26),
+        'Stochastic RSI Fast (3, 3, 14, 14)': stoch_rsi_reading(closes, 14),
+        'Williams Percent Range (14)': williams_r_reading(highs, lows, closes, 14),
+        'Bull Bear Power': bull_bear_power_reading(highs, lows, closes),
+        'Ultimate Oscillator (7, 14, 28)': ultimate_oscillator_reading(highs, lows, closes)
+    }
+
+
+def moving_averages(opens, highs, lows, closes) -> Dict[str, Reading]:
+    """All moving average readings, keyed by the labels shown on the dashboard."""
+    readings = {}
+    for period in (10, 20, 30, 50, 100, 200):
+        readings[f'Exponential Moving Average ({period})'] = ema_reading(closes, period)
+        readings[f'Simple Moving Average ({period})'] = sma_reading(closes, period)
+    readings['Ichimoku Base Line (9, 26, 52, 26)'] = ichimoku_base_reading(highs, lows, closes)
+    readings['Volume Weighted Moving Average (20)'] = vwma_reading(opens, closes, 20)
+    readings['Hull Moving Average (9)'] = hma_reading(closes, 9)
+    return readings
+
+
+def headline_indicators(closes, timeframe: str = 'week') -> Dict[str, Reading]:
+    """The MA, RSI and MACD gauges at the top of the panel."""
+    closes = as_float(closes)
+    n = len(closes)
+
+    ma_period = {'day': (3, 5), 'month': (10, 20)}.get(timeframe, (5, 10))
+    period = min(ma_period[1], max(ma_period[0], n // 2))
+    if n < period:
+        ma = _reading(float(closes[-1]))
+    else:
+        average = closes[-period:].sum() / period
+        deviation = (closes[-1] - average) / average * 100
+        ma = _reading(float(average), _sign_signal(deviation, 0.5))
+
+    if n < 15:
+        rsi = _reading(50)
+    else:
+        value = float(_simple_rsi(closes[-15:], 14)[-1])
+        value = max(0.0, min(100.0, value))
+        rsi = _reading(value, _band_signal(value, 30, 70))
+
+    if n < 26:
+        macd = _reading(0)
+    else:
+        value = _ema(closes, 12) - _ema(closes, 26)
+        macd = _reading(value, _sign_signal(value, 1000))
+
+    return {'ma': ma, 'rsi': rsi, 'macd': macd}
+
+
+def overall_signal(headline: Dict[str, Reading]) -> Dict[str, Any]:
+    """Combine the headline gauges into the overall BUY/SELL/NEUTRAL call."""
+    signals = [headline[key]['signal'] for key in ('ma', 'rsi', 'macd')]
+    buys, sells = signals.count('buy'), signals.count('sell')
+    if buys >= 2:
+        return {'signal': 'buy', 'strength': buys / 3 * 100}
+    if sells >= 2:
+        return {'signal': 'sell', 'strength': sells / 3 * 100}
+    return {'signal': 'neutral', 'strength': 50}
+
+
+def analyze(opens, highs, lows, closes, timeframe: str = 'week') -> Dict[str, Any]:
+    """
+    Run the whole panel over the latest bars for a dashboard timeframe
+    ('day', 'week' or 'month'), oldest bar first.
+    """
+    points = TIMEFRAME_POINTS.get(timeframe, 30)
+    opens, highs, lows, closes = (as_float(values)[-points:] for values in (opens, highs, lows, closes))
+    if len(closes) < 2:
+        raise ValueError("Need at least 2 bars for technical analysis")
+
+    headline = headline_indicators(closes, timeframe)
+    return {
+        'indicators': headline,
+        'oscillators': oscillators(opens, highs, lows, closes),
+        'moving_averages': moving_averages(opens, highs, lows, closes),
+        'overall': overall_signal(headline)
+    }
@@ -0,0 +1,472 @@
+"""
+Incremental indicator state, advanced one daily bar at a time.
+
+Each state object keeps only what its indicator needs to produce the next
+value (EMA accumulators, Wilder averages, monotonic window deques, short
+delay lines), so `update` costs O(1) amortized however long the history is.
+The values match the latest point of the batch functions in `series`.
+"""
+
+import os
+import json
+import math
+from collections import deque
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from .signals import TIMEFRAME_POINTS, analyze
+
+STATE_VERSION = 1
+
+NAN = float('nan')
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with NumPy's results for a zero denominator."""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _number(value: Optional[float]) -> float:
+    return NAN if value is None else float(value)
+
+
+def _json_number(value: float) -> Optional[float]:
+    return value if value is not None and math.isfinite(value) else None
+
+
+class EMAState:
+    """Exponential moving average seeded with the first value."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if self.count == 0:
+            self.value = x
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        self.count += 1
+        return self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'period': self.period, 'value': _json_number(self.value), 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EMAState':
+        state = cls(data['period'])
+        state.value = _number(data['value'])
+        state.count = data['count']
+        return state
+
+
+class WilderRSIState:
+    """Wilder RSI, seeded with the simple average of the first `period` changes."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous_close = NAN
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        if self.changes == 0 and math.isnan(self.previous_close):
+            self.previous_close = close
+            return self.value
+
+        change = close - self.previous_close
+        self.previous_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self.changes += 1
+
+        if self.changes <= self.period:
+            # Accumulate the seed sums, then turn them into averages
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if self.changes < self.period:
+                return self.value
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        else:
+            alpha = 1.0 / self.period
+            self.avg_gain = alpha * gain + (1 - alpha) * self.avg_gain
+            self.avg_loss = alpha * loss + (1 - alpha) * self.avg_loss
+
+        self.value = 100 - _divide(100, 1 + _divide(self.avg_gain, self.avg_loss))
+        return self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'period': self.period,
+            'previous_close': _json_number(self.previous_close),
+            'changes': self.changes,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'value': _json_number(self.value)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WilderRSIState':
+        state = cls(data['period'])
+        state.previous_close = _number(data['previous_close'])
+        state.changes = data['changes']
+        state.avg_gain = data['avg_gain']
+        state.avg_loss = data['avg_loss']
+        state.value = _number(data['value'])
+        return state
+
+
+class RollingExtremeState:
+    """
+    Rolling max (or min) over the last `window` values.
+
+    The deque holds (position, value) pairs with values in decreasing (or
+    increasing) order; each value is pushed and popped at most once.
+    """
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.items = deque()
+        self.count = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old if self.maximum else new <= old
+
+    def update(self, x: float) -> float:
+        while self.items and self._dominates(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.count, x))
+        if self.items[0][0] <= self.count - self.window:
+            self.items.popleft()
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.items[0][1] if self.count >= self.window else NAN
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'maximum': self.maximum,
+                'items': [list(item) for item in self.items], 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RollingExtremeState':
+        state = cls(data['window'], data['maximum'])
+        state.items = deque(tuple(item) for item in data['items'])
+        state.count = data['count']
+        return state
+
+
+class StochasticState:
+    """Fast %K and its d_period average (the slow stochastic)."""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.k_period = k_period
+        self.d_period = d_period
+        self.highest = RollingExtremeState(k_period, maximum=True)
+        self.lowest = RollingExtremeState(k_period, maximum=False)
+        self.recent_k = deque(maxlen=d_period)
+        self.k = NAN
+        self.d = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        if self.highest.count < self.k_period:
+            return self.k
+
+        self.k = _divide(close - lowest, highest - lowest) * 100
+        self.recent_k.append(self.k)
+        if len(self.recent_k) == self.d_period:
+            self.d = sum(self.recent_k) / self.d_period
+        return self.k
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'k_period': self.k_period,
+            'd_period': self.d_period,
+            'highest': self.highest.to_dict(),
+            'lowest': self.lowest.to_dict(),
+            'recent_k': [_json_number(k) for k in self.recent_k],
+            'k': _json_number(self.k),
+            'd': _json_number(self.d)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StochasticState':
+        state = cls(data['k_period'], data['d_period'])
+        state.highest = RollingExtremeState.from_dict(data['highest'])
+        state.lowest = RollingExtremeState.from_dict(data['lowest'])
+        state.recent_k.extend(_number(k) for k in data['recent_k'])
+        state.k = _number(data['k'])
+        state.d = _number(data['d'])
+        return state
+
+
+class MomentumState:
+    """Percent change over `period` bars."""
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self.closes = deque(maxlen=period + 1)
+
+    def update(self, close: float) -> float:
+        self.closes.append(close)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self.closes) <= self.period:
+            return NAN
+        base = self.closes[0]
+        return _divide(self.closes[-1] - base, base) * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'period': self.period, 'closes': list(self.closes)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MomentumState':
+        state = cls(data['period'])
+        state.closes.extend(data['closes'])
+        return state
+
+
+class MACDState:
+    """
+    MACD and signal line. As in the dashboard, the bar at index i shows the
+    EMA difference from index i - (slow_period - 1), so the differences go
+    through a delay line of slow_period values.
+    """
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = EMAState(fast_period)
+        self.slow = EMAState(slow_period)
+        self.signal = EMAState(signal_period)
+        self.differences = deque(maxlen=slow_period)
+        self.value = NAN
+
+    def update(self, close: float) -> float:
+        self.differences.append(self.fast.update(close) - self.slow.update(close))
+        if len(self.differences) == self.differences.maxlen:
+            self.value = self.differences[0]
+            self.signal.update(self.value)
+        return self.value
+
+    @property
+    def signal_value(self) -> float:
+        return self.signal.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fast': self.fast.to_dict(),
+            'slow': self.slow.to_dict(),
+            'signal': self.signal.to_dict(),
+            'differences': list(self.differences),
+            'value': _json_number(self.value)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MACDState':
+        state = cls(data['fast']['period'], data['slow']['period'], data['signal']['period'])
+        state.fast = EMAState.from_dict(data['fast'])
+        state.slow = EMAState.from_dict(data['slow'])
+        state.signal = EMAState.from_dict(data['signal'])
+        state.differences.extend(data['differences'])
+        state.value = _number(data['value'])
+        return state
+
+
+class IchimokuState:
+    """
+    Ichimoku lines (9, 26, 52) at the latest bar. The leading spans shown at
+    a bar were computed 26 bars earlier, so they come out of delay lines.
+    The lagging span is drawn 26 bars back and has no value at the latest bar.
+    """
+
+    SHIFT = 26
+
+    def __init__(self):
+        self.windows = {
+            period: (RollingExtremeState(period, maximum=True), RollingExtremeState(period, maximum=False))
+            for period in (9, 26, 52)
+        }
+        self.span_a = deque(maxlen=self.SHIFT + 1)
+        self.span_b = deque(maxlen=self.SHIFT + 1)
+        self.values = {key: NAN for key in ('tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b')}
+
+    def update(self, high: float, low: float) -> Dict[str, float]:
+        midpoints = {}
+        for period, (highest, lowest) in self.windows.items():
+            midpoints[period] = (highest.update(high) + lowest.update(low)) / 2
+
+        self.values['tenkan_sen'] = midpoints[9]
+        self.values['kijun_sen'] = midpoints[26]
+        if not math.isnan(midpoints[26]):
+            self.span_a.append((midpoints[9] + midpoints[26]) / 2)
+        if not math.isnan(midpoints[52]):
+            self.span_b.append(midpoints[52])
+        for key, delay in (('senkou_span_a', self.span_a), ('senkou_span_b', self.span_b)):
+            if len(delay) == delay.maxlen:
+                self.values[key] = delay[0]
+        return self.values
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'windows': {str(period): [highest.to_dict(), lowest.to_dict()]
+                        for period, (highest, lowest) in self.windows.items()},
+            'span_a': list(self.span_a),
+            'span_b': list(self.span_b),
+            'values': {key: _json_number(value) for key, value in self.values.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IchimokuState':
+        state = cls()
+        state.windows = {
+            int(period): (RollingExtremeState.from_dict(highest), RollingExtremeState.from_dict(lowest))
+            for period, (highest, lowest) in data['windows'].items()
+        }
+        state.span_a.extend(data['span_a'])
+        state.span_b.extend(data['span_b'])
+        state.values = {key: _number(value) for key, value in data['values'].items()}
+        return state
+
+
+class IndicatorSet:
+    """
+    The chart indicators plus a tail of recent bars for the technical
+    analysis panel, advanced together one bar at a time.
+
+    Bars must arrive oldest first; `last_date` and `count` record how far
+    the state has been advanced so callers can tell whether it is current.
+    """
+
+    def __init__(self):
+        self.emas = {period: EMAState(period) for period in (12, 26, 50)}
+        self.rsi = WilderRSIState(14)
+        self.stochastic = StochasticState(14, 3)
+        self.momentum = MomentumState(10)
+        self.macd = MACDState(12, 26, 9)
+        self.ichimoku = IchimokuState()
+        # The panel only looks at the latest bars of the longest timeframe
+        self.bars = deque(maxlen=max(TIMEFRAME_POINTS.values()))
+        self.last_date = None
+        self.count = 0
+
+    def update(self, bar: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Advance every indicator by one bar and return the latest values.
+
+        Args:
+            bar: Dict with 'date' (YYYY-MM-DD) and 'open', 'high', 'low', 'close'
+        """
+        date = str(bar['date']).replace('/', '-')
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Bar {date} is not after the last bar {self.last_date}")
+
+        open_, high, low, close = (float(bar[key]) for key in ('open', 'high', 'low', 'close'))
+        for state in self.emas.values():
+            state.update(close)
+        self.rsi.update(close)
+        self.stochastic.update(high, low, close)
+        self.momentum.update(close)
+        self.macd.update(close)
+        self.ichimoku.update(high, low)
+        self.bars.append((open_, high, low, close))
+
+        self.last_date = date
+        self.count += 1
+        return self.values()
+
+    def update_columns(self, columns: Dict[str, np.ndarray]):
+        """Advance through typed columns (as stored by ColumnarStore) in date order."""
+        keys = ('gregorian_date', 'open_price', 'high_price', 'low_price', 'close_price')
+        order = np.argsort(columns['gregorian_date'], kind='stable')
+        for date, open_, high, low, close in zip(*(np.asarray(columns[key])[order] for key in keys)):
+            self.update({'date': str(date), 'open': open_, 'high': high, 'low': low, 'close': close})
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> 'IndicatorSet':
+        """Build the state by replaying the whole history once."""
+        indicators = cls()
+        indicators.update_columns(columns)
+        return indicators
+
+    def values(self) -> Dict[str, float]:
+        """Latest value of every series, named like the `series` functions (NaN if warming up)."""
+        values = {f'ema_{period}': state.value for period, state in self.emas.items()}
+        values.update({
+            'rsi': self.rsi.value,
+            'stochastic': self.stochastic.k,
+            'stochastic_slow': self.stochastic.d,
+            'momentum': self.momentum.value,
+            'macd': self.macd.value,
+            'macd_signal': self.macd.signal_value
+        })
+        values.update(self.ichimoku.values)
+        return values
+
+    def panel(self, timeframe: str = 'week') -> Dict[str, Any]:
+        """Technical analysis panel for the latest bars (see signals.analyze)."""
+        opens, highs, lows, closes = (np.array(values) for values in zip(*self.bars))
+        return analyze(opens, highs, lows, closes, timeframe)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': STATE_VERSION,
+            'last_date': self.last_date,
+            'count': self.count,
+            'emas': {str(period): state.to_dict() for period, state in self.emas.items()},
+            'rsi': self.rsi.to_dict(),
+            'stochastic': self.stochastic.to_dict(),
+            'momentum': self.momentum.to_dict(),
+            'macd': self.macd.to_dict(),
+            'ichimoku': self.ichimoku.to_dict(),
+            'bars': [list(bar) for bar in self.bars]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorSet':
+        if data.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+
+        indicators = cls()
+        indicators.emas = {int(period): EMAState.from_dict(state) for period, state in data['emas'].items()}
+        indicators.rsi = WilderRSIState.from_dict(data['rsi'])
+        indicators.stochastic = StochasticState.from_dict(data['stochastic'])
+        indicators.momentum = MomentumState.from_dict(data['momentum'])
+        indicators.macd = MACDState.from_dict(data['macd'])
+        indicators.ichimoku = IchimokuState.from_dict(data['ichimoku'])
+        indicators.bars.extend(tuple(bar) for bar in data['bars'])
+        indicators.last_date = data['last_date']
+        indicators.count = data['count']
+        return indicators
+
+    def save(self, path: str):
+        """Write the state as JSON through a temporary file and an atomic rename."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, allow_nan=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['IndicatorSet']:
+        """Load saved state, or return None if the file is missing or unreadable."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,61 @@
+"""Registry of the tgju instruments the scraper can collect."""
+
+from typing import List, NamedTuple, Optional, Union
+
+from .config import (
+    PROFILE_URL_TEMPLATE, HISTORY_API_URL_TEMPLATE, CSV_FILENAME, ARTIFACTS_DIR
+)
+
+
+class Instrument(NamedTuple):
+    """
+    One tgju profile whose history table has the standard layout
+    (open, low, high, close, change, percent, Gregorian and Persian date).
+    """
+    key: str
+    slug: str
+    name: str
+    csv_filename: str
+    artifacts_dir: Optional[str] = None  # Dashboard artifacts, if the dashboard shows it
+
+    @property
+    def base_url(self) -> str:
+        return PROFILE_URL_TEMPLATE.format(slug=self.slug)
+
+    @property
+    def api_url(self) -> str:
+        return HISTORY_API_URL_TEMPLATE.format(slug=self.slug)
+
+
+INSTRUMENTS = {
+    instrument.key: instrument for instrument in [
+        Instrument("eur", "price_eur", "EUR/IRR", CSV_FILENAME, ARTIFACTS_DIR),
+        Instrument("usd", "price_dollar_rl", "USD/IRR", "Dollar_Rial_Price_Dataset.csv"),
+        Instrument("gbp", "price_gbp", "GBP/IRR", "Pound_Rial_Price_Dataset.csv"),
+        Instrument("aed", "price_aed", "AED/IRR", "Dirham_Rial_Price_Dataset.csv"),
+        Instrument("sekee", "sekee", "Emami Gold Coin", "Gold_Coin_Rial_Price_Dataset.csv"),
+        Instrument("geram18", "geram18", "18K Gold (per gram)", "Gold_18K_Rial_Price_Dataset.csv"),
+    ]
+}
+
+DEFAULT_INSTRUMENT = INSTRUMENTS["eur"]
+
+
+def get_instrument(instrument: Union[str, Instrument, None] = None) -> Instrument:
+    """Resolve an instrument key (or an Instrument, or None for EUR)."""
+    if instrument is None:
+        return DEFAULT_INSTRUMENT
+    if isinstance(instrument, Instrument):
+        return instrument
+    try:
+        return INSTRUMENTS[instrument.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown instrument: {instrument} (known: {', '.join(INSTRUMENTS)})")
+
+
+def parse_instruments(value: str) -> List[Instrument]:
+    """Parse a comma-separated list of instrument keys ('all' for every one)."""
+    keys = [key.strip() for key in value.split(',') if key.strip()]
+    if keys == ['all']:
+        return list(INSTRUMENTS.values())
+    return [get_instrument(key) for key in dict.fromkeys(keys)]
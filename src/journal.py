@@ -0,0 +1,125 @@
+"""Durable per-page staging of scraped rows, so interrupted scrapes can resume."""
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator
+
+JOURNAL_VERSION = 1
+
+
+class PageJournal:
+    """
+    Append-only JSONL journal of scraped pages plus a checkpoint file.
+
+    Each page is written as one line and fsync'd, then the checkpoint is
+    replaced atomically with the offset to resume from and the journal
+    size it covers. A line written after the last checkpoint (a crash
+    between the two writes) is cut off when the journal is resumed.
+    """
+
+    def __init__(self, csv_path: str):
+        self.logger = logging.getLogger(__name__)
+        stem = os.path.splitext(csv_path)[0]
+        self.journal_path = stem + '.journal.jsonl'
+        self.checkpoint_path = stem + '.checkpoint.json'
+        self.state = None
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Return the saved checkpoint, or None if there is none."""
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return state if state.get('version') == JOURNAL_VERSION else None
+
+    def _save_checkpoint(self):
+        self.state['updated'] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def begin(self, mode: str) -> Dict[str, Any]:
+        """
+        Resume the journal of an interrupted run in the same mode
+        ('incremental' or 'full'), or start a new one.
+
+        Returns the checkpoint state; 'next_offset' is where fetching
+        should continue and 'complete' is True if only the commit is left.
+        """
+        state = self.checkpoint()
+        if state is not None and state.get('mode') == mode and os.path.exists(self.journal_path):
+            # Drop anything written after the last checkpoint
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(state['journal_bytes'])
+            self.state = state
+            self.logger.info(f"Resuming {mode} scrape from offset {state['next_offset']} "
+                             f"({state['pages']} pages, {state['rows']} rows staged)")
+            return state
+
+        if state is not None:
+            self.logger.info(f"Discarding staged {state.get('mode')} scrape")
+        self.state = {
+            'version': JOURNAL_VERSION,
+            'mode': mode,
+            'pages': 0,
+            'rows': 0,
+            'next_offset': 0,
+            'last_date': None,
+            'journal_bytes': 0,
+            'complete': False,
+            'started': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(self.journal_path, 'wb') as f:
+            os.fsync(f.fileno())
+        self._save_checkpoint()
+        return self.state
+
+    def append_page(self, rows: List[Dict[str, Any]], next_offset: int):
+        """Durably stage one page of rows and advance the checkpoint past it."""
+        line = (json.dumps({'next_offset': next_offset, 'rows': rows}, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        self.state['pages'] += 1
+        self.state['rows'] += len(rows)
+        self.state['next_offset'] = next_offset
+        self.state['journal_bytes'] = size
+        if rows:
+            self.state['last_date'] = rows[-1].get('Gregorian Date')
+        self._save_checkpoint()
+
+    def mark_complete(self):
+        """Record that every page has been staged and only the commit is left."""
+        self.state['complete'] = True
+        self._save_checkpoint()
+
+    def iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the staged pages in order, reading one line at a time."""
+        size = self.state['journal_bytes'] if self.state else None
+        with open(self.journal_path, 'rb') as f:
+            while size is None or f.tell() < size:
+                line = f.readline()
+                if not line:
+                    break
+                yield json.loads(line)['rows']
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield the staged rows in order."""
+        for rows in self.iter_pages():
+            yield from rows
+
+    def clear(self):
+        """Remove the journal and checkpoint after a successful commit."""
+        for path in (self.checkpoint_path, self.journal_path):
+            if os.path.exists(path):
+                os.unlink(path)
+        self.state = None
@@ -0,0 +1,163 @@
+"""Process-wide logging: one queue-fed handler pipeline with rotation and JSON records."""
+
+import os
+import json
+import uuid
+import copy
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from typing import Optional
+
+from .config import LOG_FILE, LOG_LEVEL, LOG_FILE_FORMAT, LOG_ROTATION, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'run_id'}
+
+_lock = threading.Lock()
+_listener = None
+_run_id = None
+
+
+def get_run_id() -> str:
+    """Id shared by every record of this run (SCRAPER_RUN_ID, or generated once)."""
+    global _run_id
+    if _run_id is None:
+        _run_id = os.environ.get('SCRAPER_RUN_ID') or uuid.uuid4().hex[:12]
+    return _run_id
+
+
+class RunIdFilter(logging.Filter):
+    """Stamp each record with the run id."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = get_run_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, keeping `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', None),
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that renders the message but keeps the traceback apart from it."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _file_handler(log_file: str, rotation: str) -> logging.Handler:
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if rotation == 'midnight':
+        return logging.handlers.TimedRotatingFileHandler(log_file, when='midnight',
+                                                         backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    return logging.handlers.RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                                backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = LOG_FILE,
+                      file_format: Optional[str] = None, rotation: str = LOG_ROTATION,
+                      force: bool = False):
+    """
+    Configure the root logger once per process.
+
+    Records go through a QueueHandler to a QueueListener thread that owns
+    the console and file handlers, so a logging call only renders its
+    message and enqueues the record; writing and rotation happen on the
+    listener thread. Later calls do nothing unless `force` is set, which
+    replaces the pipeline (e.g. to change the level or file).
+
+    Args:
+        level: Level name; defaults to SCRAPER_LOG_LEVEL, then LOG_LEVEL
+        log_file: File to write, or None for the console only
+        file_format: "json" or "text"; defaults to SCRAPER_LOG_FORMAT, then LOG_FILE_FORMAT
+        rotation: "size" (LOG_MAX_BYTES) or "midnight"
+        force: Replace an existing configuration
+    """
+    global _listener
+    with _lock:
+        if _listener is not None and not force:
+            return
+        _stop_listener()
+
+        level = (level or os.environ.get('SCRAPER_LOG_LEVEL') or LOG_LEVEL).upper()
+        file_format = file_format or os.environ.get('SCRAPER_LOG_FORMAT') or LOG_FILE_FORMAT
+
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers = [console]
+        if log_file:
+            file_handler = _file_handler(log_file, rotation)
+            file_handler.setFormatter(JsonFormatter() if file_format == 'json' else logging.Formatter(TEXT_FORMAT))
+            handlers.append(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = _QueueHandler(log_queue)
+        queue_handler.addFilter(RunIdFilter())
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread."""
+    with _lock:
+        _stop_listener()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a module logger, configuring logging with the defaults on first use."""
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(name)
+
+
+atexit.register(shutdown_logging)
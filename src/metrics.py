@@ -0,0 +1,217 @@
+"""Timed spans and counters for scraper runs, written as JSON lines and a Prometheus textfile."""
+
+import os
+import json
+import time
+import uuid
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+METRIC_PREFIX = "tgju_scraper"
+
+
+class _NullSpan:
+    """Span used while metrics are disabled; entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **labels):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times a block of code and records it with the Metrics that opened it."""
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict[str, Any]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.start = None
+
+    def set(self, **labels):
+        """Add labels known only inside the block (e.g. the rows a page held)."""
+        self.labels.update(labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        self.metrics._record_span(self.name, self.labels, duration, exc_type is None)
+        return False
+
+
+class _CallCounter:
+    """Proxy that counts the method calls made on an object."""
+
+    def __init__(self, target: Any, metrics: 'Metrics', name: str, labels: Dict[str, Any]):
+        self._target = target
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __getattr__(self, attribute: str):
+        value = getattr(self._target, attribute)
+        if not callable(value):
+            return value
+
+        def counted(*args, **kwargs):
+            self._metrics.count(self._name, **self._labels)
+            return value(*args, **kwargs)
+        return counted
+
+
+class Metrics:
+    """
+    Collects spans and counters for one run.
+
+    Disabled until configure() is called. While disabled, span() returns a
+    shared no-op span and count() returns at once, so instrumented code
+    pays for a single attribute check. Once enabled, each finished span is
+    appended to the JSON lines file immediately, so an interrupted run
+    still leaves a trace. Span totals and counters are written as JSON
+    lines and as a Prometheus textfile by flush().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.run_id = None
+        self.jsonl_path = None
+        self.prometheus_path = None
+        self._counters = {}
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def configure(self, jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                  run_id: Optional[str] = None):
+        """Enable collection, writing to the given files (either may be None)."""
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        for path in (jsonl_path, prometheus_path):
+            if path and os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._counters = {}
+        self._spans = {}
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple:
+        return (name,) + tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def span(self, name: str, **labels):
+        """Time a block: `with metrics.span('page_fetch', instrument='eur'):`."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, labels)
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def count_calls(self, target: Any, name: str, **labels) -> Any:
+        """Return `target`, counting its method calls under `name` while enabled."""
+        if not self.enabled:
+            return target
+        return _CallCounter(target, self, name, labels)
+
+    def _write_lines(self, records):
+        if not self.jsonl_path:
+            return
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _record_span(self, name: str, labels: Dict[str, Any], duration: float, ok: bool):
+        # Totals are kept by the labels that identify a series, not per-event details
+        series_labels = {key: value for key, value in labels.items() if key in ('instrument', 'backend')}
+        key = self._key(name, series_labels)
+        with self._lock:
+            total = self._spans.setdefault(key, [0, 0.0, 0])
+            total[0] += 1
+            total[1] += duration
+            total[2] += 0 if ok else 1
+            self._write_lines([{
+                'type': 'span', 'run_id': self.run_id, 'name': name, 'seconds': round(duration, 6),
+                'ok': ok, 'time': datetime.now().isoformat(timespec='milliseconds'), **labels
+            }])
+
+    def summary(self) -> Dict[str, Any]:
+        """Span totals and counters collected so far."""
+        with self._lock:
+            spans = [{'name': key[0], **dict(key[1:]), 'count': count, 'seconds': round(seconds, 6),
+                      'errors': errors} for key, (count, seconds, errors) in sorted(self._spans.items())]
+            counters = [{'name': key[0], **dict(key[1:]), 'value': value}
+                        for key, value in sorted(self._counters.items())]
+        return {'spans': spans, 'counters': counters}
+
+    @staticmethod
+    def _prometheus_labels(labels: Dict[str, Any]) -> str:
+        if not labels:
+            return ''
+        rendered = []
+        for key, value in labels.items():
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            rendered.append(f'{key}="{value}"')
+        return '{' + ','.join(rendered) + '}'
+
+    def prometheus_text(self) -> str:
+        """Render span totals and counters in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+        if summary['spans']:
+            lines += [f"# HELP {METRIC_PREFIX}_span_seconds Time spent in each phase of the run",
+                      f"# TYPE {METRIC_PREFIX}_span_seconds summary"]
+            for span in summary['spans']:
+                labels = {key: value for key, value in span.items() if key not in ('count', 'seconds', 'errors')}
+                labels['span'] = labels.pop('name')
+                rendered = self._prometheus_labels(labels)
+                lines.append(f"{METRIC_PREFIX}_span_seconds_sum{rendered} {span['seconds']}")
+                lines.append(f"{METRIC_PREFIX}_span_seconds_count{rendered} {span['count']}")
+
+        declared = set()
+        for counter in summary['counters']:
+            metric = f"{METRIC_PREFIX}_{counter['name']}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            labels = {key: value for key, value in counter.items() if key not in ('name', 'value')}
+            lines.append(f"{metric}{self._prometheus_labels(labels)} {counter['value']}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f'{METRIC_PREFIX}_last_run_timestamp_seconds{{run_id="{self.run_id}"}} {time.time():.0f}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """Write the run summary line and the Prometheus textfile."""
+        if not self.enabled:
+            return
+        summary = self.summary()
+        self._write_lines([{'type': 'summary', 'run_id': self.run_id,
+                            'time': datetime.now().isoformat(timespec='seconds'), **summary}])
+        if self.prometheus_path:
+            # The textfile collector may read at any moment; replace the file whole
+            tmp_path = f"{self.prometheus_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, self.prometheus_path)
+
+
+# Process-wide collector used by the scraper, DataManager and scripts
+metrics = Metrics()
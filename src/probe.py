@@ -0,0 +1,130 @@
+"""Cheap check of whether the remote history has moved past the local dataset."""
+
+import os
+import csv
+import json
+import time
+from typing import Dict, Any, Optional, Union
+
+from .config import DATA_DIR, COLUMN_MAPPING
+from .utils import clean_price_text, parse_date
+from .logging_config import get_logger
+from .fetcher import HttpFetcher, FetchError
+from .instruments import Instrument, get_instrument
+
+
+class FreshnessProbe:
+    """
+    Compares the newest remote row with the newest local row.
+
+    The remote side is a single-row request, made conditional on the ETag
+    and Last-Modified of the previous probe; the local side is the first
+    data line of the CSV, which is kept newest first. Neither needs a
+    browser or a pandas read, so an unchanged day is settled in one round
+    trip. Any failure reports a change, so a broken probe never skips a run.
+    """
+
+    def __init__(self, instrument: Union[str, Instrument, None] = None,
+                 fetcher: Optional[HttpFetcher] = None):
+        self.logger = get_logger(__name__)
+        self.instrument = get_instrument(instrument)
+        self.fetcher = fetcher
+        self.csv_path = os.path.join(DATA_DIR, self.instrument.csv_filename)
+        self.state_path = os.path.splitext(self.csv_path)[0] + '.probe.json'
+
+    def local_head(self) -> Optional[Dict[str, Any]]:
+        """Return the date and close of the newest local row, or None."""
+        try:
+            with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+                row = next(csv.DictReader(f), None)
+        except OSError:
+            return None
+        if not row:
+            return None
+        try:
+            close = int(row[COLUMN_MAPPING["close_price"]])
+        except (TypeError, ValueError):
+            close = None
+        return {'date': row[COLUMN_MAPPING["gregorian_date"]], 'close': close}
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]):
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save probe state: {e}")
+
+    def _remote_head(self) -> Dict[str, Any]:
+        """Fetch the newest remote row, reusing the last one on a 304."""
+        state = self._load_state()
+        owns_fetcher = self.fetcher is None
+        fetcher = self.fetcher or HttpFetcher(self.instrument.base_url, self.instrument.api_url)
+        try:
+            page = fetcher.fetch_head(state.get('etag'), state.get('last_modified'))
+        finally:
+            if owns_fetcher:
+                fetcher.close()
+
+        if page['not_modified'] and 'date' in state:
+            return {'date': state['date'], 'close': state['close'], 'not_modified': True}
+        if not page['rows'] or len(page['rows'][0]) < 8:
+            raise FetchError("Probe response has no rows")
+
+        cells = page['rows'][0]
+        head = {'date': parse_date(cells[6]), 'close': clean_price_text(cells[3]), 'not_modified': False}
+        if head['date'] is None:
+            raise FetchError(f"Probe row has no valid date: {cells}")
+
+        self._save_state({'etag': page['etag'], 'last_modified': page['last_modified'],
+                          'date': head['date'], 'close': head['close']})
+        return head
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Probe the instrument.
+
+        Returns a dict with 'changed', 'reason', the remote and local date
+        and close, and 'elapsed' seconds.
+        """
+        start = time.perf_counter()
+        local = self.local_head()
+        result = {
+            'instrument': self.instrument.key,
+            'changed': True,
+            'local_date': local['date'] if local else None,
+            'local_close': local['close'] if local else None,
+            'remote_date': None,
+            'remote_close': None
+        }
+
+        try:
+            remote = self._remote_head()
+            result['remote_date'] = remote['date']
+            result['remote_close'] = remote['close']
+            if local is None:
+                result['reason'] = 'no local data'
+            elif remote['date'] != local['date']:
+                result['reason'] = 'new date'
+            elif remote['close'] != local['close']:
+                result['reason'] = 'close revised'
+            else:
+                result['changed'] = False
+                result['reason'] = 'not modified' if remote['not_modified'] else 'unchanged'
+        except FetchError as e:
+            self.logger.warning(f"[{self.instrument.key}] Probe failed: {e}")
+            result['reason'] = 'probe failed'
+
+        result['elapsed'] = round(time.perf_counter() - start, 3)
+        self.logger.info(f"[{self.instrument.key}] Probe: {result['reason']} "
+                         f"(remote {result['remote_date']}, local {result['local_date']}) "
+                         f"in {result['elapsed']:.3f}s")
+        return result
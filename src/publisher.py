@@ -0,0 +1,248 @@
+"""Publish the dataset to Kaggle, uploading a new version only when its content changed."""
+
+import os
+import json
+import gzip
+import time
+import shutil
+import hashlib
+import importlib.util
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Callable, Union
+
+from .config import (
+    DATA_DIR, KAGGLE_DATASET, KAGGLE_TITLE, KAGGLE_STAGING_DIR, KAGGLE_MANIFEST,
+    KAGGLE_MAX_RETRIES, KAGGLE_RETRY_DELAY
+)
+from .instruments import Instrument, get_instrument
+from .logging_config import get_logger
+from .metrics import metrics
+
+MANIFEST_VERSION = 1
+METADATA_FILENAME = "dataset-metadata.json"
+
+
+class KaggleClient:
+    """
+    The part of the Kaggle API the publisher uses. Any object with the same
+    create_version method can stand in for it (e.g. a fake for tests).
+    """
+
+    def __init__(self):
+        self._api = None
+
+    def _authenticated_api(self):
+        if self._api is None:
+            # Importing kaggle authenticates as a side effect; only do it when uploading
+            from kaggle.api.kaggle_api_extended import KaggleApi
+            api = KaggleApi()
+            api.authenticate()
+            self._api = api
+        return self._api
+
+    def create_version(self, folder: str, notes: str):
+        """Upload the files in `folder` as a new version of the dataset it describes."""
+        result = self._authenticated_api().dataset_create_version(folder=folder, version_notes=notes, quiet=True)
+        status = getattr(result, 'status', 'ok')
+        if status != 'ok':
+            raise RuntimeError(f"Kaggle rejected the new version: {getattr(result, 'error', status)}")
+        return result
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class KagglePublisher:
+    """
+    Stages the dataset for Kaggle and uploads it when it changed.
+
+    The staging folder holds only what is published: the CSV, a gzip'd
+    copy, a typed Parquet file (when pyarrow is installed) and the dataset
+    metadata. The manifest records the content hashes of the last upload;
+    if the CSV and metadata still match it, publish() returns without
+    staging or authenticating.
+    """
+
+    def __init__(self, client: Optional[KaggleClient] = None,
+                 instrument: Union[str, Instrument, None] = None,
+                 dataset: str = KAGGLE_DATASET,
+                 staging_dir: str = KAGGLE_STAGING_DIR,
+                 manifest_path: str = KAGGLE_MANIFEST,
+                 max_retries: int = KAGGLE_MAX_RETRIES,
+                 retry_delay: float = KAGGLE_RETRY_DELAY,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            client: Uploads a staged folder; defaults to the Kaggle API
+            instrument: Instrument whose dataset is published (defaults to EUR)
+            dataset: Kaggle dataset id (owner/slug)
+            staging_dir: Folder the upload is assembled in
+            manifest_path: Where the hashes of the last upload are kept
+            max_retries: Upload attempts before giving up
+            retry_delay: Seconds before the first retry; doubles after each
+            sleep: Used to wait between attempts
+        """
+        self.logger = get_logger(__name__)
+        self.client = client
+        self.instrument = get_instrument(instrument)
+        self.dataset = dataset
+        self.staging_dir = staging_dir
+        self.manifest_path = manifest_path
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+
+    @property
+    def csv_filename(self) -> str:
+        return self.instrument.csv_filename
+
+    @property
+    def csv_path(self) -> str:
+        return os.path.join(DATA_DIR, self.csv_filename)
+
+    def artifact_names(self) -> List[str]:
+        """Files staged next to the CSV; Parquet only if pyarrow can write it."""
+        stem = os.path.splitext(self.csv_filename)[0]
+        names = [f"{stem}.csv.gz"]
+        if importlib.util.find_spec('pyarrow') is not None:
+            names.append(f"{stem}.parquet")
+        return names
+
+    def metadata(self) -> Dict[str, Any]:
+        """Kaggle dataset metadata describing the staged files."""
+        stem = os.path.splitext(self.csv_filename)[0]
+        descriptions = {
+            self.csv_filename: "Daily EUR/IRR exchange rates with OHLC data from 2011 to present",
+            f"{stem}.csv.gz": f"{self.csv_filename}, gzip-compressed",
+            f"{stem}.parquet": f"{self.csv_filename} as typed Parquet (integer prices, date column, oldest first)"
+        }
+        names = [self.csv_filename] + self.artifact_names()
+        return {
+            "title": KAGGLE_TITLE,
+            "id": self.dataset,
+            "licenses": [{"name": "MIT"}],
+            "resources": [{"path": name, "description": descriptions[name]} for name in names]
+        }
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """Return the manifest of the last upload, or None if there is none."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def sources(self) -> Dict[str, str]:
+        """Hashes of what determines the upload: the CSV, the metadata and the staged file set."""
+        metadata = json.dumps(self.metadata(), sort_keys=True).encode('utf-8')
+        return {
+            self.csv_filename: _sha256(self.csv_path),
+            METADATA_FILENAME: hashlib.sha256(metadata).hexdigest()
+        }
+
+    def changed(self, sources: Optional[Dict[str, str]] = None) -> bool:
+        """Whether the dataset differs from the last upload."""
+        manifest = self.manifest()
+        sources = sources or self.sources()
+        return manifest is None or manifest.get('dataset') != self.dataset or manifest.get('sources') != sources
+
+    def _write_parquet(self, path: str):
+        from .data_manager import DataManager
+        DataManager(self.instrument).load_frame().to_parquet(path, index=False)
+
+    def stage(self) -> Dict[str, Dict[str, Any]]:
+        """Assemble the upload in the staging folder; returns each file's hash and size."""
+        if os.path.exists(self.staging_dir):
+            shutil.rmtree(self.staging_dir)
+        os.makedirs(self.staging_dir)
+
+        stem = os.path.splitext(self.csv_filename)[0]
+        shutil.copyfile(self.csv_path, os.path.join(self.staging_dir, self.csv_filename))
+        for name in self.artifact_names():
+            path = os.path.join(self.staging_dir, name)
+            if name == f"{stem}.csv.gz":
+                # mtime=0 keeps the output identical for identical content
+                with open(self.csv_path, 'rb') as source, open(path, 'wb') as target, \
+                        gzip.GzipFile(filename='', mode='wb', fileobj=target, compresslevel=9, mtime=0) as gz:
+                    shutil.copyfileobj(source, gz, 1024 * 1024)
+            else:
+                self._write_parquet(path)
+        with open(os.path.join(self.staging_dir, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(self.metadata(), f, indent=2)
+
+        files = {}
+        for name in sorted(os.listdir(self.staging_dir)):
+            path = os.path.join(self.staging_dir, name)
+            files[name] = {'sha256': _sha256(path), 'bytes': os.path.getsize(path)}
+        metrics.count('kaggle_bytes_staged', sum(entry['bytes'] for entry in files.values()))
+        return files
+
+    def _upload(self, notes: str):
+        """Upload the staging folder, retrying with exponential backoff."""
+        if self.client is None:
+            self.client = KaggleClient()
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with metrics.span('kaggle_upload', attempt=attempt):
+                    return self.client.create_version(self.staging_dir, notes)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                metrics.count('retries', backend='kaggle')
+                self.logger.warning(f"Kaggle upload failed (attempt {attempt}/{self.max_retries}): {e}; "
+                                    f"retrying in {delay:g}s")
+                self._sleep(delay)
+
+    def publish(self, notes: str, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Upload a new version if the dataset changed since the last upload.
+
+        Args:
+            notes: Version notes
+            force: Upload even if nothing changed
+            dry_run: Stage the files but neither upload nor update the manifest
+
+        Returns a dict with status ('unchanged', 'staged' or 'published')
+        and, unless unchanged, the staged files.
+        """
+        sources = self.sources()
+        if not force and not self.changed(sources):
+            self.logger.info(f"{self.csv_filename} unchanged since the last upload, skipping Kaggle")
+            metrics.count('kaggle_skipped')
+            return {'status': 'unchanged', 'sources': sources}
+
+        files = self.stage()
+        total = sum(entry['bytes'] for entry in files.values())
+        if dry_run:
+            self.logger.info(f"Staged {len(files)} files ({total} bytes) in {self.staging_dir}")
+            return {'status': 'staged', 'sources': sources, 'files': files}
+
+        self._upload(notes)
+        self._save_manifest({
+            'version': MANIFEST_VERSION,
+            'dataset': self.dataset,
+            'published': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'notes': notes,
+            'sources': sources,
+            'files': files
+        })
+        self.logger.info(f"Published {len(files)} files ({total} bytes) to {self.dataset}")
+        return {'status': 'published', 'sources': sources, 'files': files}
@@ -0,0 +1,65 @@
+"""Adaptive request pacing for the scraper."""
+
+import time
+import threading
+from typing import Callable
+
+from .config import (
+    RATE_LIMIT_MIN_INTERVAL, RATE_LIMIT_MAX_INTERVAL, RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_RECOVERY, RETRY_DELAY
+)
+
+
+class RateLimiter:
+    """
+    Keeps a minimum interval between requests.
+
+    The interval grows by `backoff` after each failure (starting from at
+    least RETRY_DELAY) and shrinks by `recovery` after each success until it
+    is back at `min_interval`. Time already spent waiting for a response
+    counts towards the interval, so fast pages are not slowed down further.
+
+    One limiter can be shared by threads scraping the same host: each call
+    to wait() reserves the next free slot, so the requests of all threads
+    together keep the interval.
+    """
+
+    def __init__(self, min_interval: float = RATE_LIMIT_MIN_INTERVAL,
+                 max_interval: float = RATE_LIMIT_MAX_INTERVAL,
+                 backoff: float = RATE_LIMIT_BACKOFF,
+                 recovery: float = RATE_LIMIT_RECOVERY,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.recovery = recovery
+        self.interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._last_request = None
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """Sleep until the current interval has passed since the last request."""
+        with self._lock:
+            now = self._clock()
+            slot = now
+            if self._last_request is not None:
+                slot = max(now, self._last_request + self.interval)
+            self._last_request = slot
+
+        slept = slot - now
+        if slept > 0:
+            self._sleep(slept)
+        return slept
+
+    def success(self):
+        """Record a successful request and relax the interval."""
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval * self.recovery)
+
+    def failure(self):
+        """Record a failed request and back off."""
+        with self._lock:
+            self.interval = min(self.max_interval, max(self.interval * self.backoff, RETRY_DELAY))
@@ -0,0 +1,155 @@
+"""Read-only, memory-mapped access to the dataset's columnar store."""
+
+import os
+from datetime import date, datetime
+from typing import Dict, Any, Optional, Union
+
+import numpy as np
+
+from .config import DATA_DIR
+from .columnar import ColumnarStore
+from .instruments import Instrument, get_instrument
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def store_path(instrument: Union[str, Instrument, None] = None) -> str:
+    """Columnar store directory DataManager maintains for an instrument."""
+    return os.path.join(DATA_DIR, os.path.splitext(get_instrument(instrument).csv_filename)[0] + '.columns')
+
+
+DEFAULT_STORE_PATH = store_path()
+
+
+def to_datetime64(value: DateLike) -> np.datetime64:
+    """Convert 'YYYY/MM/DD', 'YYYY-MM-DD', date/datetime or datetime64 to datetime64[D]."""
+    if isinstance(value, str):
+        value = value.strip().replace('/', '-')
+    elif isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+class Dataset:
+    """
+    Date-indexed view over the columnar store.
+
+    Columns are read-only NumPy arrays sorted oldest first. When opened
+    with mmap=True they are views of the page cache, so slicing a date range
+    only touches the pages it covers and processes share one copy.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any], path: Optional[str] = None):
+        self._columns = columns
+        self.meta = meta
+        self.path = path
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._columns["gregorian_date"]
+
+    @property
+    def persian_dates(self) -> np.ndarray:
+        return self._columns["persian_date"]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._columns["open_price"]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._columns["low_price"]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._columns["high_price"]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._columns["close_price"]
+
+    @property
+    def change_amount(self) -> np.ndarray:
+        return self._columns["change_amount"]
+
+    @property
+    def change_percent(self) -> np.ndarray:
+        return self._columns["change_percent"]
+
+    @property
+    def version(self) -> tuple:
+        """Identifies the store contents this view was opened from."""
+        return (self.meta.get('rows'), self.meta.get('latest_date'),
+                tuple(self.meta.get('source_signature') or ()))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def column(self, key: str) -> np.ndarray:
+        """Return a column by its COLUMN_MAPPING key."""
+        if key not in self._columns:
+            raise KeyError(f"Unknown column: {key}")
+        return self._columns[key]
+
+    def bounds(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> tuple:
+        """Row positions [lo, hi) of the dates between start and end (inclusive)."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, to_datetime64(start), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, to_datetime64(end), side='right'))
+        return lo, max(lo, hi)
+
+    def _view(self, lo: int, hi: int) -> 'Dataset':
+        return Dataset({key: values[lo:hi] for key, values in self._columns.items()}, self.meta, self.path)
+
+    def slice(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> 'Dataset':
+        """Return the rows between start and end (inclusive) without copying."""
+        return self._view(*self.bounds(start, end))
+
+    def last(self, n: int) -> 'Dataset':
+        """Return the latest n rows without copying."""
+        return self._view(max(0, len(self) - n), len(self))
+
+    def get(self, day: DateLike) -> Optional[Dict[str, Any]]:
+        """Return one day's values, or None if the date is not in the dataset."""
+        lo, hi = self.bounds(day, day)
+        if lo == hi:
+            return None
+        return {key: values[lo].item() for key, values in self._columns.items()}
+
+    def is_stale(self) -> bool:
+        """Check whether the store on disk has changed since this view was opened."""
+        if self.path is None:
+            return False
+        meta = ColumnarStore(self.path).meta()
+        return meta is None or (meta.get('rows'), meta.get('latest_date'),
+                                tuple(meta.get('source_signature') or ())) != self.version
+
+    def to_frame(self):
+        """Copy the view into a DataFrame with the CSV headers."""
+        return ColumnarStore(self.path or DEFAULT_STORE_PATH).to_frame(self._columns)
+
+
+def open_dataset(path: Optional[str] = None, mmap: bool = True,
+                 instrument: Union[str, Instrument, None] = None) -> Dataset:
+    """
+    Open the dataset's columnar store.
+
+    Args:
+        path: Store directory (defaults to the one DataManager maintains)
+        mmap: Map the column files instead of reading them into memory
+        instrument: Instrument whose store to open (defaults to EUR)
+
+    The store is built from the CSV through DataManager if it is missing.
+    """
+    default_path = store_path(instrument)
+    path = path or default_path
+    store = ColumnarStore(path)
+
+    if store.meta() is None:
+        if path != default_path:
+            raise FileNotFoundError(f"No columnar store at {path}")
+        from .data_manager import DataManager
+        DataManager(instrument).load_columns(mmap=False)
+
+    meta = store.meta()
+    columns = store.read(mmap=mmap, meta=meta)
+    return Dataset(columns, meta, path)
@@ -0,0 +1,229 @@
+"""OHLC rollups of the daily data: weekly, monthly, quarterly and Persian-calendar months and years."""
+
+import os
+import json
+import bisect
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .columnar import MISSING_PRICE
+
+ROLLUP_VERSION = 2
+
+# Stored row layout, also the keys of the rows returned by queries
+FIELDS = ["period", "open", "high", "low", "close", "first_date", "last_date", "count"]
+
+# 1970-01-01 was a Thursday; Iranian weeks start on Saturday (2 days later)
+_SATURDAY_OFFSET = 2
+
+
+def _fill_invalid(persian: np.ndarray) -> np.ndarray:
+    """Replace unparseable Persian dates (0) with the previous valid one."""
+    persian = np.asarray(persian, dtype=np.int64)
+    valid = persian > 0
+    if valid.all() or not valid.any():
+        return persian
+    positions = np.maximum.accumulate(np.where(valid, np.arange(len(persian)), 0))
+    filled = persian[positions]
+    # Leading invalid dates take the first valid one
+    filled[:np.argmax(valid)] = persian[np.argmax(valid)]
+    return filled
+
+
+def _format_days(days: np.ndarray) -> List[str]:
+    return [str(d) for d in days.astype('datetime64[D]')]
+
+
+def period_keys(timeframe: str, dates: np.ndarray, persian: np.ndarray) -> List[str]:
+    """
+    Period labels for each bar:
+
+    - week: date of the Saturday the week starts on (YYYY-MM-DD)
+    - month: YYYY-MM
+    - quarter: YYYY-Qn
+    - persian_month: YYYY/MM (Persian calendar)
+    - persian_year: YYYY (Persian calendar)
+    """
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+    if timeframe == 'week':
+        return _format_days(days - (days - _SATURDAY_OFFSET) % 7)
+    if timeframe == 'month':
+        return [str(m) for m in days.astype('datetime64[D]').astype('datetime64[M]')]
+    if timeframe == 'quarter':
+        months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        return [f"{1970 + m // 12}-Q{m % 12 // 3 + 1}" for m in months]
+    if timeframe == 'persian_month':
+        return [f"{p // 10000:04d}/{p // 100 % 100:02d}" for p in _fill_invalid(persian)]
+    if timeframe == 'persian_year':
+        return [f"{p // 10000:04d}" for p in _fill_invalid(persian)]
+    raise ValueError(f"Unknown timeframe: {timeframe}")
+
+
+TIMEFRAMES = ['week', 'month', 'quarter', 'persian_month', 'persian_year']
+
+
+def _aggregate(keys: List[str], dates: np.ndarray, opens: np.ndarray, highs: np.ndarray,
+               lows: np.ndarray, closes: np.ndarray) -> List[list]:
+    """Aggregate date-sorted bars into one row per run of equal keys."""
+    if not keys:
+        return []
+    labels = np.asarray(keys)
+    starts = np.concatenate(([0], np.flatnonzero(labels[1:] != labels[:-1]) + 1))
+    ends = np.concatenate((starts[1:], [len(labels)])) - 1
+
+    # Missing prices are skipped; a period with none of a price keeps MISSING_PRICE
+    positions = np.arange(len(labels))
+    first_open = np.minimum.reduceat(np.where(opens == MISSING_PRICE, len(labels), positions), starts)
+    last_close = np.maximum.reduceat(np.where(closes == MISSING_PRICE, -1, positions), starts)
+    open_ = np.where(first_open <= ends, opens[np.minimum(first_open, ends)], MISSING_PRICE)
+    close = np.where(last_close >= starts, closes[np.maximum(last_close, starts)], MISSING_PRICE)
+    high = np.fmax.reduceat(np.where(highs == MISSING_PRICE, np.nan, highs), starts)
+    low = np.fmin.reduceat(np.where(lows == MISSING_PRICE, np.nan, lows), starts)
+    high, low = (np.where(np.isnan(v), MISSING_PRICE, v) for v in (high, low))
+
+    first_dates = _format_days(dates[starts])
+    last_dates = _format_days(dates[ends])
+    return [
+        [keys[s], int(o), int(h), int(l), int(c), first, last, int(e - s + 1)]
+        for s, e, o, h, l, c, first, last in zip(starts, ends, open_, high, low, close, first_dates, last_dates)
+    ]
+
+
+class RollupTables:
+    """
+    Rollup tables for every timeframe, kept as lists of rows (FIELDS order)
+    sorted by period.
+
+    New days after `last_date` only touch the last row of each table (or
+    start a new one), so appending a day costs O(1) per timeframe.
+    """
+
+    def __init__(self):
+        self.tables = {timeframe: [] for timeframe in TIMEFRAMES}
+        self.last_date = None
+        self.count = 0
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> 'RollupTables':
+        """Build every table from typed columns (as stored by ColumnarStore)."""
+        rollups = cls()
+        order = np.argsort(columns['gregorian_date'], kind='stable')
+        dates = np.asarray(columns['gregorian_date'])[order]
+        persian = np.asarray(columns['persian_date'])[order]
+        opens, highs, lows, closes = (np.asarray(columns[key])[order]
+                                      for key in ('open_price', 'high_price', 'low_price', 'close_price'))
+
+        for timeframe in TIMEFRAMES:
+            keys = period_keys(timeframe, dates, persian)
+            rollups.tables[timeframe] = _aggregate(keys, dates, opens, highs, lows, closes)
+
+        rollups.count = len(dates)
+        rollups.last_date = str(dates[-1]) if len(dates) else None
+        return rollups
+
+    def update(self, bar: Dict[str, Any]):
+        """
+        Add one day, newer than every day seen so far. Missing prices
+        (MISSING_PRICE) leave the period's values as they are.
+
+        Args:
+            bar: Dict with 'date' (YYYY-MM-DD), 'persian_date' (YYYYMMDD),
+                 'open', 'high', 'low', 'close'
+        """
+        date = str(bar['date']).replace('/', '-')
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Bar {date} is not after the last bar {self.last_date}")
+
+        open_, high, low, close = (int(bar[key]) for key in ('open', 'high', 'low', 'close'))
+        dates = np.array([date], dtype='datetime64[D]')
+        persian = np.array([int(bar.get('persian_date') or 0)])
+
+        for timeframe, rows in self.tables.items():
+            if timeframe.startswith('persian') and persian[0] <= 0 and rows:
+                # Unparseable Persian date: the day stays in the current period
+                key = rows[-1][0]
+            else:
+                key = period_keys(timeframe, dates, persian)[0]
+
+            if rows and rows[-1][0] == key:
+                row = rows[-1]
+                if row[1] == MISSING_PRICE:
+                    row[1] = open_
+                if high != MISSING_PRICE:
+                    row[2] = high if row[2] == MISSING_PRICE else max(row[2], high)
+                if low != MISSING_PRICE:
+                    row[3] = low if row[3] == MISSING_PRICE else min(row[3], low)
+                if close != MISSING_PRICE:
+                    row[4] = close
+                row[6] = date
+                row[7] += 1
+            else:
+                rows.append([key, open_, high, low, close, date, date, 1])
+
+        self.last_date = date
+        self.count += 1
+
+    def update_columns(self, columns: Dict[str, np.ndarray]):
+        """Add days from typed columns in date order."""
+        keys = ('gregorian_date', 'persian_date', 'open_price', 'high_price', 'low_price', 'close_price')
+        order = np.argsort(columns['gregorian_date'], kind='stable')
+        for date, persian, open_, high, low, close in zip(*(np.asarray(columns[key])[order] for key in keys)):
+            self.update({'date': str(date), 'persian_date': persian,
+                         'open': open_, 'high': high, 'low': low, 'close': close})
+
+    def query(self, timeframe: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of one timeframe whose periods overlap [start, end] (Gregorian
+        dates, YYYY-MM-DD or YYYY/MM/DD, both optional), oldest first.
+        """
+        if timeframe not in self.tables:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        rows = self.tables[timeframe]
+
+        lo, hi = 0, len(rows)
+        if start is not None:
+            # Periods are sorted, so their last dates are too
+            lo = bisect.bisect_left([row[6] for row in rows], str(start).replace('/', '-'))
+        if end is not None:
+            hi = bisect.bisect_right([row[5] for row in rows], str(end).replace('/', '-'))
+        return [dict(zip(FIELDS, row)) for row in rows[lo:max(lo, hi)]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': ROLLUP_VERSION,
+            'last_date': self.last_date,
+            'count': self.count,
+            'fields': FIELDS,
+            'tables': self.tables
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RollupTables':
+        if data.get('version') != ROLLUP_VERSION or data.get('fields') != FIELDS:
+            raise ValueError(f"Unsupported rollup version: {data.get('version')}")
+
+        rollups = cls()
+        rollups.tables.update({timeframe: [list(row) for row in rows]
+                               for timeframe, rows in data['tables'].items()})
+        rollups.last_date = data['last_date']
+        rollups.count = data['count']
+        return rollups
+
+    def save(self, path: str):
+        """Write the tables as JSON through a temporary file and an atomic rename."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['RollupTables']:
+        """Load saved tables, or return None if the file is missing or unreadable."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
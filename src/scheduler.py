@@ -0,0 +1,95 @@
+"""Runs the scraper for several instruments concurrently."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Optional, Union, Callable
+
+from .config import FETCH_BACKEND, SCHEDULER_MAX_WORKERS, BACKFILL_WORKERS
+from .logging_config import get_logger
+from .rate_limiter import RateLimiter
+from .instruments import Instrument, get_instrument
+
+
+class Scheduler:
+    """
+    Scrapes a set of instruments on a bounded thread pool.
+
+    Each instrument gets its own scraper, session and store. The workers
+    share one RateLimiter, since every instrument is served by the same
+    host, so overlapping jobs hide each other's latency without raising the
+    request rate.
+    """
+
+    def __init__(self, instruments: List[Union[str, Instrument]],
+                 max_workers: int = SCHEDULER_MAX_WORKERS,
+                 backend: str = FETCH_BACKEND,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 scraper_factory: Optional[Callable] = None,
+                 backfill: bool = False,
+                 backfill_workers: int = BACKFILL_WORKERS,
+                 repair_gaps: bool = False):
+        """
+        Args:
+            instruments: Instrument keys or definitions to scrape
+            max_workers: Maximum number of instruments scraped at once
+            backend: Fetch backend passed to each scraper
+            rate_limiter: Pacing shared by all workers
+            scraper_factory: Builds a scraper for an instrument (defaults to EuroScraper)
+            backfill: Rebuild each dataset with a parallel backfill instead
+                of an incremental update
+            backfill_workers: Parallel page ranges per backfill
+            repair_gaps: Fill missing trading days in each dataset instead of
+                an incremental update
+        """
+        self.logger = get_logger(__name__)
+        self.instruments = [get_instrument(instrument) for instrument in instruments]
+        self.max_workers = max(1, min(max_workers, len(self.instruments) or 1))
+        self.backend = backend
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.scraper_factory = scraper_factory or self._default_factory
+        self.backfill = backfill
+        self.backfill_workers = backfill_workers
+        self.repair_gaps = repair_gaps
+
+    def _default_factory(self, instrument: Instrument):
+        from .scraper import EuroScraper
+        return EuroScraper(backend=self.backend, rate_limiter=self.rate_limiter, instrument=instrument)
+
+    def _run_one(self, instrument: Instrument) -> bool:
+        self.logger.info(f"[{instrument.key}] Starting {instrument.name}")
+        try:
+            scraper = self.scraper_factory(instrument)
+            if self.backfill:
+                return bool(scraper.backfill(self.backfill_workers))
+            if self.repair_gaps:
+                return bool(scraper.repair_gaps())
+            return bool(scraper.run())
+        except Exception as e:
+            self.logger.error(f"[{instrument.key}] Scraper failed: {e}")
+            return False
+
+    def run(self) -> Dict[str, bool]:
+        """Scrape every instrument; returns success by instrument key."""
+        start_time = datetime.now()
+        results = {}
+        
+        if self.backend == 'selenium':
+            # Start the browsers while the first jobs are being set up
+            from .driver_pool import get_default_pool
+            threading.Thread(target=get_default_pool().warm, args=(self.max_workers,), daemon=True).start()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper") as executor:
+            futures = {executor.submit(self._run_one, instrument): instrument for instrument in self.instruments}
+            for future in as_completed(futures):
+                instrument = futures[future]
+                results[instrument.key] = future.result()
+                status = "done" if results[instrument.key] else "FAILED"
+                self.logger.info(f"[{instrument.key}] {status}")
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        succeeded = sum(results.values())
+        self.logger.info(f"Scraped {succeeded}/{len(results)} instruments in {elapsed:.1f}s "
+                         f"with {self.max_workers} workers")
+        # Report in the order the instruments were given
+        return {instrument.key: results[instrument.key] for instrument in self.instruments}
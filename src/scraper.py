@@ -1,73 +1,129 @@
-"""Main scraper module for extracting EUR/IRR exchange rate data."""
+"""Main scraper module for extracting exchange rate and gold price history from tgju.org."""
 
-import time
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Union, Tuple, TYPE_CHECKING
 import logging
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-
 from .config import (
-    BASE_URL, CHROME_OPTIONS, TABLE_SELECTOR, NEXT_BUTTON_SELECTOR, 
-    PAGINATION_INFO_SELECTOR, MAX_RETRIES, RETRY_DELAY, COLUMN_MAPPING
+    TABLE_SELECTOR, NEXT_BUTTON_SELECTOR,
+    PAGINATION_INFO_SELECTOR, MAX_RETRIES, COLUMN_MAPPING,
+    DEFAULT_PAGE_SIZE, PAGE_LENGTH, FETCH_BACKEND, DATATABLE_SELECTOR,
+    PAGE_WAIT_TIMEOUT, BACKFILL_WORKERS, BACKFILL_OVERLAP, GAP_MIN_MISSING_DAYS,
+    SEEK_MAX_PAGE_LOADS
 )
 from .utils import (
-    setup_logging, clean_price_text, clean_change_text, parse_date,
+    clean_price_text, clean_change_text, parse_date,
     extract_pagination_info, validate_row_data, format_progress
 )
 from .data_manager import DataManager
+from .fetcher import HttpFetcher, FetchError
+from .rate_limiter import RateLimiter
+from .instruments import Instrument, get_instrument
+from .journal import PageJournal
+from .logging_config import get_logger
+from .metrics import metrics
+
+# Selenium is imported inside the browser-backend methods, so HTTP-only
+# and data-only callers never load it (or webdriver_manager)
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from .driver_pool import DriverPool
+
+
+# Returns the cell texts of every row matching arguments[0] as a list of string arrays
+EXTRACT_ROWS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(function (row) {
+    return Array.from(row.querySelectorAll('td')).map(function (cell) {
+        return (cell.innerText || cell.textContent || '').trim();
+    });
+});
+"""
+
+# Shows the page holding row offset arguments[1]; returns that page's first offset or -1
+GO_TO_OFFSET_SCRIPT = """
+if (!window.jQuery || !jQuery.fn.dataTable || !jQuery.fn.dataTable.isDataTable(arguments[0])) {
+    return -1;
+}
+var table = jQuery(arguments[0]).DataTable();
+var page = Math.floor(arguments[1] / table.page.len());
+table.page(page).draw('page');
+return page * table.page.len();
+"""
+
+# Sets the DataTables page length and redraws; returns the applied length or -1
+SET_PAGE_LENGTH_SCRIPT = """
+if (!window.jQuery || !jQuery.fn.dataTable || !jQuery.fn.dataTable.isDataTable(arguments[0])) {
+    return -1;
+}
+var table = jQuery(arguments[0]).DataTable();
+table.page.len(arguments[1]).draw(false);
+return table.page.len();
+"""
 
 
 class EuroScraper:
-    """Main scraper class for extracting EUR/IRR exchange rate data."""
+    """Main scraper class for extracting an instrument's price history (EUR/IRR by default)."""
     
-    def __init__(self):
-        self.logger = setup_logging()
+    def __init__(self, backend: str = FETCH_BACKEND, fetcher: Optional[HttpFetcher] = None,
+                 page_length: int = PAGE_LENGTH, rate_limiter: Optional[RateLimiter] = None,
+                 instrument: Union[str, Instrument, None] = None,
+                 driver_pool: Optional['DriverPool'] = None):
+        """
+        Args:
+            backend: "http" to read the table endpoint directly (with Selenium
+                as fallback) or "selenium" to always drive Chrome
+            fetcher: Optional pre-configured HttpFetcher for the HTTP backend
+            page_length: Rows to request per page on full scrapes
+            rate_limiter: Pacing between page requests (may be shared)
+            instrument: Instrument key or definition to scrape (defaults to EUR)
+            driver_pool: Browsers for the Selenium backend (defaults to the
+                process-wide pool)
+        """
+        if backend not in ('http', 'selenium'):
+            raise ValueError(f"Unknown fetch backend: {backend}")
+        
+        self.logger = get_logger(__name__)
+        self.instrument = get_instrument(instrument)
+        self.backend = backend
+        self.fetcher = fetcher
+        self.page_length = max(page_length, DEFAULT_PAGE_SIZE)
+        self.rate_limiter = rate_limiter or RateLimiter()
         self.driver = None
-        self.data_manager = DataManager()
+        self._leased_driver = None
+        self.driver_pool = driver_pool
+        self.data_manager = DataManager(self.instrument)
         self.scraped_data = []
+        self.total_records = 0
         self.start_time = None
+        self.page_loads = 0
         
-    def _setup_driver(self) -> webdriver.Chrome:
-        """Setup Chrome driver with options"""
-        chrome_options = Options()
-        for option in CHROME_OPTIONS:
-            chrome_options.add_argument(option)
+    def _setup_driver(self) -> 'webdriver.Chrome':
+        """Lease a warm Chrome driver, in a fresh tab, from the driver pool."""
+        from .driver_pool import get_default_pool
         
-        try:
-            # Use ChromeDriverManager to ensure we get the correct version
-            self.logger.info("====== WebDriver manager ======")
-            driver_path = ChromeDriverManager().install()
-            self.logger.info(f"Using ChromeDriver at: {driver_path}")
-            
-            service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Log successful initialization
-            self.logger.info("Chrome driver initialized successfully")
-            return driver
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Chrome driver: {str(e)}")
-            # Try fallback without service (system chromedriver)
-            try:
-                self.logger.info("Attempting fallback to system ChromeDriver")
-                driver = webdriver.Chrome(options=chrome_options)
-                self.logger.info("Fallback Chrome driver initialized successfully")
-                return driver
-            except Exception as fallback_error:
-                self.logger.error(f"Fallback also failed: {str(fallback_error)}")
-                raise RuntimeError(f"Failed to initialize Chrome driver: {str(e)}")
+        if self.driver_pool is None:
+            self.driver_pool = get_default_pool()
+        with metrics.span('driver_setup', instrument=self.instrument.key):
+            self._leased_driver = self.driver_pool.acquire()
+        self.logger.info("Chrome driver ready")
+        return metrics.count_calls(self._leased_driver, 'webdriver_calls', instrument=self.instrument.key)
+    
+    def _release_driver(self):
+        """Return the leased driver to the pool, which keeps the browser running."""
+        if self.driver:
+            self.driver_pool.release(self._leased_driver)
+            self.driver = None
+            self._leased_driver = None
+            self.logger.info("Chrome driver released")
     
     def _wait_for_element(self, selector: str, timeout: int = 10):
         """Wait for element to be present and return it."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             wait = WebDriverWait(self.driver, timeout)
             return wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
@@ -75,67 +131,97 @@ class EuroScraper:
             self.logger.error(f"Timeout waiting for element: {selector}")
             return None
     
+    def _row_from_cells(self, cells: List[str]) -> Optional[Dict[str, Any]]:
+        """Clean and validate the cell texts of one table row."""
+        if len(cells) < 8:
+            self.logger.warning("Row has insufficient cells: %d", len(cells))
+            return None
+        
+        # Extract data according to the table structure
+        row_data = {
+            COLUMN_MAPPING["open_price"]: clean_price_text(cells[0]),
+            COLUMN_MAPPING["low_price"]: clean_price_text(cells[1]),
+            COLUMN_MAPPING["high_price"]: clean_price_text(cells[2]),
+            COLUMN_MAPPING["close_price"]: clean_price_text(cells[3]),
+            COLUMN_MAPPING["change_amount"]: clean_change_text(cells[4]),
+            COLUMN_MAPPING["change_percent"]: clean_change_text(cells[5]),
+            COLUMN_MAPPING["gregorian_date"]: parse_date(cells[6]),
+            COLUMN_MAPPING["persian_date"]: (cells[7] or '').strip()
+        }
+        
+        if validate_row_data(row_data):
+            return row_data
+        
+        self.logger.warning("Invalid row data: %s", row_data)
+        return None
+    
+    def _parse_rows(self, raw_rows: List[List[str]]) -> List[Dict[str, Any]]:
+        """Clean and validate a page of raw cell texts, dropping invalid rows."""
+        page_data = []
+        with metrics.span('page_validate', instrument=self.instrument.key, rows=len(raw_rows)):
+            for raw_row in raw_rows:
+                row_data = self._row_from_cells(raw_row)
+                if row_data:
+                    page_data.append(row_data)
+        metrics.count('invalid_rows', len(raw_rows) - len(page_data), instrument=self.instrument.key)
+        return page_data
+    
     def _extract_row_data(self, row_element) -> Optional[Dict[str, Any]]:
         """Extract data from a table row element."""
+        from selenium.webdriver.common.by import By
+        
         try:
             cells = row_element.find_elements(By.TAG_NAME, "td")
-            
-            if len(cells) < 8:
-                self.logger.warning(f"Row has insufficient cells: {len(cells)}")
-                return None
-            
-            # Extract data according to the table structure
-            open_price = clean_price_text(cells[0].text)
-            low_price = clean_price_text(cells[1].text)
-            high_price = clean_price_text(cells[2].text)
-            close_price = clean_price_text(cells[3].text)
-            change_amount = clean_change_text(cells[4].text)
-            change_percent = clean_change_text(cells[5].text)
-            gregorian_date = parse_date(cells[6].text)
-            persian_date = cells[7].text.strip()
-            
-            row_data = {
-                COLUMN_MAPPING["open_price"]: open_price,
-                COLUMN_MAPPING["low_price"]: low_price,
-                COLUMN_MAPPING["high_price"]: high_price,
-                COLUMN_MAPPING["close_price"]: close_price,
-                COLUMN_MAPPING["change_amount"]: change_amount,
-                COLUMN_MAPPING["change_percent"]: change_percent,
-                COLUMN_MAPPING["gregorian_date"]: gregorian_date,
-                COLUMN_MAPPING["persian_date"]: persian_date
-            }
-            
-            if validate_row_data(row_data):
-                return row_data
-            else:
-                self.logger.warning(f"Invalid row data: {row_data}")
-                return None
-                
+            return self._row_from_cells([cell.text for cell in cells])
         except Exception as e:
-            self.logger.error(f"Error extracting row data: {e}")
+            self.logger.error("Error extracting row data: %s", e)
             return None
     
     def _scrape_current_page(self) -> List[Dict[str, Any]]:
         """Scrape data from the current page."""
+        from selenium.common.exceptions import WebDriverException
+        
+        page_data = []
+        
+        try:
+            # Read every row of the table body in a single round trip
+            with metrics.span('page_extract', instrument=self.instrument.key, backend='selenium'):
+                raw_rows = self.driver.execute_script(EXTRACT_ROWS_SCRIPT, TABLE_SELECTOR)
+        except WebDriverException as e:
+            self.logger.warning(f"Bulk row extraction failed ({e}), reading rows one by one")
+            return self._scrape_current_page_by_element()
+        
+        if not raw_rows:
+            self.logger.warning("No table rows found on current page")
+            return page_data
+        
+        self.logger.info("Found %d rows on current page", len(raw_rows))
+        
+        page_data = self._parse_rows(raw_rows)
+        
+        self.logger.info("Successfully extracted %d valid rows from current page", len(page_data))
+        
+        return page_data
+    
+    def _scrape_current_page_by_element(self) -> List[Dict[str, Any]]:
+        """Scrape the current page by querying each row element separately."""
+        from selenium.webdriver.common.by import By
+        
         page_data = []
         
         try:
-            # Wait for table to load
             table_rows = self.driver.find_elements(By.CSS_SELECTOR, TABLE_SELECTOR)
             
             if not table_rows:
                 self.logger.warning("No table rows found on current page")
                 return page_data
             
-            self.logger.info(f"Found {len(table_rows)} rows on current page")
-            
-            for i, row in enumerate(table_rows):
+            for row in table_rows:
                 row_data = self._extract_row_data(row)
                 if row_data:
                     page_data.append(row_data)
-                    self.logger.debug(f"Extracted row {i+1}: {row_data[COLUMN_MAPPING['gregorian_date']]}")
             
-            self.logger.info(f"Successfully extracted {len(page_data)} valid rows from current page")
+            self.logger.info("Successfully extracted %d valid rows from current page", len(page_data))
             
         except Exception as e:
             self.logger.error(f"Error scraping current page: {e}")
@@ -156,6 +242,9 @@ class EuroScraper:
     
     def _has_next_page(self) -> bool:
         """Check if there's a next page available."""
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+        
         try:
             next_button = self.driver.find_element(By.CSS_SELECTOR, NEXT_BUTTON_SELECTOR)
             # Check if button is disabled
@@ -167,27 +256,133 @@ class EuroScraper:
             self.logger.error(f"Error checking next page: {e}")
             return False
     
-    def _click_next_page(self) -> bool:
-        """Click the next page button."""
+    def _table_state(self):
+        """Return the first table row element and the pagination info text."""
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+        
         try:
-            next_button = self._wait_for_element(NEXT_BUTTON_SELECTOR, timeout=10)
-            if next_button and "disabled" not in next_button.get_attribute("class").lower():
-                self.driver.execute_script("arguments[0].click();", next_button)
+            first_row = self.driver.find_element(By.CSS_SELECTOR, TABLE_SELECTOR)
+        except NoSuchElementException:
+            first_row = None
+        
+        try:
+            info_text = self.driver.find_element(By.CSS_SELECTOR, PAGINATION_INFO_SELECTOR).text
+        except NoSuchElementException:
+            info_text = ''
+        
+        return first_row, info_text
+    
+    def _wait_for_redraw(self, old_row, old_info: str, timeout: int = PAGE_WAIT_TIMEOUT) -> bool:
+        """
+        Wait until the table has been redrawn.
+        
+        DataTables replaces the body rows on every draw, so the previous
+        first row going stale (or the pagination text changing) means the
+        new page is in the DOM.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, NoSuchElementException
+        
+        def redrawn(driver):
+            if old_row is not None and EC.staleness_of(old_row)(driver):
+                return True
+            try:
+                info_text = driver.find_element(By.CSS_SELECTOR, PAGINATION_INFO_SELECTOR).text
+            except NoSuchElementException:
+                return False
+            return bool(old_info) and info_text != old_info
+        
+        try:
+            WebDriverWait(self.driver, timeout).until(redrawn)
+            return True
+        except TimeoutException:
+            self.logger.error("Timeout waiting for the table to redraw")
+            return False
+    
+    def _page_moved(self, old_start: int, old_row) -> bool:
+        """Whether the table has left the page starting at row `old_start` (first row `old_row`)."""
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        start = self._get_pagination_info().get('start')
+        if old_start and start:
+            return start != old_start
+        return old_row is not None and EC.staleness_of(old_row)(self.driver)
+    
+    def _click_next_page(self) -> bool:
+        """
+        Click the next page button and wait for the new page to render.
+        
+        Before clicking again, a retry re-reads the page offset: a click
+        whose redraw outlasted the wait has still moved the table, and a
+        second click would skip a page.
+        """
+        old_start = self._get_pagination_info().get('start')
+        old_row, old_info = self._table_state()
+        
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                if attempt > 1 and self._page_moved(old_start, old_row):
+                    self.logger.info("The previous click moved the table after all")
+                    self.rate_limiter.success()
+                    return True
                 
-                # Wait for page to load
-                time.sleep(RETRY_DELAY)
+                next_button = self._wait_for_element(NEXT_BUTTON_SELECTOR, timeout=10)
+                if not next_button or "disabled" in next_button.get_attribute("class").lower():
+                    self.logger.info("Next button is disabled or not found")
+                    return False
                 
-                # Wait for table to update
-                self._wait_for_element(TABLE_SELECTOR, timeout=10)
+                self.rate_limiter.wait()
+                self.driver.execute_script("arguments[0].click();", next_button)
                 
-                return True
-            else:
-                self.logger.info("Next button is disabled or not found")
-                return False
+                with metrics.span('page_wait', instrument=self.instrument.key, backend='selenium'):
+                    redrawn = self._wait_for_redraw(old_row, old_info)
+                if redrawn:
+                    self.rate_limiter.success()
+                    return True
                 
-        except Exception as e:
-            self.logger.error(f"Error clicking next page: {e}")
+            except Exception as e:
+                self.logger.error(f"Error clicking next page: {e}")
+            
+            self.rate_limiter.failure()
+            metrics.count('retries', instrument=self.instrument.key, backend='selenium')
+            self.logger.warning(f"Page change failed (attempt {attempt}/{MAX_RETRIES})")
+        
+        return False
+    
+    def _set_page_length(self, length: int) -> bool:
+        """
+        Ask the DataTable to show `length` rows per page.
+        
+        Returns False (leaving the default paging in place) if the table
+        cannot be resized or the server ignores the requested length.
+        """
+        from selenium.common.exceptions import WebDriverException
+        
+        old_row, old_info = self._table_state()
+        
+        try:
+            applied = self.driver.execute_script(SET_PAGE_LENGTH_SCRIPT, DATATABLE_SELECTOR, length)
+        except WebDriverException as e:
+            self.logger.warning(f"Could not set page length: {e}")
             return False
+        
+        if applied is None or applied < 0:
+            self.logger.info("DataTables API not available, keeping default page size")
+            return False
+        
+        if not self._wait_for_redraw(old_row, old_info):
+            return False
+        
+        page_size = self._get_pagination_info().get('current_page_size', 0)
+        if page_size <= DEFAULT_PAGE_SIZE and self.total_records > DEFAULT_PAGE_SIZE:
+            self.logger.info(f"Server kept {page_size} rows per page, using default paging")
+            return False
+        
+        self.logger.info(f"Page length set to {page_size} rows")
+        return True
     
     def _should_stop_scraping(self, current_date: str) -> bool:
         """Check if we should stop scraping based on existing data."""
@@ -210,109 +405,545 @@ class EuroScraper:
         
         return False
     
-    def scrape_all_data(self, incremental: bool = True) -> bool:
+    def _fetch_http_page(self, start: int, length: int, fetcher: Optional[HttpFetcher] = None,
+                         rate_limiter: Optional[RateLimiter] = None) -> Dict[str, Any]:
         """
-        Scrape all historical data from the website.
+        Fetch one page, retrying failures at the same length first. Only if
+        a length above the default page size keeps failing does this call
+        drop to the default size; the page's 'length' says which was used,
+        so callers can keep to it without changing self.page_length.
+        """
+        fetcher = fetcher or self.fetcher
+        rate_limiter = rate_limiter or self.rate_limiter
+        
+        labels = {'instrument': self.instrument.key, 'backend': 'http'}
+        sizes = [length, DEFAULT_PAGE_SIZE] if length > DEFAULT_PAGE_SIZE else [DEFAULT_PAGE_SIZE]
+        for size in sizes:
+            for attempt in range(1, MAX_RETRIES + 1):
+                with metrics.span('page_wait', **labels):
+                    rate_limiter.wait()
+                try:
+                    metrics.count('http_requests', **labels)
+                    with metrics.span('page_fetch', offset=start, **labels):
+                        # Only a default-size first page may come from the rendered page
+                        page = fetcher.fetch_page(start, size, html_fallback=size == DEFAULT_PAGE_SIZE)
+                    rate_limiter.success()
+                    page['length'] = size
+                    return page
+                except FetchError as e:
+                    rate_limiter.failure()
+                    metrics.count('retries', **labels)
+                    if attempt == MAX_RETRIES and size == DEFAULT_PAGE_SIZE:
+                        raise
+                    self.logger.warning(f"Fetch of {size} rows failed (attempt {attempt}/{MAX_RETRIES}): {e}")
+            self.logger.warning(f"Page length {size} refused, using {DEFAULT_PAGE_SIZE} for this page")
+    
+    def _new_fetcher(self) -> HttpFetcher:
+        """Create a fetcher with its own session, configured like self.fetcher."""
+        if self.fetcher is not None:
+            return HttpFetcher(self.fetcher.base_url, self.fetcher.api_url, timeout=self.fetcher.timeout)
+        return HttpFetcher(self.instrument.base_url, self.instrument.api_url)
+    
+    def _fetch_shard(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Fetch the rows at offsets [start, end) with a dedicated session and
+        rate limiter. Raises FetchError if the rows run out before `end`
+        while the table still reports more records.
+        """
+        fetcher = self._new_fetcher()
+        rate_limiter = RateLimiter()
+        rows = []
+        offset = start
+        length = self.page_length
+        try:
+            while offset < end:
+                request = min(length, end - offset)
+                page = self._fetch_http_page(offset, request, fetcher, rate_limiter)
+                if page['length'] < request:
+                    # The server refused the long pages; this range keeps to what it serves
+                    length = page['length']
+                if page['source'] != 'api':
+                    raise FetchError("Endpoint returned the HTML table instead of JSON")
+                if not page['rows']:
+                    if offset < min(end, page['total']):
+                        raise FetchError(f"No rows at offset {offset} of {page['total']}")
+                    break
+                rows.extend(self._parse_rows(page['rows']))
+                offset += len(page['rows'])
+        finally:
+            fetcher.close()
+        
+        self.logger.info(f"Fetched offsets {start}-{offset} ({len(rows)} rows)")
+        return rows
+    
+    @staticmethod
+    def _plan_shards(start: int, total: int, workers: int, page_length: int,
+                     overlap: int = BACKFILL_OVERLAP) -> List[Tuple[int, int]]:
+        """
+        Split offsets [start, total) into one contiguous range per worker,
+        aligned to whole pages. Each range reaches `overlap` rows into the
+        next one, so rows shifted by a new day during the run are not lost.
+        """
+        remaining = total - start
+        if remaining <= 0:
+            return []
+        pages = -(-remaining // page_length)
+        pages_per_shard = -(-pages // max(1, workers))
+        size = pages_per_shard * page_length
+        return [(offset, min(offset + size, total) + overlap) for offset in range(start, total, size)]
+    
+    @staticmethod
+    def _merge_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop rows whose Gregorian date was already seen, keeping the table order."""
+        seen = set()
+        merged = []
+        for row in rows:
+            date = row.get(COLUMN_MAPPING["gregorian_date"])
+            if date not in seen:
+                seen.add(date)
+                merged.append(row)
+        return merged
+    
+    def _backfill_http(self, workers: int) -> List[Dict[str, Any]]:
+        """Fetch the whole table over HTTP with `workers` parallel page ranges."""
+        if self.fetcher is None:
+            self.fetcher = HttpFetcher(self.instrument.base_url, self.instrument.api_url)
+        
+        # The first page gives the record count and whether long pages are served
+        length = self.page_length
+        first = self._fetch_http_page(0, length)
+        if first['source'] != 'api':
+            raise FetchError("Endpoint returned the HTML table instead of JSON")
+        self.total_records = first['total']
+        if DEFAULT_PAGE_SIZE <= len(first['rows']) < min(first['length'], self.total_records):
+            self.logger.info(f"Server capped the page at {len(first['rows'])} rows")
+            self.page_length = len(first['rows'])
+        
+        shards = self._plan_shards(len(first['rows']), self.total_records, workers, self.page_length)
+        self.logger.info(f"Backfilling {self.total_records} records: {len(shards)} ranges, "
+                         f"{workers} workers, {self.page_length} rows per page")
+        
+        rows = self._parse_rows(first['rows'])
+        if shards:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+                for shard_rows in executor.map(lambda shard: self._fetch_shard(*shard), shards):
+                    rows.extend(shard_rows)
+        
+        return self._merge_rows(rows)
+    
+    def _full_save_minimum(self) -> int:
+        """Fewest records a full replacement may hold: the table's record count and the local dataset's."""
+        return max(self.total_records or 0, self.data_manager.get_index().total_records)
+    
+    def backfill(self, workers: int = BACKFILL_WORKERS) -> bool:
+        """
+        Rebuild the whole dataset, fetching page ranges in parallel.
+        
+        The rows of all ranges are merged and deduplicated by Gregorian date,
+        then written with a single atomic save, so a failed run leaves the
+        existing CSV untouched, as does a run that ends with fewer records
+        than the table reports or the dataset already holds. Without a
+        usable HTTP endpoint this falls back to the sequential full scrape
+        (which, like the backfill, never takes the rendered page's rows
+        for the whole table).
         
         Args:
-            incremental: If True, only scrape new data since last run
+            workers: Number of page ranges fetched at once, each with its own
+                session and rate limiter
         """
         self.start_time = datetime.now()
-        self.scraped_data = []
+        self.logger.info(f"Starting parallel backfill for {self.instrument.name}...")
         
         try:
-            self.logger.info("Starting euro scraper...")
+            self.scraped_data = self._backfill_http(max(1, workers))
+        except FetchError as e:
+            self.logger.warning(f"Parallel backfill failed: {e}. Falling back to a sequential full scrape")
+            self._close_fetcher()
+            return self.scrape_all_data(incremental=False)
+        except Exception as e:
+            self.logger.error(f"Error during backfill: {e}")
+            return False
+        finally:
+            self._close_fetcher()
+        
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        self.logger.info(f"Backfill fetched {len(self.scraped_data)} unique records "
+                         f"of {self.total_records} in {elapsed:.1f}s")
+        if not self.scraped_data:
+            self.logger.error("Backfill returned no data")
+            return False
+        
+        if not self.data_manager.save_pages([self.scraped_data], self._full_save_minimum()):
+            self.logger.error("Failed to save data")
+            return False
+        
+        self.logger.info(f"Final dataset summary: {self.data_manager.get_data_summary()}")
+        return True
+    
+    @staticmethod
+    def _day_number(date: str) -> int:
+        return datetime.strptime(date, '%Y/%m/%d').toordinal()
+    
+    def _fetch_rows(self, start: int, length: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Fetch the page at offset `start`; returns its raw row count and parsed rows."""
+        page = self._fetch_http_page(start, length)
+        if page['source'] != 'api':
+            raise FetchError("HTML page holds neither the record count nor later pages")
+        self.total_records = page['total']
+        self.page_loads += 1
+        if DEFAULT_PAGE_SIZE <= len(page['rows']) < min(page['length'], self.total_records - start):
+            self.logger.info(f"Server capped the page at {len(page['rows'])} rows")
+            self.page_length = len(page['rows'])
+        return len(page['rows']), self._parse_rows(page['rows'])
+    
+    def _seek_date(self, date: str, guess: int = 0) -> Optional[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Load the page holding the newest row at or before `date`.
+        
+        The table is sorted newest first, so row dates fall as the offset
+        grows. Each loaded page narrows the range of offsets that can hold
+        the row; the next page is placed by interpolating dates across that
+        range (extrapolating by the rows per day seen so far while one end is
+        open), with a bisection step whenever a load fails to halve it.
+        
+        Args:
+            date: Target YYYY/MM/DD date
+            guess: Expected offset, e.g. the local rows newer than `date`
+        
+        Returns:
+            (offset, raw row count, parsed rows) of the page, or None if the
+            table holds no rows that old.
+        """
+        date_key = COLUMN_MAPPING["gregorian_date"]
+        target = self._day_number(date)
+        length = self.page_length
+        lo, lo_day = -1, None  # Newest-first offsets <= lo are newer than the target
+        hi, hi_day = None, None  # The row at offset hi is at or before the target
+        rows_per_day = 5 / 7
+        estimate = guess + length // 4  # The guess tends to be a little low
+        width = None
+        
+        for _ in range(SEEK_MAX_PAGE_LOADS):
+            start = estimate - length // 2
+            end = hi if hi is not None else self.total_records
+            if end:
+                start = min(start, end - length)
+            start = max(lo + 1, start)
+            count, rows = self._fetch_rows(start, length)
+            if not rows:
+                return None
+            length = self.page_length
             
-            # Check existing data
-            if incremental:
-                summary = self.data_manager.get_data_summary()
-                self.logger.info(f"Existing data summary: {summary}")
+            first_day = self._day_number(rows[0][date_key])
+            last_day = self._day_number(rows[-1][date_key])
+            if first_day > last_day:
+                rows_per_day = count / (first_day - last_day)
             
-            # Setup driver
-            self.logger.info("Setting up Chrome driver...")
-            self.driver = self._setup_driver()
+            if first_day <= target:
+                if start == lo + 1:
+                    return start, count, rows
+                hi, hi_day = start, first_day
+            elif last_day > target:
+                if start + count >= self.total_records:
+                    return None
+                lo, lo_day = start + count - 1, last_day
+            else:
+                return start, count, rows
             
-            # Navigate to the website
-            self.logger.info(f"Navigating to {BASE_URL}")
-            self.driver.get(BASE_URL)
+            end = hi if hi is not None else self.total_records
+            if hi is not None and hi - lo - 1 <= length:
+                estimate = lo + 1 + length // 2  # One page now covers the whole range
+            elif width is not None and end - lo > width / 2:
+                estimate = (lo + end) // 2
+            elif lo_day is not None and hi_day is not None:
+                estimate = lo + round((lo_day - target) / (lo_day - hi_day) * (hi - lo))
+            elif lo_day is not None:
+                estimate = lo + round((lo_day - target) * rows_per_day)
+            else:
+                estimate = hi - round((target - hi_day) * rows_per_day)
+            width = end - lo
+        
+        raise FetchError(f"Could not find {date} within {SEEK_MAX_PAGE_LOADS} page loads")
+    
+    def _fetch_date_range(self, start_date: str, end_date: str, guess: int = 0) -> List[Dict[str, Any]]:
+        """Fetch the rows dated start_date to end_date, loading only the pages that hold them."""
+        date_key = COLUMN_MAPPING["gregorian_date"]
+        found = self._seek_date(end_date, guess)
+        if found is None:
+            return []
+        
+        offset, count, rows = found
+        collected = []
+        while True:
+            collected.extend(row for row in rows if start_date <= row[date_key] <= end_date)
+            if not rows or rows[-1][date_key] < start_date or offset + count >= self.total_records:
+                return collected
+            offset += count
+            count, rows = self._fetch_rows(offset, self.page_length)
+    
+    def repair_gaps(self, min_missing: int = GAP_MIN_MISSING_DAYS) -> bool:
+        """
+        Fill runs of missing trading days without a full re-scrape.
+        
+        Each gap the trading calendar finds is located by seeking straight
+        to the page that holds it, so a gap costs a few page loads however
+        deep in the history it is. Requires the HTTP backend's endpoint.
+        
+        Args:
+            min_missing: Smallest run of missing trading days to repair
+        """
+        self.start_time = datetime.now()
+        self.page_loads = 0
+        gaps = self.data_manager.find_gaps(min_missing)
+        if not gaps:
+            self.logger.info(f"No gaps of {min_missing}+ trading days in {self.instrument.name}")
+            return True
+        
+        index = self.data_manager.get_index()
+        repaired = []
+        try:
+            if self.fetcher is None:
+                self.fetcher = HttpFetcher(self.instrument.base_url, self.instrument.api_url)
+            for gap in gaps:
+                loads = self.page_loads
+                # Take every row between the neighbouring dates, trading day or not
+                first = (datetime.strptime(gap['after'], '%Y/%m/%d') + timedelta(days=1)).strftime('%Y/%m/%d')
+                last = (datetime.strptime(gap['before'], '%Y/%m/%d') - timedelta(days=1)).strftime('%Y/%m/%d')
+                rows = self._fetch_date_range(first, last, index.count_after(last))
+                self.logger.info(f"Gap {gap['start']} to {gap['end']} ({gap['missing']} trading days): "
+                                 f"found {len(rows)} rows in {self.page_loads - loads} page loads")
+                repaired.extend(rows)
+        except FetchError as e:
+            self.logger.error(f"Gap repair failed: {e}")
+            return False
+        finally:
+            self._close_fetcher()
+        
+        if not repaired:
+            self.logger.info("None of the missing days are on the site")
+            return True
+        
+        return self.data_manager.append_new_data(repaired)
+    
+    def _close_fetcher(self):
+        """Close the HTTP session, if one is open."""
+        if self.fetcher:
+            self.fetcher.close()
+    
+    def _iter_http_pages(self, incremental: bool = False, start: int = 0):
+        """
+        Yield (validated rows, next offset) page by page from the HTTP
+        backend, starting at row offset `start`.
+        
+        Raises FetchError if the endpoint only serves the rendered page,
+        unless this is an incremental run whose existing data that page
+        already reaches.
+        """
+        if self.fetcher is None:
+            self.fetcher = HttpFetcher(self.instrument.base_url, self.instrument.api_url)
+        
+        # Incremental runs usually need only a handful of rows from the first page
+        page_length = self.page_length
+        length = DEFAULT_PAGE_SIZE if incremental else page_length
+        while True:
+            page = self._fetch_http_page(start, length)
+            self.logger.info("Fetched %d rows over HTTP (offset %d)", len(page['rows']), start)
+            if page['length'] < length:
+                # The long pages were refused; keep to what the server serves for this run
+                page_length = page['length']
             
-            # Wait for page to load
-            time.sleep(3)
+            if page['source'] != 'api':
+                # The rendered page holds only the newest rows and no record
+                # count, so it cannot tell where the table ends
+                rows = self._parse_rows(page['rows'])
+                latest_date = self.data_manager.get_latest_date() if incremental else None
+                if start > 0 or not rows or not latest_date or \
+                        rows[-1][COLUMN_MAPPING["gregorian_date"]] > latest_date:
+                    raise FetchError("HTML page only holds the first page of the table")
+                yield rows, start + len(page['rows'])
+                return
             
-            # Get initial pagination info
-            pagination_info = self._get_pagination_info()
-            total_records = pagination_info.get('total', 0)
+            self.total_records = page['total']
+            if DEFAULT_PAGE_SIZE <= len(page['rows']) < min(page['length'], self.total_records - start):
+                self.logger.info(f"Server capped the page at {len(page['rows'])} rows")
+                page_length = len(page['rows'])
             
-            self.logger.info(f"Total records available: {total_records}")
+            # Advance by the rows actually returned so capped pages still line up
+            start += len(page['rows'])
+            yield self._parse_rows(page['rows']), start
             
-            page_count = 0
-            total_scraped = 0
+            if not page['rows'] or start >= self.total_records:
+                self.logger.info("Reached the last page")
+                return
             
-            while True:
-                page_count += 1
-                self.logger.info(f"\n--- Scraping Page {page_count} ---")
-                
-                # Scrape current page
-                page_data = self._scrape_current_page()
-                
-                if not page_data:
-                    self.logger.warning("No data found on current page. Stopping.")
-                    break
-                
-                # Check if we should stop (for incremental updates)
-                if incremental and page_data:
-                    first_date = page_data[0].get(COLUMN_MAPPING["gregorian_date"])
-                    if first_date and self._should_stop_scraping(first_date):
-                        # Only add new data (dates newer than existing)
-                        latest_existing_date = self.data_manager.get_latest_date()
-                        if latest_existing_date:
-                            latest_dt = datetime.strptime(latest_existing_date, '%Y/%m/%d')
-                            new_data = []
-                            for row in page_data:
-                                row_date = row.get(COLUMN_MAPPING["gregorian_date"])
-                                if row_date:
-                                    row_dt = datetime.strptime(row_date, '%Y/%m/%d')
-                                    if row_dt > latest_dt:
-                                        new_data.append(row)
-                            
-                            if new_data:
-                                self.scraped_data.extend(new_data)
-                                total_scraped += len(new_data)
-                                self.logger.info(f"Added {len(new_data)} new records from this page")
+            length = page_length
+    
+    def _go_to_offset(self, offset: int) -> int:
+        """
+        Show the table page holding row `offset`. Returns the offset of that
+        page's first row, or 0 if the table could not be moved.
+        """
+        from selenium.common.exceptions import WebDriverException
+        
+        old_row, old_info = self._table_state()
+        try:
+            first_offset = self.driver.execute_script(GO_TO_OFFSET_SCRIPT, DATATABLE_SELECTOR, offset)
+        except WebDriverException as e:
+            self.logger.warning(f"Could not jump to offset {offset}: {e}")
+            return 0
+        
+        if first_offset is None or first_offset <= 0:
+            return 0
+        if not self._wait_for_redraw(old_row, old_info):
+            return 0
+        
+        self.logger.info(f"Resumed at row offset {first_offset}")
+        return first_offset
+    
+    def _iter_selenium_pages(self, start: int = 0):
+        """
+        Yield (validated rows, next offset) page by page from a
+        Selenium-driven browser, starting at the page holding row `start`.
+        """
+
+        self.logger.info("Setting up Chrome driver...")
+        self.driver = self._setup_driver()
+        
+        # Navigate to the website
+        self.logger.info(f"Navigating to {self.instrument.base_url}")
+        with metrics.span('navigate', instrument=self.instrument.key):
+            self.driver.get(self.instrument.base_url)
+            
+            # Wait for the first rows to render; without them the run has no data
+            if not self._wait_for_element(TABLE_SELECTOR, timeout=PAGE_WAIT_TIMEOUT):
+                raise FetchError(f"Table did not render within {PAGE_WAIT_TIMEOUT}s")
+        
+        # Get initial pagination info
+        pagination_info = self._get_pagination_info()
+        self.total_records = pagination_info.get('total', 0)
+        
+        if self.page_length > DEFAULT_PAGE_SIZE:
+            self._set_page_length(self.page_length)
+        
+        offset = self._go_to_offset(start) if start > 0 else 0
+        while True:
+            page_data = self._scrape_current_page()
+            # The info text's 1-based last row is the next page's offset
+            offset = self._get_pagination_info().get('end') or offset + len(page_data)
+            yield page_data, offset
+            
+            # Check if there's a next page
+            if not self._has_next_page():
+                self.logger.info("Reached the last page")
+                return
+            
+            # Click next page
+            if not self._click_next_page():
+                self.logger.warning("Failed to navigate to next page")
+                return
+    
+    def _collect_pages(self, pages, incremental: bool, journal: PageJournal) -> int:
+        """
+        Stage pages in the journal until the data runs out or, for
+        incremental updates, existing data is reached.
+        
+        Returns the number of records collected.
+        """
+        page_count = 0
+        total_scraped = 0
+        
+        for page_data, next_offset in pages:
+            page_count += 1
+            self.logger.info(f"\n--- Scraping Page {page_count} ---")
+            
+            if page_count == 1:
+                self.logger.info(f"Total records available: {self.total_records}")
+            
+            if not page_data:
+                self.logger.warning("No data found on current page. Stopping.")
+                break
+            
+            # Check if we should stop (for incremental updates)
+            if incremental:
+                first_date = page_data[0].get(COLUMN_MAPPING["gregorian_date"])
+                if first_date and self._should_stop_scraping(first_date):
+                    # Only add new data (dates newer than existing)
+                    latest_existing_date = self.data_manager.get_latest_date()
+                    if latest_existing_date:
+                        latest_dt = datetime.strptime(latest_existing_date, '%Y/%m/%d')
+                        new_data = []
+                        for row in page_data:
+                            row_date = row.get(COLUMN_MAPPING["gregorian_date"])
+                            if row_date:
+                                row_dt = datetime.strptime(row_date, '%Y/%m/%d')
+                                if row_dt > latest_dt:
+                                    new_data.append(row)
                         
-                        break
-                
-                # Add all page data
-                self.scraped_data.extend(page_data)
-                total_scraped += len(page_data)
-                
-                # Show progress
-                progress_msg = format_progress(total_scraped, total_records, self.start_time)
-                self.logger.info(progress_msg)
-                
-                # Check if there's a next page
-                if not self._has_next_page():
-                    self.logger.info("Reached the last page")
-                    break
-                
-                # Click next page
-                if not self._click_next_page():
-                    self.logger.warning("Failed to navigate to next page")
+                        if new_data:
+                            journal.append_page(new_data, next_offset)
+                            total_scraped += len(new_data)
+                            self.logger.info(f"Added {len(new_data)} new records from this page")
+                    
                     break
-                
-                # Rate limiting
-                time.sleep(1)
             
-            self.logger.info(f"\nScraping completed! Total records scraped: {total_scraped}")
+            # Persist the page before fetching the next one
+            with metrics.span('page_stage', instrument=self.instrument.key):
+                journal.append_page(page_data, next_offset)
+            total_scraped += len(page_data)
+            metrics.count('rows', len(page_data), instrument=self.instrument.key)
+            
+            # Show progress
+            progress_msg = format_progress(total_scraped, self.total_records, self.start_time)
+            self.logger.info(progress_msg)
+        
+        return total_scraped
+    
+    def scrape_all_data(self, incremental: bool = True) -> bool:
+        """
+        Scrape all historical data from the website.
+        
+        Args:
+            incremental: If True, only scrape new data since last run
+        """
+        self.start_time = datetime.now()
+        
+        # Pages are staged on disk as they arrive; an interrupted run leaves
+        # the journal behind and the next run in the same mode resumes it
+        journal = PageJournal(self.data_manager.csv_path)
+        
+        try:
+            self.logger.info(f"Starting scraper for {self.instrument.name}...")
+            
+            # Check existing data
+            if incremental:
+                summary = self.data_manager.get_data_summary()
+                self.logger.info(f"Existing data summary: {summary}")
+            
+            state = journal.begin('incremental' if incremental else 'full')
+            if not state['complete']:
+                if self.backend == 'http':
+                    try:
+                        self._collect_pages(self._iter_http_pages(incremental, state['next_offset']),
+                                            incremental, journal)
+                    except FetchError as e:
+                        self.logger.warning(f"HTTP backend failed: {e}. Falling back to Selenium")
+                        self._collect_pages(self._iter_selenium_pages(state['next_offset']),
+                                            incremental, journal)
+                else:
+                    self._collect_pages(self._iter_selenium_pages(state['next_offset']), incremental, journal)
+                journal.mark_complete()
+            
+            self.logger.info(f"\nScraping completed! Total records scraped: {state['rows']}")
             
             # Save data
-            if self.scraped_data:
+            if state['rows']:
                 if incremental:
-                    success = self.data_manager.append_new_data(self.scraped_data)
+                    success = self.data_manager.append_new_data(list(journal.iter_rows()))
                 else:
-                    success = self.data_manager.save_data(self.scraped_data)
+                    success = self.data_manager.save_pages(journal.iter_pages(), self._full_save_minimum())
                 
                 if success:
+                    journal.clear()
                     self.logger.info("Data saved successfully!")
                     
                     # Show final summary
@@ -324,19 +955,19 @@ class EuroScraper:
                     self.logger.error("Failed to save data")
                     return False
             else:
+                journal.clear()
                 self.logger.info("No new data to save")
                 return True
                 
         except KeyboardInterrupt:
-            self.logger.info("Scraping interrupted by user")
+            self.logger.info("Scraping interrupted by user; staged pages will be resumed")
             return False
         except Exception as e:
             self.logger.error(f"Error during scraping: {e}")
             return False
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("Chrome driver closed")
+            self._release_driver()
+            self._close_fetcher()
     
     def run(self) -> bool:
         """Main entry point for the scraper."""
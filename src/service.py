@@ -0,0 +1,379 @@
+"""Read-only HTTP query service over in-memory copies of the datasets."""
+
+import os
+import json
+import gzip
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+from typing import List, Dict, Any, Optional, Callable, NamedTuple, Union
+
+import numpy as np
+
+from .config import (
+    DATA_DIR, DEFAULT_INSTRUMENTS, SERVICE_HOST, SERVICE_PORT, SERVICE_CACHE_ENTRIES,
+    SERVICE_RELOAD_INTERVAL, SERVICE_GZIP_MIN_BYTES
+)
+from .columnar import COLUMN_DTYPES, MISSING_PRICE, ColumnarStore, columns_from_frame, decode_persian_date
+from .indicators import series
+from .instruments import Instrument, get_instrument
+from .logging_config import get_logger
+from .reader import Dataset, store_path, to_datetime64
+from .rollups import RollupTables, TIMEFRAMES
+
+# Indicator series served by /indicators/<name>, computed over the whole
+# history (so warm-up periods don't depend on the range asked for)
+INDICATORS = {
+    'rsi': lambda d: {'rsi': series.rsi(d.close)},
+    'stochastic': lambda d: {'stochastic': series.stochastic_slow(d.high, d.low, d.close)},
+    'momentum': lambda d: {'momentum': series.momentum(d.close)},
+    'macd': lambda d: series.macd(d.close),
+    'ichimoku': lambda d: series.ichimoku(d.high, d.low, d.close),
+}
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    gzipped: Optional[bytes]  # None when the body is too small to be worth it
+    etag: Optional[str]
+
+
+class QueryError(Exception):
+    """A request that cannot be answered, with the HTTP status to send."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_values(values: np.ndarray) -> List[Any]:
+    """Array values as JSON-ready Python values, with NaN and missing prices as None."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        # Integral floats (change amounts) without '.0', as in the artifacts
+        return [None if v != v else (int(v) if v.is_integer() else v) for v in values.tolist()]
+    if values.dtype.kind == 'M':
+        return [None if v is None else v.strftime('%Y/%m/%d') for v in values.tolist()]
+    return [None if v == MISSING_PRICE else v for v in values.tolist()]
+
+
+def _rollup_row(row: Dict[str, Any], dated_period: bool) -> Dict[str, Any]:
+    """A rollup row with dates as YYYY/MM/DD, like the daily rows, and missing prices as None."""
+    row = dict(row, first_date=row['first_date'].replace('-', '/'), last_date=row['last_date'].replace('-', '/'))
+    if dated_period:
+        row['period'] = row['period'].replace('-', '/')
+    for key in ('open', 'high', 'low', 'close'):
+        if row[key] == MISSING_PRICE:
+            row[key] = None
+    return row
+
+
+def _make_response(status: int, payload: Any) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= SERVICE_GZIP_MIN_BYTES else None
+    # Weak, since the same tag covers the plain and gzip'd bodies
+    etag = f'W/"{hashlib.sha1(body).hexdigest()[:20]}"' if status == 200 else None
+    return Response(status, body, gzipped, etag)
+
+
+class DatasetState:
+    """
+    One loaded version of an instrument's dataset, with the rollups and
+    indicator series derived from it (computed on first use).
+    """
+
+    def __init__(self, instrument: Instrument, dataset: Dataset, signature: tuple):
+        self.instrument = instrument
+        self.dataset = dataset
+        self.signature = signature
+        self.version = hashlib.sha1(f"{instrument.key}:{signature}:{len(dataset)}".encode()).hexdigest()[:16]
+        self._rollups = None
+        self._indicators = {}
+        self._lock = threading.Lock()
+
+    def rollups(self) -> RollupTables:
+        with self._lock:
+            if self._rollups is None:
+                self._rollups = RollupTables.from_columns(
+                    {key: self.dataset.column(key) for key in COLUMN_DTYPES})
+            return self._rollups
+
+    def indicator(self, name: str) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if name not in self._indicators:
+                self._indicators[name] = INDICATORS[name](self.dataset)
+            return self._indicators[name]
+
+
+class QueryService:
+    """
+    Answers dataset queries from in-memory columns.
+
+    Each instrument's columnar store is read once into memory. Its CSV is
+    checked for changes at most every `reload_interval` seconds; when it
+    changed, the new version is loaded while other requests are still
+    answered from the old one. Responses are encoded once and kept in an
+    LRU cache keyed by dataset version and request, so repeated queries
+    only cost a dict lookup.
+    """
+
+    def __init__(self, instruments: Optional[List[Union[str, Instrument]]] = None,
+                 cache_entries: int = SERVICE_CACHE_ENTRIES,
+                 reload_interval: float = SERVICE_RELOAD_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.logger = get_logger(__name__)
+        self.instruments = {instrument.key: instrument for instrument in
+                            (get_instrument(item) for item in (instruments or DEFAULT_INSTRUMENTS))}
+        self.default_instrument = next(iter(self.instruments))
+        self.cache_entries = cache_entries
+        self.reload_interval = reload_interval
+        self._clock = clock
+        self._states = {}
+        self._checked = {}
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _csv_path(self, instrument: Instrument) -> str:
+        return os.path.join(DATA_DIR, instrument.csv_filename)
+
+    def _signature(self, instrument: Instrument) -> Optional[tuple]:
+        try:
+            stat = os.stat(self._csv_path(instrument))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self, instrument: Instrument, signature: tuple) -> DatasetState:
+        """
+        Read the instrument's columns into memory: from the columnar store if
+        it was built from this version of the CSV, otherwise by parsing the
+        CSV. Nothing is written: the store, the state files and the data
+        directory are left to the scraper, which may be updating the store
+        right after the CSV.
+        """
+        store = ColumnarStore(store_path(instrument))
+        meta = store.meta()
+        if meta is not None and meta.get('source_signature') == list(signature):
+            columns = store.read(mmap=False, meta=meta)
+        else:
+            # pandas loads on first use, only when the store is out of date
+            import pandas as pd
+            columns = columns_from_frame(pd.read_csv(self._csv_path(instrument)))
+            meta = {'rows': len(columns["gregorian_date"])}
+        state = DatasetState(instrument, Dataset(columns, meta, store.path), signature)
+        self.logger.info(f"Loaded {instrument.key}: {len(state.dataset)} rows (version {state.version})")
+        return state
+
+    def state(self, key: str) -> DatasetState:
+        """Return the current dataset of an instrument, reloading it if its CSV changed."""
+        instrument = self.instruments.get(key)
+        if instrument is None:
+            raise QueryError(404, f"Unknown instrument: {key} (served: {', '.join(self.instruments)})")
+
+        now = self._clock()
+        state = self._states.get(key)
+        if state is not None and now - self._checked.get(key, 0.0) < self.reload_interval:
+            return state
+
+        # Only one thread checks and reloads; the others keep answering from
+        # the version they have until the new one is in place
+        if not self._reload_lock.acquire(blocking=state is None):
+            return state
+        try:
+            state = self._states.get(key)
+            if state is not None and now - self._checked.get(key, 0.0) < self.reload_interval:
+                return state
+            signature = self._signature(instrument)
+            if signature is None:
+                raise QueryError(503, f"No data for {key} yet")
+            if state is None or state.signature != signature:
+                try:
+                    state = self._load(instrument, signature)
+                except Exception as e:
+                    self.logger.error(f"Error loading {key}: {e}")
+                    if state is None:
+                        raise QueryError(503, f"Could not load {key}")
+                else:
+                    self._states[key] = state
+            self._checked[key] = self._clock()
+            return state
+        finally:
+            self._reload_lock.release()
+
+    def warm(self):
+        """Load every instrument that has data, so the first requests don't wait."""
+        for key in self.instruments:
+            try:
+                self.state(key)
+            except QueryError as e:
+                self.logger.warning(str(e))
+
+    def respond(self, target: str) -> Response:
+        """Answer a request target (path and query string), from the cache when possible."""
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        try:
+            state = self.state(params.pop('instrument', self.default_instrument).lower())
+        except QueryError as e:
+            return _make_response(e.status, {'error': str(e)})
+
+        key = (state.version, url.path.rstrip('/') or '/', tuple(sorted(params.items())))
+        with self._cache_lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return response
+            self.misses += 1
+
+        try:
+            response = _make_response(200, self.query(state, key[1], params))
+        except QueryError as e:
+            return _make_response(e.status, {'error': str(e)})
+        except (ValueError, KeyError) as e:
+            return _make_response(400, {'error': str(e)})
+
+        with self._cache_lock:
+            self._cache[key] = response
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return response
+
+    def query(self, state: DatasetState, path: str, params: Dict[str, str]) -> Any:
+        """Build the payload for a path; raises QueryError for unknown paths."""
+        parts = path.strip('/').split('/')
+        if path == '/summary':
+            return self._summary(state)
+        if path == '/latest':
+            return self._latest(state)
+        if path == '/ohlc':
+            return self._ohlc(state, params)
+        if parts[0] == 'rollups' and len(parts) == 2:
+            return self._rollups(state, parts[1], params)
+        if parts[0] == 'indicators' and len(parts) == 2:
+            return self._indicator(state, parts[1], params)
+        raise QueryError(404, f"Unknown path: {path} (try /summary, /latest, /ohlc, "
+                              f"/rollups/<timeframe>, /indicators/<name>)")
+
+    def _base(self, state: DatasetState) -> Dict[str, Any]:
+        return {'instrument': state.instrument.key, 'version': state.version}
+
+    def _summary(self, state: DatasetState) -> Dict[str, Any]:
+        """Same fields as DataManager.get_data_summary."""
+        dates = _json_values(state.dataset.dates[[0, -1]]) if len(state.dataset) else [None, None]
+        return dict(self._base(state), **{
+            'total_records': len(state.dataset),
+            'latest_date': dates[1],
+            'oldest_date': dates[0],
+            'date_range': f"{dates[0]} to {dates[1]}" if len(state.dataset) else None
+        })
+
+    def _rows(self, dataset: Dataset) -> List[Dict[str, Any]]:
+        columns = {
+            'date': _json_values(dataset.dates),
+            'persian_date': decode_persian_date(dataset.persian_dates),
+            'open': _json_values(dataset.open),
+            'high': _json_values(dataset.high),
+            'low': _json_values(dataset.low),
+            'close': _json_values(dataset.close),
+            'change_amount': _json_values(dataset.change_amount),
+            'change_percent': _json_values(dataset.change_percent)
+        }
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def _latest(self, state: DatasetState) -> Dict[str, Any]:
+        rows = self._rows(state.dataset.last(1))
+        return dict(self._base(state), quote=rows[0] if rows else None)
+
+    def _ohlc(self, state: DatasetState, params: Dict[str, str]) -> Dict[str, Any]:
+        """Daily rows between start and end (inclusive), oldest first; `limit` keeps the latest ones."""
+        dataset = state.dataset.slice(params.get('start'), params.get('end'))
+        if 'limit' in params:
+            dataset = dataset.last(max(0, int(params['limit'])))
+        rows = self._rows(dataset)
+        return dict(self._base(state), count=len(rows), rows=rows)
+
+    def _rollups(self, state: DatasetState, timeframe: str, params: Dict[str, str]) -> Dict[str, Any]:
+        if timeframe not in TIMEFRAMES:
+            raise QueryError(404, f"Unknown timeframe: {timeframe} (known: {', '.join(TIMEFRAMES)})")
+        start, end = params.get('start'), params.get('end')
+        rows = state.rollups().query(timeframe, start and str(to_datetime64(start)), end and str(to_datetime64(end)))
+        # Weeks are labelled by the date they start on
+        rows = [_rollup_row(row, timeframe == 'week') for row in rows]
+        return dict(self._base(state), timeframe=timeframe, count=len(rows), rows=rows)
+
+    def _indicator(self, state: DatasetState, name: str, params: Dict[str, str]) -> Dict[str, Any]:
+        if name not in INDICATORS:
+            raise QueryError(404, f"Unknown indicator: {name} (known: {', '.join(INDICATORS)})")
+        lines = state.indicator(name)
+        lo, hi = state.dataset.bounds(params.get('start'), params.get('end'))
+        return dict(self._base(state), indicator=name, count=hi - lo,
+                    dates=_json_values(state.dataset.dates[lo:hi]),
+                    values={line: _json_values(values[lo:hi]) for line, values in lines.items()})
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves QueryService responses with ETag/304, gzip and keep-alive."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DatasetService/1.0'
+    # Headers and body are separate writes; without TCP_NODELAY each
+    # keep-alive response would wait for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger = self.server.service.logger
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._send(self.server.service.respond(self.path), head=False)
+
+    def do_HEAD(self):
+        self._send(self.server.service.respond(self.path), head=True)
+
+    def _not_modified(self, etag: Optional[str]) -> bool:
+        header = self.headers.get('If-None-Match')
+        if not header or etag is None:
+            return False
+        tags = {tag.strip().replace('W/', '', 1) for tag in header.split(',')}
+        return '*' in tags or etag.replace('W/', '', 1) in tags
+
+    def _send(self, response: Response, head: bool):
+        if self._not_modified(response.etag):
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = response.body
+        gzip_ok = response.gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        self.send_response(response.status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if gzip_ok:
+            body = response.gzipped
+            self.send_header('Content-Encoding', 'gzip')
+        if response.etag:
+            self.send_header('ETag', response.etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+def make_server(service: QueryService, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server for the service (call serve_forever() to run it)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
@@ -0,0 +1,92 @@
+"""Trading-day calendar for the tgju history table and gap detection over it."""
+
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Iterable, Tuple, Union
+
+from .config import WEEKEND_DAYS, GAP_MIN_MISSING_DAYS
+
+DateLike = Union[str, date, datetime]
+
+# Fixed Solar Hijri holidays as (month, day): Nowruz, Nature Day, the
+# Khomeini anniversary, Revolution Day, Oil Nationalization Day and
+# Islamic Republic Day. Lunar holidays move every year and are not listed,
+# which is why short gaps are not reported.
+PERSIAN_HOLIDAYS = {
+    (1, 1), (1, 2), (1, 3), (1, 4), (1, 12), (1, 13),
+    (3, 14), (3, 15), (11, 22), (12, 29)
+}
+
+
+def _to_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value.strip().replace('-', '/'), '%Y/%m/%d').date()
+
+
+def gregorian_to_persian(value: DateLike) -> Tuple[int, int, int]:
+    """Convert a Gregorian date to a Solar Hijri (year, month, day)."""
+    d = _to_date(value)
+    gy, gm, gd = d.year, d.month, d.day
+    month_days = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+    gy2 = gy + 1 if gm > 2 else gy
+    days = (355666 + 365 * gy + (gy2 + 3) // 4 - (gy2 + 99) // 100 + (gy2 + 399) // 400
+            + gd + month_days[gm - 1])
+    jy = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jy += (days - 1) // 365
+        days = (days - 1) % 365
+    if days < 186:
+        return jy, 1 + days // 31, 1 + days % 31
+    return jy, 7 + (days - 186) // 30, 1 + (days - 186) % 30
+
+
+def is_trading_day(value: DateLike) -> bool:
+    """Check whether the market is expected to publish a row for a date."""
+    d = _to_date(value)
+    if d.weekday() in WEEKEND_DAYS:
+        return False
+    return gregorian_to_persian(d)[1:] not in PERSIAN_HOLIDAYS
+
+
+def trading_days(start: DateLike, end: DateLike) -> List[str]:
+    """List the trading days from start to end inclusive as YYYY/MM/DD."""
+    day, end = _to_date(start), _to_date(end)
+    days = []
+    while day <= end:
+        if is_trading_day(day):
+            days.append(day.strftime('%Y/%m/%d'))
+        day += timedelta(days=1)
+    return days
+
+
+def find_gaps(dates: Iterable[str], min_missing: int = GAP_MIN_MISSING_DAYS) -> List[Dict[str, Any]]:
+    """
+    Find runs of missing trading days between consecutive dataset dates.
+
+    Args:
+        dates: Sorted YYYY/MM/DD dates (oldest first), e.g. DatasetIndex.dates
+        min_missing: Smallest number of consecutive missing trading days
+            reported; shorter runs are usually unlisted lunar holidays
+
+    Returns:
+        Gaps oldest first, each with the first and last missing trading day
+        ('start', 'end'), the number of missing trading days ('missing') and
+        the dataset dates on either side ('after', 'before').
+    """
+    gaps = []
+    previous = None
+    for current in dates:
+        current_date = _to_date(current)
+        # Most neighbours are at most a weekend apart; only expand real holes
+        if previous is not None and (current_date - previous).days > 2:
+            missing = trading_days(previous + timedelta(days=1), current_date - timedelta(days=1))
+            if len(missing) >= min_missing:
+                gaps.append({'start': missing[0], 'end': missing[-1], 'missing': len(missing),
+                             'after': previous.strftime('%Y/%m/%d'), 'before': current})
+        previous = current_date
+    return gaps
@@ -5,17 +5,12 @@ import re
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from .logging_config import configure_logging
+
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('scraper.log', encoding='utf-8')
-        ]
-    )
+    """Configure process-wide logging if it isn't yet (see logging_config) and return a logger."""
+    configure_logging(logging.getLevelName(level))
     return logging.getLogger(__name__)
 
 
@@ -109,18 +104,12 @@ def format_progress(current: int, total: int, start_time: datetime) -> str:
 
 def is_weekend_or_holiday(date_str: str) -> bool:
     """
-    Check if a given date might be a weekend or holiday.
-    This is a simple check - in practice, you might want to use a proper holiday calendar.
+    Check if a given date is a weekend or a fixed holiday, i.e. not a
+    trading day in src/trading_calendar.py (lunar holidays are not known).
     """
+    from .trading_calendar import is_trading_day
+    
     try:
-        # Parse the date
-        date_obj = datetime.strptime(date_str, '%Y/%m/%d')
-        
-        # Check if it's Friday (4) or Saturday (5) - weekend in Iran
-        # Note: In Iran, Thursday-Friday is weekend, but the market follows a different schedule
-        if date_obj.weekday() == 4:  # Friday
-            return True
-            
-        return False
+        return not is_trading_day(date_str)
     except ValueError:
         return False